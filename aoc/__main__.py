@@ -0,0 +1,459 @@
+"""Advent of Code 2021 - Command line interface
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import argparse
+import json
+import signal
+import os
+import sys
+import time
+
+from aoc import backends
+from aoc import batch
+from aoc import bench
+from aoc import complexity
+from aoc import daemon
+from aoc import history
+from aoc import parallel
+from aoc import records
+from aoc import trace
+from aoc.days import DAYS
+from aoc.days import input_path
+from aoc.days import load_day
+from aoc.days import parse_days
+from aoc.generators import write_input
+from aoc.profiling import PROFILE_ENV
+from aoc.runner import Limits
+from aoc.runner import format_counters
+from aoc.runner import format_memory
+from aoc.runner import format_results
+from aoc.runner import to_json
+from aoc.runner import run_days
+
+
+def run(args: argparse.Namespace) -> int:
+    limits = None
+    if args.timeout is not None or args.max_rss is not None or args.max_address_space is not None:
+        limits = Limits(
+            args.timeout,
+            args.max_rss * 2**20 if args.max_rss is not None else None,
+            args.max_address_space * 2**20 if args.max_address_space is not None else None,
+        )
+        try:
+            limits.check()
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+
+    use_cache = not (args.no_cache or args.profile or args.counters)
+    start = time.perf_counter()
+    results = run_days(
+        parse_days(args.days),
+        jobs=args.jobs,
+        scale=args.scale,
+        seed=args.seed,
+        use_cache=use_cache,
+        profile_dir=args.profile,
+        trace_memory=args.memory,
+        count=args.counters,
+        limits=limits,
+    )
+    elapsed = time.perf_counter() - start
+
+    print(format_results(results))
+    if args.memory:
+        print()
+        print(format_memory(results))
+    if args.counters:
+        print()
+        print(format_counters(results))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(to_json(results), f, indent=2)
+    if args.trace:
+        trace.save(results, args.trace)
+    if not args.no_history:
+        history.record(
+            'run',
+            ' '.join(sys.argv[1:]),
+            history.run_measurements(results),
+            history.run_mode(use_cache, args.memory, bool(args.profile), args.counters),
+        )
+    print(f'\nFinished {len(results)} days in {elapsed:.2f} s')
+
+    return 0 if all([r.status() == 'ok' for r in results]) else 1
+
+
+def run_daemon(args: argparse.Namespace) -> int:
+    solver = daemon.Solver(use_cache=not args.no_cache)
+    # Clean up, e.g. remove the socket, when terminated
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        if args.socket:
+            daemon.serve_unix(solver, args.socket)
+        else:
+            daemon.serve_stdio(solver, sys.stdin, sys.stdout)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        solver.close()
+    return 0
+
+
+def query(args: argparse.Namespace) -> int:
+    response = daemon.request(args.socket, args.day, args.part, args.input)
+    print(json.dumps(response, indent=2))
+    return 0 if response['status'] == 'ok' else 1
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    filenames = batch.find_inputs(args.inputs)
+    if not filenames:
+        print(f'No inputs found: {args.inputs}', file=sys.stderr)
+        return 1
+
+    failed = 0
+    for result in batch.solve_inputs(args.day, filenames, args.jobs, not args.no_cache):
+        print(json.dumps(result), flush=True)
+        failed += result['status'] != 'ok'
+
+    return 0 if not failed else 1
+
+
+def run_bench(args: argparse.Namespace) -> int:
+    benchmarks = bench.select_benchmarks(args.filter)
+    results = []
+    for benchmark in benchmarks:
+        results.append(
+            bench.run_benchmark(
+                benchmark, args.warmup, args.repeat, scale=args.scale, seed=args.seed
+            )
+        )
+
+    baseline = bench.load_baseline(args.compare) if args.compare else None
+    print(bench.format_results(results, baseline))
+
+    if args.output:
+        bench.save(results, args.output)
+    if not args.no_history:
+        history.record(
+            'bench',
+            ' '.join(sys.argv[1:]),
+            history.bench_measurements(benchmarks, results),
+            history.run_mode(),
+        )
+
+    if any([r.error is not None for r in results]):
+        return 1
+
+    if baseline is not None:
+        regressions = bench.find_regressions(results, baseline, args.threshold)
+        for name in regressions:
+            print(f'Regression: {name}')
+        if regressions:
+            return 1
+
+    return 0
+
+
+def run_records(args: argparse.Namespace) -> int:
+    results = [records.measure(record, args.count) for record in records.records()]
+    print(records.format_results(results))
+    return 1 if any([r.error is not None for r in results]) else 0
+
+
+def report_history(args: argparse.Namespace) -> int:
+    store = history.HistoryStore()
+    try:
+        series = store.series(args.kind, parse_days(args.days) if args.days else None)
+    finally:
+        store.close()
+
+    print(history.format_report(series, args.last, args.threshold))
+
+    regressions = history.find_regressions(series, args.last, args.threshold)
+    for s in regressions:
+        print(
+            f'Regression: day {s.day} {s.phase} on {s.input} ({s.mode}) is {s.change(args.last):.1%} slower'
+        )
+    return 1 if regressions else 0
+
+
+def generate(args: argparse.Namespace) -> int:
+    for day in parse_days(args.days):
+        print(write_input(day, args.scale, args.seed, args.output))
+    return 0
+
+
+def run_complexity(args: argparse.Namespace) -> int:
+    scales = [int(s) for s in args.scales.split(',')]
+
+    fits = []
+    for day in parse_days(args.days):
+        fits.extend(
+            complexity.analyze_day(day, scales, args.seed, args.repeat, args.budget)
+        )
+
+    print(complexity.format_report(fits, args.tolerance))
+    if args.output:
+        complexity.save(fits, args.tolerance, args.output)
+
+    return 0
+
+
+def run_cross_check(args: argparse.Namespace) -> int:
+    differences = []
+    for day in parse_days(args.days):
+        if not os.path.exists(input_path(day, args.input)):
+            continue
+
+        try:
+            module = load_day(day)
+        except ImportError as e:
+            print(f'Day {day}: skipped, {e}')
+            continue
+        if not backends.has_engines(module):
+            continue
+
+        day_differences = backends.cross_check(day, args.input)
+        print(f'Day {day}: {"differs" if day_differences else "ok"}')
+        differences.extend(day_differences)
+
+    for difference in differences:
+        print(f'\n{difference}')
+
+    return 1 if differences else 0
+
+
+def add_backend_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        '--backend',
+        choices=backends.BACKENDS,
+        help=f'engine of the days with a NumPy one (default: ${backends.BACKEND_ENV} or auto, '
+        f'i.e. by input size)',
+    )
+
+
+def add_workers_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help=f'worker processes of the days that map in parallel (default: ${parallel.WORKERS_ENV} or the CPU '
+        f'count)',
+    )
+
+
+def add_history_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        '--no-history',
+        action='store_true',
+        help=f'do not record the timings in the performance history ({history.HISTORY_DB})',
+    )
+
+
+def add_input_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        '--scale', type=int, default=None, help='use generated inputs of this scale'
+    )
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m aoc')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    run_parser = subparsers.add_parser('run', help='run and time the solvers')
+    run_parser.add_argument(
+        '--days', default=f'{DAYS[0]}-{DAYS[-1]}', help='e.g. 1-5,9 (default: all)'
+    )
+    run_parser.add_argument(
+        '--jobs', type=int, default=None, help='worker processes (default: CPU count)'
+    )
+    run_parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='always parse and solve, ignoring cached inputs, intermediates and answers',
+    )
+    run_parser.add_argument(
+        '--profile',
+        metavar='DIR',
+        default=os.environ.get(PROFILE_ENV),
+        help=f'profile each phase and write .prof and collapsed stack .folded files to DIR, '
+        f'implies --no-cache (default: ${PROFILE_ENV})',
+    )
+    run_parser.add_argument(
+        '--memory',
+        action='store_true',
+        help='report the peak traced memory and top allocation sites of each phase',
+    )
+    run_parser.add_argument(
+        '--counters',
+        action='store_true',
+        help='enable the hot path counters of the solvers, implies --no-cache',
+    )
+    run_parser.add_argument(
+        '--json', help='write the results with timings, memory and counters to this file'
+    )
+    run_parser.add_argument(
+        '--trace', help='write a Chrome/Perfetto trace of the workers and phases to this file'
+    )
+    run_parser.add_argument(
+        '--timeout',
+        type=float,
+        help='kill a day after this many seconds and report it as timeout, '
+        'each day then runs in a worker process of its own',
+    )
+    run_parser.add_argument(
+        '--max-rss',
+        type=int,
+        metavar='MB',
+        help='kill a day whose worker exceeds this resident memory and report it as oom (Linux only)',
+    )
+    run_parser.add_argument(
+        '--max-address-space',
+        type=int,
+        metavar='MB',
+        help='limit the address space of the workers, allocations beyond it fail and are reported as oom',
+    )
+    add_history_argument(run_parser)
+    add_input_arguments(run_parser)
+    run_parser.set_defaults(func=run)
+
+    batch_parser = subparsers.add_parser(
+        'batch', help='solve many inputs of a day, printing one JSON line per input'
+    )
+    batch_parser.add_argument('--day', type=int, required=True)
+    batch_parser.add_argument('inputs', help='directory or glob pattern of the inputs')
+    batch_parser.add_argument(
+        '--jobs', type=int, default=None, help='number of worker processes (default: CPU count)'
+    )
+    batch_parser.add_argument(
+        '--no-cache', action='store_true', help='ignore cached parsed inputs, intermediates and answers'
+    )
+    batch_parser.set_defaults(func=run_batch)
+
+    daemon_parser = subparsers.add_parser(
+        'daemon', help='keep the solvers loaded and answer JSON line requests'
+    )
+    daemon_parser.add_argument(
+        '--socket', help='listen on this Unix socket (default: stdin and stdout)'
+    )
+    daemon_parser.add_argument(
+        '--no-cache', action='store_true', help='ignore cached parsed inputs, intermediates and answers'
+    )
+    daemon_parser.set_defaults(func=run_daemon)
+
+    query_parser = subparsers.add_parser('query', help='send a request to a running daemon')
+    query_parser.add_argument('--socket', required=True)
+    query_parser.add_argument('--day', type=int, required=True)
+    query_parser.add_argument('--part', type=int, choices=[1, 2])
+    query_parser.add_argument('--input', help="input file (default: the day's input.txt)")
+    query_parser.set_defaults(func=query)
+
+    bench_parser = subparsers.add_parser('bench', help='run the microbenchmarks')
+    bench_parser.add_argument('--filter', help='only run benchmarks containing this')
+    bench_parser.add_argument('--warmup', type=int, default=1)
+    bench_parser.add_argument('--repeat', type=int, default=5)
+    bench_parser.add_argument('--output', help='write the statistics as JSON')
+    bench_parser.add_argument('--compare', help='baseline JSON to compare against')
+    bench_parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        help='relative median slowdown counted as a regression (default: 0.1)',
+    )
+    add_history_argument(bench_parser)
+    add_input_arguments(bench_parser)
+    bench_parser.set_defaults(func=run_bench)
+
+    history_parser = subparsers.add_parser(
+        'history', help='report the trends and regressions of the recorded runs'
+    )
+    history_parser.add_argument('--days', help='e.g. 1-5,9 (default: all)')
+    history_parser.add_argument(
+        '--kind', choices=['run', 'bench'], default='run', help='runner or benchmark executions'
+    )
+    history_parser.add_argument(
+        '--last', type=int, default=5, help='runs before the latest one to compare with (default: 5)'
+    )
+    history_parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        help='relative slowdown of the latest run over the median of the last runs counted as a regression '
+        '(default: 0.1)',
+    )
+    history_parser.set_defaults(func=report_history)
+
+    records_parser = subparsers.add_parser(
+        'records', help='measure the memory per instance of the bulk record types'
+    )
+    records_parser.add_argument('--count', type=int, default=records.DEFAULT_COUNT)
+    records_parser.set_defaults(func=run_records)
+
+    generate_parser = subparsers.add_parser('generate', help='generate scaled inputs')
+    generate_parser.add_argument('--days', default=f'{DAYS[0]}-{DAYS[-1]}')
+    generate_parser.add_argument('--scale', type=int, default=1)
+    generate_parser.add_argument('--seed', type=int, default=0)
+    generate_parser.add_argument('--output', help='directory (default: generated/day_XX)')
+    generate_parser.set_defaults(func=generate)
+
+    complexity_parser = subparsers.add_parser(
+        'complexity', help='fit the runtime growth of the solvers'
+    )
+    complexity_parser.add_argument('--days', default=f'{DAYS[0]}-{DAYS[-1]}')
+    complexity_parser.add_argument(
+        '--scales', default='1,2,4,8', help='input scales (default: 1,2,4,8)'
+    )
+    complexity_parser.add_argument('--seed', type=int, default=0)
+    complexity_parser.add_argument('--repeat', type=int, default=1)
+    complexity_parser.add_argument(
+        '--budget',
+        type=float,
+        default=30.0,
+        help='skip larger scales after a run takes longer than this (seconds)',
+    )
+    complexity_parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.3,
+        help='exponent above the expected one that is flagged (default: 0.3)',
+    )
+    complexity_parser.add_argument('--output', help='write the fits as JSON')
+    complexity_parser.set_defaults(func=run_complexity)
+
+    cross_check_parser = subparsers.add_parser(
+        'crosscheck', help='compare the Python and NumPy engines of the days that have both'
+    )
+    cross_check_parser.add_argument('--days', default=f'{DAYS[0]}-{DAYS[-1]}')
+    cross_check_parser.add_argument('--input', default='example.txt')
+    cross_check_parser.set_defaults(func=run_cross_check)
+
+    for backend_parser in [run_parser, batch_parser, daemon_parser, bench_parser, complexity_parser]:
+        add_backend_argument(backend_parser)
+        add_workers_argument(backend_parser)
+
+    args = parser.parse_args()
+    # Through the environment so that worker processes use them too
+    if getattr(args, 'backend', None):
+        os.environ[backends.BACKEND_ENV] = args.backend
+    if getattr(args, 'workers', None):
+        os.environ[parallel.WORKERS_ENV] = str(args.workers)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
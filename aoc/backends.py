@@ -0,0 +1,127 @@
+"""Advent of Code 2021 - Backends
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import functools
+import os
+import traceback
+from contextlib import contextmanager
+from types import ModuleType
+
+from aoc.days import day_dir
+from aoc.days import load_day
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# 'python', 'numpy' or 'auto' (the default) to pick by input size. An environment variable so that it also applies in
+# worker processes.
+BACKEND_ENV = 'AOC_BACKEND'
+
+BACKENDS = ['auto', 'python', 'numpy']
+
+
+def selected_backend() -> str:
+    """The backend selected with $AOC_BACKEND, 'auto' unless it is set."""
+    backend = os.environ.get(BACKEND_ENV, 'auto')
+    if backend not in BACKENDS:
+        raise ValueError(f'Unknown backend {backend!r}, expected one of {BACKENDS}')
+    return backend
+
+
+def get_backend(size: int, threshold: int) -> str:
+    backend = selected_backend()
+    if backend == 'numpy' and np is None:
+        raise ImportError('The numpy backend requires NumPy')
+
+    if backend == 'auto':
+        return 'numpy' if np is not None and size >= threshold else 'python'
+    return backend
+
+
+def dispatch(
+    numpy_function: Callable[..., Any], size: Callable[..., int], threshold: int
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorate the pure Python engine of a function to call numpy_function instead for inputs of at least threshold.
+
+    size is called with the same arguments as the function. The engines stay available as .python and .numpy.
+    """
+
+    def decorator(python_function: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(python_function)
+        def wrapper(*args):
+            if get_backend(size(*args), threshold) == 'numpy':
+                return numpy_function(*args)
+            return python_function(*args)
+
+        wrapper.python = python_function
+        wrapper.numpy = numpy_function
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def forced_backend(backend: str) -> Iterator[None]:
+    previous = os.environ.get(BACKEND_ENV)
+    os.environ[BACKEND_ENV] = backend
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ[BACKEND_ENV]
+        else:
+            os.environ[BACKEND_ENV] = previous
+
+
+def has_engines(module: ModuleType) -> bool:
+    return any([hasattr(value, 'numpy') and callable(value) for value in vars(module).values()])
+
+
+def _solve(module: ModuleType, filename: str) -> Tuple[Optional[Tuple[Any, Any]], Optional[str]]:
+    try:
+        data = module.parse(filename)
+        return (module.solve_part1(data), module.solve_part2(data)), None
+    except Exception:
+        return None, traceback.format_exc()
+
+
+def cross_check(day: int, filename: str = 'example.txt') -> List[str]:
+    """Solve an input of the day with each engine, returning the differences between the answers."""
+    module = load_day(day)
+    filename = os.path.join(day_dir(day), filename)
+
+    answers = {}
+    differences = []
+    for backend in ['python', 'numpy']:
+        with forced_backend(backend):
+            answers[backend], error = _solve(module, filename)
+        if error is not None:
+            differences.append(f'Day {day} failed with the {backend} backend:\n{error}')
+    if differences:
+        return differences
+
+    for part, (expected, actual) in enumerate(zip(answers['python'], answers['numpy']), start=1):
+        if expected != actual:
+            differences.append(f'Day {day} part {part}: python {expected!r}, numpy {actual!r}')
+    return differences
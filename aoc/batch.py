@@ -0,0 +1,126 @@
+"""Advent of Code 2021 - Batch mode
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+
+import glob
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from concurrent.futures.process import BrokenProcessPool
+
+from aoc import parallel
+from aoc.daemon import Solver
+
+# Tasks queued per worker, bounds the number of pending futures for large batches
+QUEUED_PER_WORKER = 2
+
+# The solver of each worker process and the queue it reports the inputs it starts to, see _initialize_worker()
+_solver: Optional[Solver] = None
+_started: Any = None
+
+
+def find_inputs(pattern: str) -> List[str]:
+    """All files in a directory, or the files matching a glob pattern, sorted."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*')
+    return sorted([f for f in glob.glob(pattern) if os.path.isfile(f)])
+
+
+def _initialize_worker(day: int, use_cache: bool, jobs: int, started: Any):
+    global _solver, _started
+    parallel.share_workers(jobs)
+    _solver = Solver([day], use_cache)
+    _started = started
+
+
+def _solve(day: int, filename: str) -> Dict[str, Any]:
+    _started.put(filename)
+    return _solver.solve(day, None, filename)
+
+
+def _drain(queue: Any) -> Set[str]:
+    items = set()
+    while not queue.empty():
+        items.add(queue.get())
+    return items
+
+
+def _failure(day: int, filename: str, error: str) -> Dict[str, Any]:
+    return {
+        'day': day,
+        'input': os.path.abspath(filename),
+        'answers': {},
+        'cached': [],
+        'status': 'error',
+        'timings': [],
+        'error': error,
+    }
+
+
+def solve_inputs(
+    day: int, filenames: List[str], jobs: Optional[int] = None, use_cache: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """Solve both parts of every input across a process pool, yielding the results as they complete.
+
+    Each worker loads the day and keeps its parsed inputs once, see aoc.daemon.Solver. A failing input only fails its
+    own result. When a worker dies the inputs that were being solved fail, the pool is restarted for the others.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(filenames)))
+
+    pending = list(reversed(filenames))
+    while pending:
+        started = multiprocessing.SimpleQueue()
+        with ProcessPoolExecutor(
+            jobs, initializer=_initialize_worker, initargs=(day, use_cache, jobs, started)
+        ) as executor:
+            running = {}
+            interrupted = []
+            while (pending or running) and not interrupted:
+                while pending and len(running) < jobs * QUEUED_PER_WORKER:
+                    filename = pending.pop()
+                    running[executor.submit(_solve, day, filename)] = filename
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    filename = running.pop(future)
+                    try:
+                        yield future.result()
+                    except BrokenProcessPool:
+                        interrupted.append(filename)
+                    except Exception as e:
+                        yield _failure(day, filename, repr(e))
+
+        if not interrupted:
+            continue
+
+        # Only an input that a worker had started can have killed it, the queued ones are retried in a new pool. If
+        # none had started, the workers died on their own and nothing is retried.
+        interrupted.extend(running.values())
+        started_filenames = _drain(started) & set(interrupted)
+        for filename in reversed(interrupted):
+            if filename in started_filenames or not started_filenames:
+                yield _failure(day, filename, 'Worker died')
+            else:
+                pending.append(filename)
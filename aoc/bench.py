@@ -0,0 +1,235 @@
+"""Advent of Code 2021 - Microbenchmarks
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import json
+import platform
+import statistics
+import time
+import traceback
+from dataclasses import dataclass
+from types import ModuleType
+
+from aoc.days import input_path
+from aoc.days import load_day
+from aoc.generators import write_input
+
+# A benchmark is prepared (untimed) before every repetition since most of the hot functions mutate their input. The
+# preparation returns the argument tuples of a batch of calls, the reported time is per call.
+Prepare = Callable[[ModuleType, str], List[Tuple[Any, ...]]]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    day: int
+    function: str
+    prepare: Prepare
+
+
+@dataclass
+class BenchmarkStatistics:
+    name: str
+    repeat: int
+    min: float
+    median: float
+    mean: float
+    stddev: float
+    error: Optional[str] = None
+    filename: str = ''
+
+
+def _day_12_paths(m: ModuleType, filename: str) -> List[Tuple[Any, ...]]:
+    return [(m.parse(filename), True)]
+
+
+def _day_15_graph(m: ModuleType, filename: str) -> List[Tuple[Any, ...]]:
+    data = m.parse(filename)
+    return [(m.Graph(), data)]
+
+
+def _day_15_dijkstra(m: ModuleType, filename: str) -> List[Tuple[Any, ...]]:
+    data = m.parse(filename)
+    g = m.Graph()
+    m.populate_graph(g, data)
+    return [(g, data.index(0, 0))]
+
+
+def _day_18_sum(m: ModuleType, filename: str) -> List[Tuple[Any, ...]]:
+    terms = m.parse(filename)
+    return [
+        (m.SnailfishNumber(t1), m.SnailfishNumber(t2)) for t1, t2 in zip(terms, terms[1:])
+    ]
+
+
+def _day_19_alignment(m: ModuleType, filename: str) -> List[Tuple[Any, ...]]:
+    data = m.parse(filename)
+    return [(data[0], data[n]) for n in range(1, 6)]
+
+
+def _day_20_enhancement(m: ModuleType, filename: str) -> List[Tuple[Any, ...]]:
+    lookup_table, picture = m.parse(filename)
+    return [(picture, lookup_table)]
+
+
+def _day_22_terms(m: ModuleType, filename: str) -> List[Tuple[Any, ...]]:
+    return [(m.parse(filename), m.Boxes(), m.Boxes())]
+
+
+BENCHMARKS = [
+    Benchmark('day_12.count_paths', 12, 'count_paths', _day_12_paths),
+    Benchmark('day_15.populate_graph', 15, 'populate_graph', _day_15_graph),
+    Benchmark('day_15.DijkstraSPF', 15, 'DijkstraSPF', _day_15_dijkstra),
+    Benchmark('day_18.SnailfishNumber.__add__', 18, 'SnailfishNumber.__add__', _day_18_sum),
+    Benchmark(
+        'day_19.find_distance_by_common_readings',
+        19,
+        'find_distance_by_common_readings',
+        _day_19_alignment,
+    ),
+    Benchmark(
+        'day_20.apply_image_enhancement_algorithm',
+        20,
+        'apply_image_enhancement_algorithm',
+        _day_20_enhancement,
+    ),
+    Benchmark('day_22.accumulate_terms', 22, 'accumulate_terms', _day_22_terms),
+]
+
+
+def resolve(module: ModuleType, name: str) -> Callable:
+    f = module
+    for attribute in name.split('.'):
+        f = getattr(f, attribute)
+    return f
+
+
+def run_benchmark(
+    benchmark: Benchmark,
+    warmup: int = 1,
+    repeat: int = 5,
+    scale: Optional[int] = None,
+    seed: int = 0,
+) -> BenchmarkStatistics:
+    """Benchmark on the day's input.txt, or on a generated input if a scale is given."""
+    try:
+        if scale is None:
+            filename = input_path(benchmark.day)
+        else:
+            filename = write_input(benchmark.day, scale, seed)
+
+        module = load_day(benchmark.day)
+        f = resolve(module, benchmark.function)
+
+        timings = []
+        for i in range(warmup + repeat):
+            batch = benchmark.prepare(module, filename)
+
+            start = time.perf_counter()
+            for args in batch:
+                f(*args)
+            elapsed = time.perf_counter() - start
+
+            if i >= warmup:
+                timings.append(elapsed / len(batch))
+    except Exception:
+        return BenchmarkStatistics(
+            benchmark.name, 0, 0.0, 0.0, 0.0, 0.0, error=traceback.format_exc()
+        )
+
+    return BenchmarkStatistics(
+        benchmark.name,
+        repeat,
+        min(timings),
+        statistics.median(timings),
+        statistics.mean(timings),
+        statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        filename=filename,
+    )
+
+
+def select_benchmarks(name_filter: Optional[str] = None) -> List[Benchmark]:
+    return [b for b in BENCHMARKS if not name_filter or name_filter in b.name]
+
+
+def to_json(results: List[BenchmarkStatistics]) -> Dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'benchmarks': {
+            r.name: {
+                'repeat': r.repeat,
+                'min': r.min,
+                'median': r.median,
+                'mean': r.mean,
+                'stddev': r.stddev,
+            }
+            for r in results
+            if r.error is None
+        },
+    }
+
+
+def save(results: List[BenchmarkStatistics], filename: str):
+    with open(filename, 'w') as f:
+        json.dump(to_json(results), f, indent=2)
+
+
+def load_baseline(filename: str) -> Dict[str, Dict[str, float]]:
+    with open(filename) as f:
+        return json.load(f)['benchmarks']
+
+
+def format_results(
+    results: List[BenchmarkStatistics],
+    baseline: Optional[Dict[str, Dict[str, float]]] = None,
+) -> str:
+    lines = [
+        f'{"Benchmark":<45} {"Min (ms)":>10} {"Median (ms)":>12} {"Stddev (ms)":>12}'
+        + ('  vs baseline' if baseline is not None else '')
+    ]
+    for r in results:
+        if r.error is not None:
+            lines.append(f'{r.name:<45} failed: {r.error.strip().splitlines()[-1]}')
+            continue
+
+        line = f'{r.name:<45} {r.min * 1000:>10.2f} {r.median * 1000:>12.2f} {r.stddev * 1000:>12.2f}'
+        if baseline is not None and r.name in baseline:
+            line += f'  {r.median / baseline[r.name]["median"]:>10.2f}x'
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+
+def find_regressions(
+    results: List[BenchmarkStatistics],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Return the benchmarks whose median is more than threshold (e.g. 0.1 = 10%) slower than the baseline."""
+    return [
+        r.name
+        for r in results
+        if r.error is None
+        and r.name in baseline
+        and r.median > baseline[r.name]['median'] * (1 + threshold)
+    ]
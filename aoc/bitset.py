@@ -0,0 +1,263 @@
+"""Advent of Code 2021 - Packed point sets
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from itertools import product
+
+# Rows longer than this are split into chunks of this many bits, only the non-empty chunks are stored
+CHUNK_BITS = 1 << 12
+
+Point = Tuple[int, ...]
+
+
+# int.bit_count() is new in Python 3.10
+_bit_count = int.bit_count if hasattr(int, 'bit_count') else lambda bits: bin(bits).count('1')
+
+
+class PointSet:
+    """A set of 2-D or 3-D integer points within an inclusive bounding box, packed one bit per point.
+
+    The points of a row, i.e. along the first axis, are the bits of Python ints so that whole ranges of a row are added
+    or removed with a single operation. Rows wider than chunk_bits are split into chunks of that many bits and only
+    non-empty chunks are stored, which keeps huge sparse extents small.
+    """
+
+    __slots__ = ('lows', 'highs', 'chunk_bits', 'chunks_per_row', '_row_strides', 'chunks')
+
+    def __init__(self, lows: Sequence[int], highs: Sequence[int], chunk_bits: Optional[int] = None):
+        if len(lows) != len(highs) or any([low > high for low, high in zip(lows, highs)]):
+            raise ValueError(f'Invalid bounding box {tuple(lows)} - {tuple(highs)}')
+
+        self.lows: Point = tuple(lows)
+        self.highs: Point = tuple(highs)
+
+        width = highs[0] - lows[0] + 1
+        self.chunk_bits = min(width, CHUNK_BITS) if chunk_bits is None else chunk_bits
+        self.chunks_per_row = -(-width // self.chunk_bits)
+
+        # Row number of a point is the sum of its offsets along the other axes times these
+        strides = []
+        stride = 1
+        for low, high in zip(self.lows[1:], self.highs[1:]):
+            strides.append(stride)
+            stride *= high - low + 1
+        self._row_strides = tuple(strides)
+
+        # Chunk number (row * chunks_per_row + chunk) to its bits, without empty chunks
+        self.chunks: Dict[int, int] = {}
+
+    @classmethod
+    def from_points(
+        cls, points: Iterable[Point], chunk_bits: Optional[int] = None, dimensions: int = 2
+    ) -> 'PointSet':
+        """The set of the points, bounded by their bounding box.
+
+        Without points the set is empty and bounded by the origin of the given number of dimensions.
+        """
+        points = list(points)
+        if not points:
+            return cls((0,) * dimensions, (0,) * dimensions, chunk_bits)
+
+        axes = list(zip(*points))
+        result = cls([min(a) for a in axes], [max(a) for a in axes], chunk_bits)
+        for point in points:
+            result.add(point)
+        return result
+
+    def copy(self) -> 'PointSet':
+        result = PointSet(self.lows, self.highs, self.chunk_bits)
+        result.chunks = dict(self.chunks)
+        return result
+
+    def _row(self, point: Point) -> int:
+        return sum([(p - low) * s for p, low, s in zip(point[1:], self.lows[1:], self._row_strides)])
+
+    def _row_point(self, row: int) -> Point:
+        """The coordinates along the other axes of a row number, i.e. a point without its first coordinate."""
+        other = []
+        for low, high in zip(self.lows[1:], self.highs[1:]):
+            row, offset = divmod(row, high - low + 1)
+            other.append(low + offset)
+        return tuple(other)
+
+    def _locate(self, point: Point) -> Tuple[int, int]:
+        """Chunk number and bit of a point inside the bounding box."""
+        chunk, bit = divmod(point[0] - self.lows[0], self.chunk_bits)
+        return self._row(point) * self.chunks_per_row + chunk, bit
+
+    def _inside(self, point: Point) -> bool:
+        return all([low <= p <= high for p, low, high in zip(point, self.lows, self.highs)])
+
+    def __contains__(self, point: Point) -> bool:
+        if not self._inside(point):
+            return False
+
+        key, bit = self._locate(point)
+        return bool(self.chunks.get(key, 0) >> bit & 1)
+
+    def add(self, point: Point):
+        if not self._inside(point):
+            raise ValueError(f'{point} is outside of the bounding box {self.lows} - {self.highs}')
+
+        key, bit = self._locate(point)
+        self.chunks[key] = self.chunks.get(key, 0) | 1 << bit
+
+    def discard(self, point: Point):
+        if not self._inside(point):
+            return
+
+        key, bit = self._locate(point)
+        bits = self.chunks.get(key, 0) & ~(1 << bit)
+        if bits:
+            self.chunks[key] = bits
+        else:
+            self.chunks.pop(key, None)
+
+    def _box_masks(self, lows: Sequence[int], highs: Sequence[int]) -> Iterator[Tuple[int, int]]:
+        """Chunk numbers and masks of the points of a box, clipped to the bounding box."""
+        lows = [max(low, bound) for low, bound in zip(lows, self.lows)]
+        highs = [min(high, bound) for high, bound in zip(highs, self.highs)]
+        if any([low > high for low, high in zip(lows, highs)]):
+            return
+
+        # The masks of the chunks of a single row, they are the same for every row of the box
+        start = lows[0] - self.lows[0]
+        end = highs[0] - self.lows[0]
+        masks = []
+        for chunk in range(start // self.chunk_bits, end // self.chunk_bits + 1):
+            offset = chunk * self.chunk_bits
+            first = max(start, offset) - offset
+            last = min(end, offset + self.chunk_bits - 1) - offset
+            masks.append((chunk, ((1 << (last - first + 1)) - 1) << first))
+
+        other_axes = [
+            range(low - bound, high - bound + 1) for low, high, bound in zip(lows[1:], highs[1:], self.lows[1:])
+        ]
+        for offsets in product(*other_axes):
+            row = sum([o * s for o, s in zip(offsets, self._row_strides)]) * self.chunks_per_row
+            for chunk, mask in masks:
+                yield row + chunk, mask
+
+    def add_box(self, lows: Sequence[int], highs: Sequence[int]):
+        """Add every point of the inclusive box, the part outside of the bounding box is ignored."""
+        chunks = self.chunks
+        for key, mask in self._box_masks(lows, highs):
+            chunks[key] = chunks.get(key, 0) | mask
+
+    def remove_box(self, lows: Sequence[int], highs: Sequence[int]):
+        """Remove every point of the inclusive box, the part outside of the bounding box is ignored."""
+        chunks = self.chunks
+        for key, mask in self._box_masks(lows, highs):
+            bits = chunks.get(key, 0) & ~mask
+            if bits:
+                chunks[key] = bits
+            else:
+                chunks.pop(key, None)
+
+    def _check_compatible(self, other: 'PointSet'):
+        if (self.lows, self.highs, self.chunk_bits) != (other.lows, other.highs, other.chunk_bits):
+            raise ValueError('The point sets have different bounding boxes or chunk sizes')
+
+    def __ior__(self, other: 'PointSet') -> 'PointSet':
+        self._check_compatible(other)
+        chunks = self.chunks
+        for key, bits in other.chunks.items():
+            chunks[key] = chunks.get(key, 0) | bits
+        return self
+
+    def __or__(self, other: 'PointSet') -> 'PointSet':
+        result = self.copy()
+        result |= other
+        return result
+
+    def union(self, other: 'PointSet') -> 'PointSet':
+        return self | other
+
+    def fold(self, axis: int, value: int) -> 'PointSet':
+        """Mirror the points beyond value along an axis onto the side before it, dropping the points on value.
+
+        The result is bounded by the folded bounding box. Folding along the first axis mirrors the bits of every row,
+        folding along another axis merges whole rows, so no point is visited on its own.
+        """
+        lows, highs = list(self.lows), list(self.highs)
+        lows[axis] = min(self.lows[axis], 2 * value - self.highs[axis])
+        highs[axis] = max(min(self.highs[axis], value - 1), lows[axis])
+        result = PointSet(lows, highs, self.chunk_bits)
+        chunks = result.chunks
+
+        if axis > 0:
+            for key, bits in self.chunks.items():
+                row, chunk = divmod(key, self.chunks_per_row)
+                other = list(self._row_point(row))
+                if other[axis - 1] == value:
+                    continue
+                if other[axis - 1] > value:
+                    other[axis - 1] = 2 * value - other[axis - 1]
+
+                key = result._row((0, *other)) * result.chunks_per_row + chunk
+                chunks[key] = chunks.get(key, 0) | bits
+            return result
+
+        # Whole rows as single ints, the bits below value are shifted and the bits above it reversed into place
+        rows: Dict[int, int] = {}
+        for key, bits in self.chunks.items():
+            row, chunk = divmod(key, self.chunks_per_row)
+            rows[row] = rows.get(row, 0) | bits << chunk * self.chunk_bits
+
+        below_bits = max(0, min(value, self.highs[0] + 1) - self.lows[0])
+        above_bits = self.highs[0] - max(value, self.lows[0] - 1)
+        below_shift = self.lows[0] - lows[0]
+        above_shift = 2 * value - self.highs[0] - lows[0]
+        for row, bits in rows.items():
+            folded = (bits & (1 << below_bits) - 1) << below_shift
+            above = bits >> self.highs[0] - self.lows[0] + 1 - above_bits if above_bits > 0 else 0
+            if above:
+                folded |= int(format(above, f'0{above_bits}b')[::-1], 2) << above_shift
+
+            row = result._row((0, *self._row_point(row)))
+            chunk = 0
+            while folded:
+                bits = folded & (1 << result.chunk_bits) - 1
+                if bits:
+                    chunks[row * result.chunks_per_row + chunk] = bits
+                folded >>= result.chunk_bits
+                chunk += 1
+
+        return result
+
+    def __len__(self) -> int:
+        return sum([_bit_count(bits) for bits in self.chunks.values()])
+
+    def __bool__(self) -> bool:
+        return bool(self.chunks)
+
+    def __iter__(self) -> Iterator[Point]:
+        """The points ordered by their last axis first, e.g. row by row for (x, y)."""
+        for key in sorted(self.chunks):
+            row, chunk = divmod(key, self.chunks_per_row)
+            other = self._row_point(row)
+
+            x = self.lows[0] + chunk * self.chunk_bits
+            bits = self.chunks[key]
+            while bits:
+                lowest = bits & -bits
+                yield (x + lowest.bit_length() - 1,) + other
+                bits ^= lowest
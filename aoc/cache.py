@@ -0,0 +1,140 @@
+"""Advent of Code 2021 - Caches
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import hashlib
+import os
+import pickle
+from types import ModuleType
+
+from aoc.days import ROOT_DIR
+
+CACHE_DIR = os.path.join(ROOT_DIR, '.cache')
+
+# Default size limit of a store, the least recently used entries are evicted above it
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_digest(filename: str) -> str:
+    h = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class PickleStore:
+    """A directory of pickled values with least recently used eviction.
+
+    The modification time of an entry is its last use, reading an entry touches it.
+    """
+
+    SUFFIX = '.pickle'
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (True, value) on a hit and (False, None) on a miss."""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+
+        return True, value
+
+    def keys(self, prefix: str = '') -> List[str]:
+        """The keys of the entries that start with prefix, without reading them."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+
+        return [
+            name[: -len(self.SUFFIX)]
+            for name in names
+            if name.startswith(prefix) and name.endswith(self.SUFFIX)
+        ]
+
+    def put(self, key: str, value: Any):
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Write to a temporary file first since several workers can use the same store
+        path = self.path(key)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue  # evicted by another worker
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum([size for _, size, _ in entries])
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def parsed_input_store(max_bytes: int = DEFAULT_MAX_BYTES) -> PickleStore:
+    return PickleStore(os.path.join(CACHE_DIR, 'parsed'), max_bytes)
+
+
+def parse_cached(
+    module: ModuleType, day: int, filename: str, store: Optional[PickleStore]
+) -> Tuple[Any, bool]:
+    """Parse the input or load it from the store, returns (data, cache_hit).
+
+    Only days that define a PARSER_VERSION are cached, it has to be bumped whenever the parsed representation
+    changes. Other days are parsed as usual, e.g. when the parsed data is a view that cannot be pickled.
+    """
+    version = getattr(module, 'PARSER_VERSION', None)
+    if store is None or version is None:
+        return module.parse(filename), False
+
+    key = f'day_{day:02}-v{version}-{file_digest(filename)}'
+    hit, data = store.get(key)
+    if hit:
+        return data, True
+
+    data = module.parse(filename)
+    store.put(key, data)
+    return data, False
@@ -0,0 +1,162 @@
+"""Advent of Code 2021 - Empirical complexity
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import json
+from dataclasses import asdict
+from dataclasses import dataclass
+from math import exp
+from math import log
+
+from aoc.runner import run_day
+
+PHASES = ['parse', 'part1', 'part2']
+
+# The exponent that each phase needs at most in terms of the generator scale, anything above it (plus the tolerance)
+# is flagged. None means that the scale is not proportional to the work, e.g. day 12 adds caves logarithmically and
+# the number of paths grows exponentially.
+DEFAULT_EXPECTED_EXPONENT = 1.0
+EXPECTED_EXPONENTS: Dict[Tuple[int, str], Optional[float]] = {
+    (12, 'part1'): None,
+    (12, 'part2'): None,
+    (17, 'part1'): None,
+    (17, 'part2'): None,
+    (18, 'part2'): 2.0,  # all pairs of numbers
+    (21, 'part1'): None,
+    (21, 'part2'): None,
+}
+
+
+@dataclass
+class ComplexityFit:
+    day: int
+    phase: str
+    exponent: float
+    coefficient: float
+    samples: List[Tuple[int, float]]
+    expected_exponent: Optional[float]
+
+    def project(self, scale: float) -> float:
+        """Projected runtime in seconds at scale times the real input size."""
+        return self.coefficient * scale ** self.exponent
+
+    def is_superlinear(self, tolerance: float) -> bool:
+        return (
+            self.expected_exponent is not None
+            and self.exponent > self.expected_exponent + tolerance
+        )
+
+
+def fit_power_law(samples: List[Tuple[int, float]]) -> Tuple[float, float]:
+    """Least squares fit of t = c * n^k in log-log space, returns (k, c)."""
+    xs = [log(n) for n, _ in samples]
+    # Clamp the timings, the logarithm of a zero duration is not defined
+    ys = [log(max(t, 1e-9)) for _, t in samples]
+
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    variance = sum([(x - x_mean) ** 2 for x in xs])
+    if variance == 0:
+        return 0.0, exp(y_mean)
+
+    k = sum([(x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)]) / variance
+    return k, exp(y_mean - k * x_mean)
+
+
+def measure_day(
+    day: int, scales: List[int], seed: int = 0, repeat: int = 1, budget: float = 30.0
+) -> Dict[str, List[Tuple[int, float]]]:
+    """Time every phase at the given scales (best of repeat).
+
+    Every run parses and solves, none of the caches are used, so that no phase is served from an earlier run, see
+    aoc.runner.run_day(). Larger scales are skipped as soon as a run takes longer than the budget in seconds.
+    """
+    samples: Dict[str, List[Tuple[int, float]]] = {phase: [] for phase in PHASES}
+    for scale in scales:
+        best: Dict[str, float] = {}
+        total = 0.0
+        for _ in range(repeat):
+            result = run_day(day, scale=scale, seed=seed, use_cache=False)
+            if result.error is not None:
+                raise RuntimeError(f'Day {day} failed at scale {scale}:\n{result.error}')
+
+            for timing in result.timings:
+                if timing.phase in samples:
+                    best[timing.phase] = min(best.get(timing.phase, timing.wall), timing.wall)
+            total = sum([t.wall for t in result.timings])
+
+        for phase, wall in best.items():
+            samples[phase].append((scale, wall))
+
+        if total > budget:
+            break
+
+    return samples
+
+
+def analyze_day(
+    day: int, scales: List[int], seed: int = 0, repeat: int = 1, budget: float = 30.0
+) -> List[ComplexityFit]:
+    fits = []
+    for phase, samples in measure_day(day, scales, seed, repeat, budget).items():
+        if len(samples) < 2:
+            continue
+
+        exponent, coefficient = fit_power_law(samples)
+        expected = EXPECTED_EXPONENTS.get((day, phase), DEFAULT_EXPECTED_EXPONENT)
+        fits.append(ComplexityFit(day, phase, exponent, coefficient, samples, expected))
+
+    return fits
+
+
+def format_report(fits: List[ComplexityFit], tolerance: float) -> str:
+    lines = [
+        f'{"Day":>3}  {"Phase":<6} {"Scales":<12} {"Exponent":>8} {"Expected":>8} '
+        f'{"t(1x) (s)":>10} {"t(10x) (s)":>11} {"t(100x) (s)":>12}'
+    ]
+    for fit in fits:
+        scales = f'{fit.samples[0][0]}-{fit.samples[-1][0]}'
+        expected = '-' if fit.expected_exponent is None else f'{fit.expected_exponent:.1f}'
+        line = (
+            f'{fit.day:>3}  {fit.phase:<6} {scales:<12} {fit.exponent:>8.2f} {expected:>8} '
+            f'{fit.project(1):>10.4f} {fit.project(10):>11.3f} {fit.project(100):>12.2f}'
+        )
+        if fit.is_superlinear(tolerance):
+            line += '  super-linear'
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+
+def to_json(fits: List[ComplexityFit], tolerance: float) -> List[Dict[str, Any]]:
+    return [
+        dict(
+            asdict(fit),
+            projected_10x=fit.project(10),
+            projected_100x=fit.project(100),
+            superlinear=fit.is_superlinear(tolerance),
+        )
+        for fit in fits
+    ]
+
+
+def save(fits: List[ComplexityFit], tolerance: float, filename: str):
+    with open(filename, 'w') as f:
+        json.dump(to_json(fits, tolerance), f, indent=2)
@@ -0,0 +1,52 @@
+"""Advent of Code 2021 - Counters
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Dict
+
+# Solvers check this before counting so that disabled counters only cost a lookup, e.g.
+#
+#     if counters.enabled:
+#         counters.add('splits')
+enabled = False
+
+_values: Dict[str, Any] = {}
+
+
+def add(name: str, amount: int = 1):
+    _values[name] = _values.get(name, 0) + amount
+
+
+def maximum(name: str, value: int):
+    _values[name] = max(_values.get(name, value), value)
+
+
+def append(name: str, value: Any):
+    _values.setdefault(name, []).append(value)
+
+
+def start():
+    global enabled
+    _values.clear()
+    enabled = True
+
+
+def stop() -> Dict[str, Any]:
+    """Disable the counters, returning what was counted since start()."""
+    global enabled
+    enabled = False
+    values = dict(_values)
+    _values.clear()
+    return values
@@ -0,0 +1,193 @@
+"""Advent of Code 2021 - Solver daemon
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+    A long-lived process with every day preloaded, answering solve requests with one JSON object per line:
+
+        {"day": 15, "part": 2, "input": "generated/day_15/input_x4_seed0.txt"}
+
+    "part" and "input" are optional, both parts and the day's input.txt are solved by default. The response is a
+    single line too:
+
+        {"day": 15, "input": "...", "answers": {"2": 2821}, "cached": [], "status": "ok", "timings": [...], ...}
+"""
+from typing import Any
+from typing import Dict
+from typing import IO
+from typing import List
+from typing import Optional
+
+import json
+import os
+import socket
+import socketserver
+import traceback
+from collections import OrderedDict
+from dataclasses import asdict
+from types import ModuleType
+
+from aoc import intermediates
+from aoc.cache import file_digest
+from aoc.cache import parse_cached
+from aoc.cache import parsed_input_store
+from aoc.days import DAYS
+from aoc.days import input_path
+from aoc.days import load_day
+from aoc.results import ResultStore
+from aoc.results import code_digest
+from aoc.runner import PhaseTiming
+from aoc.runner import timed
+
+# Number of parsed inputs kept in memory, the least recently used ones are dropped above it
+MAX_PARSED_INPUTS = 32
+
+
+class Solver:
+    """Every day module loaded once, with parsed inputs kept in memory between requests."""
+
+    def __init__(self, days: List[int] = DAYS, use_cache: bool = True):
+        self.modules: Dict[int, ModuleType] = {}
+        self.code_digests: Dict[int, str] = {}
+        self.import_errors: Dict[int, str] = {}
+        for day in days:
+            try:
+                self.modules[day] = load_day(day)
+                self.code_digests[day] = code_digest(self.modules[day])
+            except Exception:
+                self.import_errors[day] = traceback.format_exc()
+
+        self.parsed: 'OrderedDict[tuple, Any]' = OrderedDict()
+        self.parsed_inputs = parsed_input_store() if use_cache else None
+        self.results = ResultStore() if use_cache else None
+        if use_cache:
+            intermediates.enable()
+
+    def close(self):
+        if self.results is not None:
+            self.results.close()
+        intermediates.disable()
+
+    def parse(self, day: int, filename: str, digest: str, timings: List[PhaseTiming]) -> Any:
+        key = (day, digest)
+        if key in self.parsed:
+            self.parsed.move_to_end(key)
+            return self.parsed[key]
+
+        data, _ = timed(
+            timings, 'parse', parse_cached, self.modules[day], day, filename, self.parsed_inputs
+        )
+        self.parsed[key] = data
+        if len(self.parsed) > MAX_PARSED_INPUTS:
+            self.parsed.popitem(last=False)
+        return data
+
+    def solve(
+        self, day: int, part: Optional[int] = None, filename: Optional[str] = None
+    ) -> Dict[str, Any]:
+        filename = os.path.abspath(filename or input_path(day))
+        response: Dict[str, Any] = {
+            'day': day,
+            'input': filename,
+            'answers': {},
+            'cached': [],
+            'status': 'ok',
+            'timings': [],
+            'error': None,
+        }
+
+        timings: List[PhaseTiming] = []
+        try:
+            if day in self.import_errors:
+                raise ImportError(f'Day {day} failed to import:\n{self.import_errors[day]}')
+            if day not in self.modules:
+                raise ValueError(f'Unknown day {day}')
+            module = self.modules[day]
+
+            digest = timed(timings, 'lookup', file_digest, filename)
+            for part in [part] if part else [1, 2]:
+                stored = None
+                if self.results is not None:
+                    stored = self.results.get(day, part, digest, self.code_digests[day])
+                if stored is not None:
+                    response['answers'][str(part)] = stored.answer
+                    response['cached'].append(part)
+                    continue
+
+                data = self.parse(day, filename, digest, timings)
+                solve = getattr(module, f'solve_part{part}')
+                answer = timed(timings, f'part{part}', solve, data)
+                response['answers'][str(part)] = answer
+                if self.results is not None:
+                    timing = timings[-1]
+                    self.results.put(
+                        day, part, digest, self.code_digests[day], answer, timing.wall, timing.cpu
+                    )
+
+            if filename == input_path(day):
+                for part, answer in response['answers'].items():
+                    if answer != module.ANSWERS[int(part) - 1]:
+                        response['status'] = 'mismatch'
+        except Exception:
+            response['status'] = 'error'
+            response['error'] = traceback.format_exc()
+
+        response['timings'] = [asdict(t) for t in timings]
+        return response
+
+    def handle(self, line: str) -> str:
+        try:
+            request = json.loads(line)
+            response = self.solve(request['day'], request.get('part'), request.get('input'))
+        except (ValueError, KeyError, TypeError):
+            response = {'status': 'error', 'error': traceback.format_exc()}
+        return json.dumps(response)
+
+
+def serve_stdio(solver: Solver, stdin: IO[str], stdout: IO[str]):
+    """Answer the requests read from stdin until it is closed."""
+    for line in stdin:
+        if line.strip():
+            stdout.write(solver.handle(line) + '\n')
+            stdout.flush()
+
+
+def serve_unix(solver: Solver, path: str):
+    """Answer the requests of every connection to a Unix socket, one connection at a time."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if line.strip():
+                    self.wfile.write(solver.handle(line.decode()).encode() + b'\n')
+
+    if os.path.exists(path):
+        os.remove(path)
+    with socketserver.UnixStreamServer(path, Handler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(path)
+
+
+def request(
+    path: str, day: int, part: Optional[int] = None, filename: Optional[str] = None
+) -> Dict[str, Any]:
+    """Send a single request to a daemon listening on a Unix socket."""
+    message = {'day': day, 'part': part, 'input': filename and os.path.abspath(filename)}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(path)
+        s.sendall(json.dumps(message).encode() + b'\n')
+        s.shutdown(socket.SHUT_WR)
+        with s.makefile('rb') as f:
+            return json.loads(f.readline())
@@ -0,0 +1,62 @@
+"""Advent of Code 2021 - Day discovery
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import List
+
+import importlib
+import os
+import sys
+from types import ModuleType
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DAYS = list(range(1, 23))
+
+
+def day_dir(day: int) -> str:
+    return os.path.join(ROOT_DIR, f'day_{day:02}')
+
+
+def input_path(day: int, filename: str = 'input.txt') -> str:
+    return os.path.join(day_dir(day), filename)
+
+
+def load_day(day: int) -> ModuleType:
+    """Import the solver of a day, i.e. day_XX/main.py."""
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+
+    return importlib.import_module(f'day_{day:02}.main')
+
+
+def parse_days(selection: str) -> List[int]:
+    """Parse a day selection such as '1-5,9,12-22'."""
+    days = []
+    for part in selection.split(','):
+        part = part.strip()
+        if not part:
+            continue
+
+        if '-' in part:
+            first, last = part.split('-')
+            days.extend(range(int(first), int(last) + 1))
+        else:
+            days.append(int(part))
+
+    for day in days:
+        if day not in DAYS:
+            raise ValueError(f'No solver for day {day}')
+
+    return sorted(set(days))
@@ -0,0 +1,52 @@
+"""Advent of Code 2021 - Input generators
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import importlib
+import os
+from random import Random
+from typing import Optional
+
+from aoc.days import ROOT_DIR
+
+GENERATED_DIR = os.path.join(ROOT_DIR, 'generated')
+
+
+def generate(day: int, scale: int = 1, seed: int = 0) -> str:
+    """Generate a puzzle input for the day.
+
+    The scale is a factor on the size of the real input, e.g. the line count or the cell count of a grid. The same
+    seed always gives the same input.
+    """
+    module = importlib.import_module(f'aoc.generators.day_{day:02}')
+    return module.generate(scale, Random(seed))
+
+
+def write_input(
+    day: int, scale: int = 1, seed: int = 0, directory: Optional[str] = None
+) -> str:
+    """Write a generated input to disk and return the filename."""
+    if directory is None:
+        directory = os.path.join(GENERATED_DIR, f'day_{day:02}')
+    os.makedirs(directory, exist_ok=True)
+
+    filename = os.path.join(directory, f'input_x{scale}_seed{seed}.txt')
+
+    # Write to a temporary file first since several workers can generate the same input
+    tmp_filename = f'{filename}.{os.getpid()}.tmp'
+    with open(tmp_filename, 'w') as f:
+        f.write(generate(day, scale, seed))
+    os.replace(tmp_filename, filename)
+
+    return filename
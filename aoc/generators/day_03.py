@@ -0,0 +1,50 @@
+"""Advent of Code 2021 - Day 3 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from random import Random
+
+
+def flip_bit(bits: str, index: int) -> str:
+    return bits[:index] + ('0' if bits[index] == '1' else '1') + bits[index + 1 :]
+
+
+def generate(scale: int, rng: Random) -> str:
+    # An odd count means that the most and least common bits are never tied
+    count = 1000 * scale + 1
+    width = max(12, (4 * count).bit_length())
+
+    # Unique numbers, otherwise the bit criteria can never narrow the list down to one number
+    rows = [f'{n:0{width}b}' for n in rng.sample(range(2 ** width), count)]
+
+    # Walk the least common bit criteria (CO2 scrubber rating) and make sure that both bits are present for every
+    # position, otherwise the criteria would remove all numbers. Flipping a bit cannot create a duplicate since all
+    # numbers with the same prefix are candidates.
+    candidates = list(range(count))
+    for index in range(width):
+        if len(candidates) == 1:
+            break
+
+        zeros = [c for c in candidates if rows[c][index] == '0']
+        ones = [c for c in candidates if rows[c][index] == '1']
+        if not zeros or not ones:
+            c = rng.choice(candidates)
+            rows[c] = flip_bit(rows[c], index)
+
+            zeros = [c for c in candidates if rows[c][index] == '0']
+            ones = [c for c in candidates if rows[c][index] == '1']
+
+        candidates = zeros if len(zeros) <= len(ones) else ones
+
+    return '\n'.join(rows) + '\n'
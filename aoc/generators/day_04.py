@@ -0,0 +1,55 @@
+"""Advent of Code 2021 - Day 4 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Dict
+from typing import List
+
+from random import Random
+
+SIZE = 5
+
+
+def win_turn(board: List[List[int]], turns: Dict[int, int]) -> int:
+    lines = board + [list(col) for col in zip(*board)]
+    return min([max([turns[n] for n in line]) for line in lines])
+
+
+def generate(scale: int, rng: Random) -> str:
+    numbers = list(range(100 * scale))
+    drawn_numbers = numbers.copy()
+    rng.shuffle(drawn_numbers)
+    turns = {n: turn for turn, n in enumerate(drawn_numbers)}
+
+    boards = []
+    for _ in range(100 * scale):
+        values = rng.sample(numbers, SIZE * SIZE)
+        boards.append([values[i : i + SIZE] for i in range(0, len(values), SIZE)])
+
+    # The last winner must be unique, otherwise the final boards win on the same draw and there is no answer
+    win_turns = [win_turn(b, turns) for b in boards]
+    last_turn = max(win_turns)
+    last_winners = [i for i, t in enumerate(win_turns) if t == last_turn]
+    for i in last_winners[1:]:
+        while win_turn(boards[i], turns) >= last_turn:
+            values = rng.sample(numbers, SIZE * SIZE)
+            boards[i] = [values[j : j + SIZE] for j in range(0, len(values), SIZE)]
+
+    width = len(str(numbers[-1]))
+    board_strs = [
+        '\n'.join([' '.join([f'{n:>{width}}' for n in row]) for row in board])
+        for board in boards
+    ]
+
+    return ','.join([str(n) for n in drawn_numbers]) + '\n\n' + '\n\n'.join(board_strs) + '\n'
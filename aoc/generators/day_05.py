@@ -0,0 +1,38 @@
+"""Advent of Code 2021 - Day 5 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from random import Random
+
+SIZE = 1000
+
+
+def generate(scale: int, rng: Random) -> str:
+    lines = []
+    while len(lines) < 500 * scale:
+        x1 = rng.randrange(SIZE)
+        y1 = rng.randrange(SIZE)
+        x_step, y_step = rng.choice(
+            [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+        )
+        length = rng.randint(1, SIZE // 2)
+
+        x2 = x1 + x_step * length
+        y2 = y1 + y_step * length
+        if not (0 <= x2 < SIZE and 0 <= y2 < SIZE):
+            continue
+
+        lines.append(f'{x1},{y1} -> {x2},{y2}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,51 @@
+"""Advent of Code 2021 - Day 8 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from random import Random
+
+SEGMENTS = 'abcdefg'
+
+DIGITS = [
+    'abcefg',
+    'cf',
+    'acdeg',
+    'acdfg',
+    'bcdf',
+    'abdfg',
+    'abdefg',
+    'acf',
+    'abcdefg',
+    'abcdfg',
+]
+
+
+def generate(scale: int, rng: Random) -> str:
+    lines = []
+    for _ in range(200 * scale):
+        wiring = dict(zip(SEGMENTS, rng.sample(SEGMENTS, len(SEGMENTS))))
+
+        def pattern(digit: int) -> str:
+            wires = [wiring[s] for s in DIGITS[digit]]
+            rng.shuffle(wires)
+            return ''.join(wires)
+
+        input_digits = list(range(10))
+        rng.shuffle(input_digits)
+        input_values = [pattern(d) for d in input_digits]
+        output_values = [pattern(rng.randrange(10)) for _ in range(4)]
+
+        lines.append(f'{" ".join(input_values)} | {" ".join(output_values)}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,28 @@
+"""Advent of Code 2021 - Day 9 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from random import Random
+
+HEIGHTS = '0123456789'
+
+# Nines are the basin borders so they are more common than the other heights
+WEIGHTS = [1, 1, 1, 1, 1, 1, 1, 1, 1, 3]
+
+
+def generate(scale: int, rng: Random) -> str:
+    side = round(100 * scale ** 0.5)
+
+    rows = [''.join(rng.choices(HEIGHTS, WEIGHTS, k=side)) for _ in range(side)]
+    return '\n'.join(rows) + '\n'
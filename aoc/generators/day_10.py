@@ -0,0 +1,51 @@
+"""Advent of Code 2021 - Day 10 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import List
+
+from random import Random
+
+PAIRS = {'(': ')', '[': ']', '{': '}', '<': '>'}
+
+
+def generate_line(rng: Random, length: int, corrupted: bool) -> str:
+    """Generate an incomplete line, if corrupted then one closing character is replaced with an incorrect one."""
+    result: List[str] = []
+    stack: List[str] = []
+    for _ in range(length):
+        if not stack or rng.random() < 0.55:
+            c = rng.choice(list(PAIRS))
+            stack.append(c)
+            result.append(c)
+        else:
+            result.append(PAIRS[stack.pop()])
+
+    if corrupted:
+        closing_indexes = [i for i, c in enumerate(result) if c in ')]}>']
+        if not closing_indexes:
+            return generate_line(rng, length, corrupted)
+
+        i = rng.choice(closing_indexes)
+        result[i] = rng.choice([c for c in ')]}>' if c != result[i]])
+
+    return ''.join(result)
+
+
+def generate(scale: int, rng: Random) -> str:
+    lines = [
+        generate_line(rng, rng.randint(90, 110), rng.random() < 0.5)
+        for _ in range(100 * scale)
+    ]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,84 @@
+"""Advent of Code 2021 - Day 11 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import List
+from typing import Optional
+
+from math import gcd
+from random import Random
+
+ENERGIES = '0123456789'
+
+# The coefficients (a, b) of the energy waves (a * x + b * y + c) mod 10 that take every energy level
+WAVE_COEFFICIENTS = [(a, b) for a in range(1, 10) for b in range(1, 10) if gcd(gcd(a, b), 10) == 1]
+
+# Grids that synchronize do so within a few hundred steps, the others are rejected after this many
+SYNCHRONIZE_LIMIT = 500
+
+
+def steps_to_synchronize(rows: List[str], limit: int) -> Optional[int]:
+    """Simulate the octopuses (iteratively) and return the first step where all of them flash."""
+    height = len(rows)
+    width = len(rows[0])
+    energy = [[int(v) for v in row] for row in rows]
+
+    for step in range(1, limit + 1):
+        flashing = []
+        for y in range(height):
+            for x in range(width):
+                energy[y][x] += 1
+                if energy[y][x] == 10:
+                    flashing.append((x, y))
+
+        while flashing:
+            x, y = flashing.pop()
+            for adj_y in range(max(0, y - 1), min(height, y + 2)):
+                for adj_x in range(max(0, x - 1), min(width, x + 2)):
+                    energy[adj_y][adj_x] += 1
+                    if energy[adj_y][adj_x] == 10:
+                        flashing.append((adj_x, adj_y))
+
+        flash_count = 0
+        for row in energy:
+            for x, value in enumerate(row):
+                if value > 9:
+                    row[x] = 0
+                    flash_count += 1
+
+        if flash_count == width * height:
+            return step
+
+    return None
+
+
+def generate(scale: int, rng: Random) -> str:
+    """Generate an energy grid where all octopuses eventually flash at the same time (part 2).
+
+    Every energy level 0-9 is equally common. Up to the 10x10 of the real input the energies are independent, larger
+    grids of independent energies practically never synchronize. These are a wave of energies (a * x + b * y + c) mod
+    10 instead, about one in four of which synchronizes.
+    """
+    side = round(10 * scale ** 0.5)
+
+    while True:
+        if side <= 10:
+            rows = [''.join(rng.choices(ENERGIES, k=side)) for _ in range(side)]
+        else:
+            a, b = rng.choice(WAVE_COEFFICIENTS)
+            c = rng.randrange(10)
+            rows = [''.join([ENERGIES[(a * x + b * y + c) % 10] for x in range(side)]) for y in range(side)]
+
+        if steps_to_synchronize(rows, SYNCHRONIZE_LIMIT) is not None:
+            return '\n'.join(rows) + '\n'
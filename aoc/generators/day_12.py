@@ -0,0 +1,52 @@
+"""Advent of Code 2021 - Day 12 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from itertools import product
+from math import log2
+from random import Random
+from string import ascii_lowercase
+
+
+def generate(scale: int, rng: Random) -> str:
+    """Generate a cave system.
+
+    The number of paths grows exponentially with the number of caves, the scale therefore only adds caves
+    logarithmically.
+    """
+    extra = round(log2(scale)) if scale > 1 else 0
+    names = [''.join(p) for p in product(ascii_lowercase, repeat=2)]
+    rng.shuffle(names)
+
+    small_caves = names[: 6 + 2 * extra]
+    big_caves = [n.upper() for n in names[len(small_caves) : len(small_caves) + 2 + extra]]
+
+    # A dict keeps the insertion order, sets of strings are iterated in a different order every run
+    connections = {}
+    for cave in small_caves:
+        # Big caves are never connected to each other, there would be infinitely many paths
+        connections[(cave, rng.choice(big_caves))] = None
+        if rng.random() < 0.5:
+            other = rng.choice([c for c in small_caves if c != cave])
+            connections[tuple(sorted([cave, other]))] = None
+
+    for cave in rng.sample(small_caves + big_caves, 3):
+        connections[('start', cave)] = None
+    for cave in rng.sample(small_caves + big_caves, 3):
+        connections[(cave, 'end')] = None
+
+    lines = [f'{a}-{b}' if rng.random() < 0.5 else f'{b}-{a}' for a, b in connections]
+    rng.shuffle(lines)
+
+    return '\n'.join(lines) + '\n'
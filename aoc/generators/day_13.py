@@ -0,0 +1,51 @@
+"""Advent of Code 2021 - Day 13 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from math import log2
+from random import Random
+
+# Size of the paper after all folds
+WIDTH = 40
+HEIGHT = 6
+
+
+def generate(scale: int, rng: Random) -> str:
+    # Every fold halves the paper, the scale adds folds to both axes so that the dot density stays the same
+    extra_folds = round(log2(scale) / 2) if scale > 1 else 0
+    x_fold_count = 5 + extra_folds
+    y_fold_count = 7 + extra_folds
+
+    width = (WIDTH + 1) * 2 ** x_fold_count - 1
+    height = (HEIGHT + 1) * 2 ** y_fold_count - 1
+
+    x_folds = [(width + 1) // 2 ** (i + 1) - 1 for i in range(x_fold_count)]
+    y_folds = [(height + 1) // 2 ** (i + 1) - 1 for i in range(y_fold_count)]
+
+    # Dots on the first fold lines are not allowed
+    dots = {}
+    while len(dots) < 745 * scale:
+        x = rng.randrange(width)
+        y = rng.randrange(height)
+        if x != x_folds[0] and y != y_folds[0]:
+            dots[(x, y)] = None
+
+    folds = []
+    for i in range(max(x_fold_count, y_fold_count)):
+        if i < x_fold_count:
+            folds.append(f'fold along x={x_folds[i]}')
+        if i < y_fold_count:
+            folds.append(f'fold along y={y_folds[i]}')
+
+    return '\n'.join([f'{x},{y}' for x, y in dots]) + '\n\n' + '\n'.join(folds) + '\n'
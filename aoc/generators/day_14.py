@@ -0,0 +1,27 @@
+"""Advent of Code 2021 - Day 14 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from random import Random
+
+ELEMENTS = 'BCFHKNOPSV'
+
+
+def generate(scale: int, rng: Random) -> str:
+    template = ''.join(rng.choices(ELEMENTS, k=20 * scale))
+
+    rules = [f'{a}{b} -> {rng.choice(ELEMENTS)}' for a in ELEMENTS for b in ELEMENTS]
+    rng.shuffle(rules)
+
+    return template + '\n\n' + '\n'.join(rules) + '\n'
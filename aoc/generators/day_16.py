@@ -0,0 +1,56 @@
+"""Advent of Code 2021 - Day 16 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from math import log2
+from random import Random
+
+LITERAL = 4
+COMPARISONS = [5, 6, 7]
+OPERATORS = [0, 1, 2, 3] + COMPARISONS
+
+
+def encode_literal(value: int) -> str:
+    bits = f'{value:b}'
+    bits = '0' * (-len(bits) % 4) + bits
+
+    groups = [bits[i : i + 4] for i in range(0, len(bits), 4)]
+    return ''.join(['1' + g for g in groups[:-1]]) + '0' + groups[-1]
+
+
+def generate_packet(rng: Random, depth: int, literal_probability: float = 0.2) -> str:
+    header = f'{rng.randrange(8):03b}'
+
+    if depth == 0 or rng.random() < literal_probability:
+        return header + f'{LITERAL:03b}' + encode_literal(rng.randrange(2 ** 12))
+
+    packet_type = rng.choice(OPERATORS)
+    # Comparisons always have exactly two sub-packets
+    count = 2 if packet_type in COMPARISONS else rng.randint(1, 3)
+    sub_packets = ''.join([generate_packet(rng, depth - 1) for _ in range(count)])
+
+    header += f'{packet_type:03b}'
+    if len(sub_packets) < 2 ** 15 and rng.random() < 0.5:
+        return header + '0' + f'{len(sub_packets):015b}' + sub_packets
+    else:
+        return header + '1' + f'{count:011b}' + sub_packets
+
+
+def generate(scale: int, rng: Random) -> str:
+    """Generate a transmission, the packet tree gets deeper with the scale."""
+    depth = 6 + (round(log2(scale)) if scale > 1 else 0)
+    bits = generate_packet(rng, depth, literal_probability=0.0)
+    bits += '0' * (-len(bits) % 8)
+
+    return ''.join([f'{int(bits[i : i + 4], 2):X}' for i in range(0, len(bits), 4)]) + '\n'
@@ -0,0 +1,32 @@
+"""Advent of Code 2021 - Day 17 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from random import Random
+
+# The solver only tries velocities up to 300 so the target has to be within reach
+LIMIT = 299
+
+
+def generate(scale: int, rng: Random) -> str:
+    """Generate a target area, the scale grows the area (and thus the number of hitting velocities)."""
+    factor = scale ** 0.5
+
+    x1 = rng.randint(20, 150)
+    x2 = min(LIMIT, x1 + round(rng.randint(10, 60) * factor))
+
+    y2 = -rng.randint(5, 60)
+    y1 = max(-LIMIT, y2 - round(rng.randint(10, 60) * factor))
+
+    return f'target area: x={x1}..{x2}, y={y1}..{y2}\n'
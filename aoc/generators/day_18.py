@@ -0,0 +1,32 @@
+"""Advent of Code 2021 - Day 18 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from random import Random
+
+
+def generate_pair(rng: Random, nest_level: int = 1) -> str:
+    elements = []
+    for _ in range(2):
+        # Numbers in the input are never nested more than four levels deep
+        if nest_level < 4 and rng.random() < 0.6:
+            elements.append(generate_pair(rng, nest_level + 1))
+        else:
+            elements.append(str(rng.randrange(10)))
+
+    return f'[{elements[0]},{elements[1]}]'
+
+
+def generate(scale: int, rng: Random) -> str:
+    return '\n'.join([generate_pair(rng) for _ in range(100 * scale)]) + '\n'
@@ -0,0 +1,116 @@
+"""Advent of Code 2021 - Day 19 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from collections import defaultdict
+from itertools import permutations
+from itertools import product
+from random import Random
+
+Vector = Tuple[int, int, int]
+Matrix = Tuple[Vector, Vector, Vector]
+
+# Scanners detect beacons at most this far away in each axis
+RANGE = 1000
+
+
+def permutation_parity(permutation: Tuple[int, ...]) -> int:
+    inversions = 0
+    for i, a in enumerate(permutation):
+        for b in permutation[i + 1 :]:
+            if a > b:
+                inversions += 1
+    return -1 if inversions % 2 else 1
+
+
+def all_rotations() -> List[Matrix]:
+    """All 24 rotation matrices, i.e. the signed permutation matrices with determinant 1."""
+    result = []
+    for permutation in permutations(range(3)):
+        for signs in product([1, -1], repeat=3):
+            if permutation_parity(permutation) * signs[0] * signs[1] * signs[2] != 1:
+                continue
+
+            rows = []
+            for column, sign in zip(permutation, signs):
+                row = [0, 0, 0]
+                row[column] = sign
+                rows.append(tuple(row))
+            result.append(tuple(rows))
+    return result
+
+
+def rotate(matrix: Matrix, v: Vector) -> Vector:
+    return tuple([sum([m * c for m, c in zip(row, v)]) for row in matrix])
+
+
+def random_point_near(rng: Random, lower: Vector, upper: Vector) -> Vector:
+    return tuple([rng.randint(lo, up) for lo, up in zip(lower, upper)])
+
+
+def generate(scale: int, rng: Random) -> str:
+    """Generate scanner reports.
+
+    The scanners are placed as a random tree where every scanner overlaps its parent with at least 12 beacons, so
+    all scanners can be located relative to scanner 0.
+    """
+    rotations = all_rotations()
+
+    scanners: List[Vector] = [(0, 0, 0)]
+    beacons: List[Vector] = []
+    while len(scanners) < 30 * scale:
+        parent = rng.choice(scanners)
+
+        # Move mostly along one axis so that the cubes overlap
+        offset = [rng.randint(-200, 200) for _ in range(3)]
+        offset[rng.randrange(3)] = rng.choice([-1, 1]) * rng.randint(1000, 1200)
+        scanner = tuple([p + o for p, o in zip(parent, offset)])
+
+        lower = tuple([max(a, b) - RANGE for a, b in zip(parent, scanner)])
+        upper = tuple([min(a, b) + RANGE for a, b in zip(parent, scanner)])
+        beacons.extend([random_point_near(rng, lower, upper) for _ in range(12)])
+
+        scanners.append(scanner)
+
+    for scanner in scanners:
+        lower = tuple([c - RANGE for c in scanner])
+        upper = tuple([c + RANGE for c in scanner])
+        beacons.extend([random_point_near(rng, lower, upper) for _ in range(14)])
+
+    # Bucket the beacons so that every scanner only has to look at the buckets around it
+    buckets: Dict[Vector, List[Vector]] = defaultdict(list)
+    for beacon in dict.fromkeys(beacons):
+        buckets[tuple([c // RANGE for c in beacon])].append(beacon)
+
+    reports = []
+    for number, scanner in enumerate(scanners):
+        rotation = rng.choice(rotations)
+        bucket = tuple([c // RANGE for c in scanner])
+
+        readings = []
+        for offset in product([-1, 0, 1], repeat=3):
+            for beacon in buckets.get(tuple([b + o for b, o in zip(bucket, offset)]), []):
+                relative = tuple([b - s for b, s in zip(beacon, scanner)])
+                if all([abs(c) <= RANGE for c in relative]):
+                    readings.append(rotate(rotation, relative))
+        rng.shuffle(readings)
+
+        report = [f'--- scanner {number} ---'] + [f'{x},{y},{z}' for x, y, z in readings]
+        reports.append('\n'.join(report))
+
+    return '\n\n'.join(reports) + '\n'
@@ -0,0 +1,26 @@
+"""Advent of Code 2021 - Day 20 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from random import Random
+
+
+def generate(scale: int, rng: Random) -> str:
+    # The solver relies on the infinite background toggling between dark and light
+    algorithm = ['#'] + rng.choices('#.', k=510) + ['.']
+
+    side = round(100 * scale ** 0.5)
+    rows = [''.join(rng.choices('#.', k=side)) for _ in range(side)]
+
+    return ''.join(algorithm) + '\n\n' + '\n'.join(rows) + '\n'
@@ -0,0 +1,38 @@
+"""Advent of Code 2021 - Day 22 input generator
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import List
+
+from random import Random
+
+
+def generate_step(rng: Random, limit: int, min_size: int, max_size: int) -> str:
+    coords: List[int] = []
+    for _ in range(3):
+        size = rng.randint(min_size, max_size)
+        start = rng.randint(-limit, limit - size)
+        coords.extend([start, start + size])
+
+    x1, x2, y1, y2, z1, z2 = coords
+    action = 'on' if rng.random() < 0.6 else 'off'
+    return f'{action} x={x1}..{x2},y={y1}..{y2},z={z1}..{z2}'
+
+
+def generate(scale: int, rng: Random) -> str:
+    # The initialization procedure region (-50..50) first followed by the large reboot steps
+    steps = [generate_step(rng, 50, 10, 50) for _ in range(20 * scale)]
+    steps += [generate_step(rng, 100000, 5000, 50000) for _ in range(400 * scale)]
+
+    return '\n'.join(steps) + '\n'
@@ -0,0 +1,220 @@
+"""Advent of Code 2021 - Geometry
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from functools import lru_cache
+from math import cos
+from math import radians
+from math import sin
+
+from aoc.backends import np
+
+Vector = Tuple[int, int, int]
+
+# Rows of an integer rotation matrix
+Matrix = Tuple[Vector, Vector, Vector]
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+def add(v1: Vector, v2: Vector) -> Vector:
+    return v1[0] + v2[0], v1[1] + v2[1], v1[2] + v2[2]
+
+
+def subtract(v1: Vector, v2: Vector) -> Vector:
+    return v1[0] - v2[0], v1[1] - v2[1], v1[2] - v2[2]
+
+
+def manhattan_distance(v1: Vector, v2: Vector) -> int:
+    return abs(v1[0] - v2[0]) + abs(v1[1] - v2[1]) + abs(v1[2] - v2[2])
+
+
+@lru_cache(maxsize=None)
+def rotation_matrix(degrees: Vector) -> Matrix:
+    """Integer matrix of rotating by multiples of 90 degrees around x, then y, then z.
+
+    The trigonometry is done once per rotation instead of once per rotated vector.
+    """
+    x_degrees, y_degrees, z_degrees = degrees
+    columns = []
+    for x, y, z in ((1, 0, 0), (0, 1, 0), (0, 0, 1)):
+        if x_degrees:
+            theta = radians(x_degrees)
+            x, y = round(x * cos(theta) - y * sin(theta)), round(x * sin(theta) + y * cos(theta))
+        if y_degrees:
+            theta = radians(y_degrees)
+            x, z = round(x * cos(theta) + z * sin(theta)), round(-x * sin(theta) + z * cos(theta))
+        if z_degrees:
+            theta = radians(z_degrees)
+            y, z = round(y * cos(theta) - z * sin(theta)), round(y * sin(theta) + z * cos(theta))
+        columns.append((x, y, z))
+
+    return tuple(zip(*columns))
+
+
+def rotate(v: Vector, matrix: Matrix) -> Vector:
+    (a, b, c), (d, e, f), (g, h, i) = matrix
+    x, y, z = v
+    return a * x + b * y + c * z, d * x + e * y + f * z, g * x + h * y + i * z
+
+
+class Vectors:
+    """A batch of 3-D integer vectors, operations apply to all vectors at once.
+
+    Like Boxes the vectors are plain tuples in one list, see there.
+    """
+
+    __slots__ = ('vectors',)
+
+    def __init__(self, vectors: Iterable[Vector] = ()):
+        self.vectors: List[Vector] = list(vectors)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def __iter__(self) -> Iterator[Vector]:
+        return iter(self.vectors)
+
+    def translate(self, v: Vector) -> 'Vectors':
+        dx, dy, dz = v
+        return Vectors([(x + dx, y + dy, z + dz) for x, y, z in self.vectors])
+
+    def rotate(self, matrix: Matrix) -> 'Vectors':
+        (a, b, c), (d, e, f), (g, h, i) = matrix
+        return Vectors(
+            [
+                (a * x + b * y + c * z, d * x + e * y + f * z, g * x + h * y + i * z)
+                for x, y, z in self.vectors
+            ]
+        )
+
+    def differences(self, other: 'Vectors') -> List[Vector]:
+        """All differences v1 - v2 for v1 in self and v2 in other."""
+        others = other.vectors
+        return [
+            (x1 - x2, y1 - y2, z1 - z2) for x1, y1, z1 in self.vectors for x2, y2, z2 in others
+        ]
+
+
+class Box(NamedTuple):
+    """Inclusive integer coordinate ranges."""
+
+    x1: int
+    x2: int
+    y1: int
+    y2: int
+    z1: int
+    z2: int
+
+    def size(self) -> int:
+        return (self.x2 - self.x1 + 1) * (self.y2 - self.y1 + 1) * (self.z2 - self.z1 + 1)
+
+
+def intersection(b1: Box, b2: Box) -> Optional[Box]:
+    x1 = b1.x1 if b1.x1 > b2.x1 else b2.x1
+    x2 = b1.x2 if b1.x2 < b2.x2 else b2.x2
+    y1 = b1.y1 if b1.y1 > b2.y1 else b2.y1
+    y2 = b1.y2 if b1.y2 < b2.y2 else b2.y2
+    z1 = b1.z1 if b1.z1 > b2.z1 else b2.z1
+    z2 = b1.z2 if b1.z2 < b2.z2 else b2.z2
+    if x1 > x2 or y1 > y2 or z1 > z2:
+        return None  # no intersection
+
+    return Box(x1, x2, y1, y2, z1, z2)
+
+
+class Boxes:
+    """A batch of boxes, see Box.
+
+    The boxes are kept as plain tuples in one list so that the batched operations run as single comprehensions, which
+    is faster in CPython than separate arrays per coordinate or a Box object per element.
+    """
+
+    __slots__ = ('boxes',)
+
+    def __init__(self, boxes: Optional[List[Tuple[int, ...]]] = None):
+        self.boxes = [] if boxes is None else boxes
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def __iter__(self) -> Iterator[Box]:
+        return map(Box._make, self.boxes)
+
+    def append(self, box: Box):
+        self.boxes.append(tuple(box))
+
+    def extend(self, boxes: 'Boxes'):
+        self.boxes.extend(boxes.boxes)
+
+    def intersections(self, box: Box) -> 'Boxes':
+        """The non-empty intersections of box with each of the boxes."""
+        bx1, bx2, by1, by2, bz1, bz2 = box
+        return Boxes(
+            [
+                (
+                    x1 if x1 > bx1 else bx1,
+                    x2 if x2 < bx2 else bx2,
+                    y1 if y1 > by1 else by1,
+                    y2 if y2 < by2 else by2,
+                    z1 if z1 > bz1 else bz1,
+                    z2 if z2 < bz2 else bz2,
+                )
+                for x1, x2, y1, y2, z1, z2 in self.boxes
+                if not (x1 > bx2 or x2 < bx1 or y1 > by2 or y2 < by1 or z1 > bz2 or z2 < bz1)
+            ]
+        )
+
+    def total_size(self) -> int:
+        return sum(
+            [
+                (x2 - x1 + 1) * (y2 - y1 + 1) * (z2 - z1 + 1)
+                for x1, x2, y1, y2, z1, z2 in self.boxes
+            ]
+        )
+
+
+def intersections_numpy(boxes: 'np.ndarray', box: Box) -> 'np.ndarray':
+    """Like Boxes.intersections() for a 6 x N array of boxes, one row per Box field."""
+    x1, x2, y1, y2, z1, z2 = boxes
+    bx1, bx2, by1, by2, bz1, bz2 = box
+
+    lower_x = np.maximum(x1, bx1)
+    upper_x = np.minimum(x2, bx2)
+    lower_y = np.maximum(y1, by1)
+    upper_y = np.minimum(y2, by2)
+    lower_z = np.maximum(z1, bz1)
+    upper_z = np.minimum(z2, bz2)
+    overlaps = (lower_x <= upper_x) & (lower_y <= upper_y) & (lower_z <= upper_z)
+
+    return np.stack(
+        [
+            lower_x[overlaps],
+            upper_x[overlaps],
+            lower_y[overlaps],
+            upper_y[overlaps],
+            lower_z[overlaps],
+            upper_z[overlaps],
+        ]
+    )
@@ -0,0 +1,122 @@
+"""Advent of Code 2021 - Grid
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Iterator
+from typing import Tuple
+
+import os
+from array import array
+
+from aoc.backends import get_backend
+from aoc.backends import np
+from aoc.loaders import grid_rows
+from aoc.loaders import read_digit_grid
+from aoc.loaders import read_digit_grid_numpy
+
+# Digit grids of at least this many bytes are loaded through a memory map by NumPy when it is installed
+NUMPY_THRESHOLD = 10000
+
+
+class Grid:
+    """A width x height grid stored row-major in one flat array, surrounded by a border of padding cells.
+
+    Cells are addressed by their flat index, see index(). The neighbors of a cell with a padding of at least one are
+    always at index + offset for the offsets in offsets4/offsets8, without bounds checks, the border cells hold the
+    fill value.
+    """
+
+    def __init__(
+        self, width: int, height: int, fill: int = 0, padding: int = 1, typecode: str = 'B'
+    ):
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.stride = width + 2 * padding
+        self.cells = array(typecode, [fill]) * (self.stride * (height + 2 * padding))
+
+        s = self.stride
+        self.offsets4 = (-s, -1, 1, s)
+        # Row-major, i.e. top left to bottom right
+        self.offsets8 = (-s - 1, -s, -s + 1, -1, 1, s - 1, s, s + 1)
+
+    @classmethod
+    def from_digits(cls, filename: str, fill: int = 0, padding: int = 1) -> 'Grid':
+        """Read a grid of digits, see aoc.loaders.read_digit_grid() and read_digit_grid_numpy().
+
+        With NumPy the strided view of the memory mapped file is copied into the cells at once, otherwise row by row.
+        """
+        if get_backend(os.path.getsize(filename), NUMPY_THRESHOLD) == 'numpy':
+            digits = read_digit_grid_numpy(filename)
+            height, width = digits.shape
+            grid = cls(width, height, fill, padding)
+            grid.to_numpy()[:] = digits
+            return grid
+
+        digits, width, height = read_digit_grid(filename)
+        grid = cls(width, height, fill, padding)
+        cells = memoryview(grid.cells)
+        for y, row in enumerate(grid_rows(digits, width, height)):
+            start = grid.index(0, y)
+            cells[start : start + width] = row
+        return grid
+
+    def copy(self) -> 'Grid':
+        grid = Grid.__new__(Grid)
+        grid.__dict__.update(self.__dict__)
+        grid.cells = array(self.cells.typecode, self.cells)
+        return grid
+
+    def index(self, x: int, y: int) -> int:
+        return (y + self.padding) * self.stride + x + self.padding
+
+    def coordinates(self, index: int) -> Tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x - self.padding, y - self.padding
+
+    def __getitem__(self, coordinates: Tuple[int, int]) -> int:
+        return self.cells[self.index(*coordinates)]
+
+    def __setitem__(self, coordinates: Tuple[int, int], value: int):
+        self.cells[self.index(*coordinates)] = value
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def indices(self) -> Iterator[int]:
+        """Flat indices of all cells inside the grid in row-major order."""
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def values(self) -> Iterator[int]:
+        cells = self.cells
+        return (cells[i] for i in self.indices())
+
+    def rows(self) -> Iterator[array]:
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield self.cells[start : start + self.width]
+
+    def to_numpy(self, padded: bool = False) -> 'np.ndarray':
+        """Zero-copy 2-D view of the cells inside the grid, or of all cells including the border."""
+        if np is None:
+            raise ImportError('Grid.to_numpy() requires NumPy')
+
+        view = np.frombuffer(self.cells, dtype=self.cells.typecode).reshape(-1, self.stride)
+        if padded:
+            return view
+
+        p = self.padding
+        return view[p : p + self.height, p : p + self.width]
@@ -0,0 +1,320 @@
+"""Advent of Code 2021 - Performance history
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from dataclasses import field
+
+from aoc.backends import selected_backend
+from aoc.bench import Benchmark
+from aoc.bench import BenchmarkStatistics
+from aoc.cache import CACHE_DIR
+from aoc.cache import file_digest
+from aoc.days import ROOT_DIR
+from aoc.parallel import WORKERS_ENV
+from aoc.runner import DayResult
+
+HISTORY_DB = os.path.join(CACHE_DIR, 'history.sqlite')
+
+# Phases of a runner execution that are recorded, importing and looking up cached answers are not solver work
+RECORDED_PHASES = ['parse', 'part1', 'part2']
+
+# Mode of the runs recorded before modes were, the default backend with caches and without instrumentation
+DEFAULT_MODE = 'auto'
+
+# Characters of the trend column, from the fastest to the slowest run shown
+SPARKS = '▁▂▃▄▅▆▇█'
+
+
+def git_commit() -> Tuple[Optional[str], bool]:
+    """The commit that is checked out and whether the tree has changes, (None, False) outside of a git checkout."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+    return commit, bool(status.strip())
+
+
+def run_mode(
+    use_cache: bool = True, memory: bool = False, profile: bool = False, counters: bool = False
+) -> str:
+    """How the solvers ran, e.g. 'numpy+no-cache+memory', only runs in the same mode are compared.
+
+    The mode is the selected backend, the number of workers when it is set and the flags that change the timings.
+    """
+    flags = [selected_backend()]
+    if os.environ.get(WORKERS_ENV):
+        flags.append(f'workers={os.environ[WORKERS_ENV]}')
+    if not use_cache:
+        flags.append('no-cache')
+    if memory:
+        flags.append('memory')
+    if profile:
+        flags.append('profile')
+    if counters:
+        flags.append('counters')
+    return '+'.join(flags)
+
+
+@dataclass
+class Measurement:
+    day: int
+    phase: str
+    input: str
+    input_digest: str
+    wall: float
+    cpu: Optional[float] = None
+    peak_memory: Optional[int] = None
+    counters: Optional[Dict[str, Any]] = None
+    status: str = 'ok'
+
+
+@dataclass
+class Series:
+    """The measurements of one phase of a day on one input in one mode, oldest first."""
+
+    kind: str
+    day: int
+    phase: str
+    input: str
+    mode: str = DEFAULT_MODE
+    walls: List[float] = field(default_factory=list)
+    commits: List[Optional[str]] = field(default_factory=list)
+
+    def baseline(self, last: int) -> Optional[float]:
+        """Median of the last runs before the latest one."""
+        previous = self.walls[-last - 1 : -1]
+        return statistics.median(previous) if previous else None
+
+    def change(self, last: int) -> Optional[float]:
+        baseline = self.baseline(last)
+        return self.walls[-1] / baseline - 1 if baseline else None
+
+    def trend(self, last: int) -> str:
+        walls = self.walls[-last - 1 :]
+        low, high = min(walls), max(walls)
+        if high == low:
+            return SPARKS[0] * len(walls)
+        return ''.join([SPARKS[round((w - low) / (high - low) * (len(SPARKS) - 1))] for w in walls])
+
+
+class HistoryStore:
+    """Every runner and benchmark execution with the measurements of its phases, keyed by the git commit."""
+
+    def __init__(self, filename: str = HISTORY_DB):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        self.connection = sqlite3.connect(filename, timeout=30)
+        with self.connection:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS runs ('
+                ' id INTEGER PRIMARY KEY, kind TEXT, started REAL, git_commit TEXT, git_dirty INTEGER,'
+                ' python TEXT, platform TEXT, command TEXT, mode TEXT)'
+            )
+            columns = [row[1] for row in self.connection.execute('PRAGMA table_info(runs)')]
+            if 'mode' not in columns:
+                self.connection.execute('ALTER TABLE runs ADD COLUMN mode TEXT')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS measurements ('
+                ' run_id INTEGER REFERENCES runs (id), day INTEGER, phase TEXT, part INTEGER,'
+                ' input TEXT, input_digest TEXT, wall REAL, cpu REAL, peak_memory INTEGER, counters TEXT,'
+                ' status TEXT)'
+            )
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS measurements_series'
+                ' ON measurements (day, phase, input_digest)'
+            )
+
+    def add_run(
+        self, kind: str, command: str, measurements: List[Measurement], mode: str = DEFAULT_MODE
+    ) -> int:
+        commit, dirty = git_commit()
+        with self.connection:
+            run_id = self.connection.execute(
+                'INSERT INTO runs (kind, started, git_commit, git_dirty, python, platform, command, mode)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    kind,
+                    time.time(),
+                    commit,
+                    dirty,
+                    platform.python_version(),
+                    platform.platform(),
+                    command,
+                    mode,
+                ),
+            ).lastrowid
+            self.connection.executemany(
+                'INSERT INTO measurements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (
+                        run_id,
+                        m.day,
+                        m.phase,
+                        int(m.phase[-1]) if m.phase in ('part1', 'part2') else None,
+                        m.input,
+                        m.input_digest,
+                        m.wall,
+                        m.cpu,
+                        m.peak_memory,
+                        json.dumps(m.counters) if m.counters is not None else None,
+                        m.status,
+                    )
+                    for m in measurements
+                ],
+            )
+        return run_id
+
+    def series(self, kind: str, days: Optional[List[int]] = None) -> List[Series]:
+        """The successful measurements of every day, phase, input and mode, ordered by day and phase."""
+        rows = self.connection.execute(
+            'SELECT m.day, m.phase, m.input, m.input_digest, COALESCE(r.mode, ?), m.wall, r.git_commit'
+            ' FROM measurements m JOIN runs r ON r.id = m.run_id'
+            " WHERE r.kind = ? AND m.status = 'ok'"
+            ' ORDER BY m.day, m.phase, m.input_digest, r.started',
+            (DEFAULT_MODE, kind),
+        ).fetchall()
+
+        result: Dict[Tuple[int, str, str, str], Series] = {}
+        for day, phase, input_name, input_digest, mode, wall, commit in rows:
+            if days is not None and day not in days:
+                continue
+
+            key = (day, phase, input_digest, mode)
+            if key not in result:
+                result[key] = Series(kind, day, phase, input_name, mode)
+            result[key].walls.append(wall)
+            result[key].commits.append(commit)
+
+        return list(result.values())
+
+    def close(self):
+        self.connection.close()
+
+
+def _input_name(filename: str) -> str:
+    return os.path.relpath(os.path.abspath(filename), ROOT_DIR)
+
+
+def run_measurements(results: List[DayResult]) -> List[Measurement]:
+    measurements = []
+    for result in results:
+        if not os.path.exists(result.filename):
+            continue
+
+        digest = file_digest(result.filename)
+        for timing in result.timings:
+            if timing.phase not in RECORDED_PHASES:
+                continue
+            if timing.phase == 'parse' and result.parse_cache_hit:
+                continue
+
+            measurements.append(
+                Measurement(
+                    result.day,
+                    timing.phase,
+                    _input_name(result.filename),
+                    digest,
+                    timing.wall,
+                    timing.cpu,
+                    timing.memory.peak if timing.memory is not None else None,
+                    timing.counters,
+                    result.status(),
+                )
+            )
+
+    return measurements
+
+
+def bench_measurements(
+    benchmarks: List[Benchmark], results: List[BenchmarkStatistics]
+) -> List[Measurement]:
+    """The median of every benchmark, as the phase named by the benchmark."""
+    measurements = []
+    for benchmark, result in zip(benchmarks, results):
+        if result.error is not None or not os.path.exists(result.filename):
+            continue
+
+        measurements.append(
+            Measurement(
+                benchmark.day,
+                benchmark.name,
+                _input_name(result.filename),
+                file_digest(result.filename),
+                result.median,
+            )
+        )
+
+    return measurements
+
+
+def record(kind: str, command: str, measurements: List[Measurement], mode: str = DEFAULT_MODE):
+    if not measurements:
+        return
+
+    store = HistoryStore()
+    try:
+        store.add_run(kind, command, measurements, mode)
+    finally:
+        store.close()
+
+
+def find_regressions(series: List[Series], last: int, threshold: float) -> List[Series]:
+    """Return the series whose latest run is more than threshold (e.g. 0.1 = 10%) slower than the median of the last
+    runs before it in the same mode."""
+    return [s for s in series if s.change(last) is not None and s.change(last) > threshold]
+
+
+def format_report(series: List[Series], last: int, threshold: float) -> str:
+    lines = [
+        f'{"Day":>3}  {"Phase":<40} {"Input":<24} {"Mode":<16} {"Runs":>5} {"Latest (ms)":>12} {"Median (ms)":>12} '
+        f'{"Change":>8}  {"Trend":<{last + 1}}  Commit'
+    ]
+    regressions = find_regressions(series, last, threshold)
+    for s in series:
+        baseline = s.baseline(last)
+        change = s.change(last)
+        line = (
+            f'{s.day:>3}  {s.phase:<40} {s.input:<24} {s.mode:<16} {len(s.walls):>5} {s.walls[-1] * 1000:>12.2f} '
+            + (f'{baseline * 1000:>12.2f} {change:>+8.1%}' if baseline else f'{"-":>12} {"-":>8}')
+            + f'  {s.trend(last):<{last + 1}}  {(s.commits[-1] or "-")[:10]}'
+        )
+        if s in regressions:
+            line += '  REGRESSION'
+        lines.append(line)
+
+    return '\n'.join(lines)
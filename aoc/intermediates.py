@@ -0,0 +1,209 @@
+"""Advent of Code 2021 - Intermediate cache
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+
+from aoc.cache import CACHE_DIR
+from aoc.cache import DEFAULT_MAX_BYTES
+from aoc.cache import PickleStore
+
+# Solvers save and load their expensive intermediate structures here while it is set, e.g. by the runner unless
+# caching is disabled. Every entry is keyed by a name, the version the solver passes and a digest of what it was
+# computed from, so the version has to be bumped whenever the structure or the way it is computed changes.
+store: Optional[PickleStore] = None
+
+# Entries kept in a table, the least recently used ones are dropped above it
+MAX_TABLE_ENTRIES = 100000
+
+TABLES_DB = os.path.join(CACHE_DIR, 'tables.sqlite')
+
+
+def intermediate_store(max_bytes: int = DEFAULT_MAX_BYTES) -> PickleStore:
+    return PickleStore(os.path.join(CACHE_DIR, 'intermediates'), max_bytes)
+
+
+def enable(max_bytes: int = DEFAULT_MAX_BYTES):
+    global store
+    store = intermediate_store(max_bytes)
+
+
+def disable():
+    global store
+    store = None
+
+
+def digest(value: Any) -> str:
+    """Digest of a value built from tuples, lists, strings and numbers, by its repr."""
+    return hashlib.sha256(repr(value).encode()).hexdigest()
+
+
+def prefix_digests(items: Sequence[Any]) -> List[str]:
+    """The digest of every prefix, i.e. the i-th one is the digest of items[:i + 1]."""
+    h = hashlib.sha256()
+    digests = []
+    for item in items:
+        h.update(repr(item).encode())
+        h.update(b'\n')
+        digests.append(h.copy().hexdigest())
+    return digests
+
+
+def _key(name: str, version: int, value_digest: str) -> str:
+    return f'{name}-v{version}-{value_digest}'
+
+
+def load(name: str, version: int, value_digest: str) -> Tuple[bool, Any]:
+    """Return (True, value) on a hit and (False, None) on a miss or when the cache is disabled."""
+    if store is None:
+        return False, None
+    return store.get(_key(name, version, value_digest))
+
+
+def save(name: str, version: int, value_digest: str, value: Any):
+    if store is not None:
+        store.put(_key(name, version, value_digest), value)
+
+
+def resume(name: str, version: int, items: Sequence[Any]) -> Tuple[int, Any, List[str]]:
+    """Find the state saved for the longest prefix of items, e.g. of an input that extends an earlier one.
+
+    Returns (n, state, digests) where state was saved for items[:n], (0, None, digests) when none was. Save the state
+    after all items with checkpoint(name, version, digests, state).
+    """
+    digests = prefix_digests(items)
+    if store is None:
+        return 0, None, digests
+
+    # The checkpoints are keyed by the length of their prefix too, so only those of a matching prefix are loaded
+    prefix = _key(name, version, '')
+    lengths = []
+    for key in store.keys(prefix):
+        length, _, value_digest = key[len(prefix) :].partition('-')
+        if length.isdigit() and 0 < int(length) <= len(items) and digests[int(length) - 1] == value_digest:
+            lengths.append(int(length))
+
+    for n in sorted(lengths, reverse=True):
+        hit, state = store.get(_key(name, version, f'{n}-{digests[n - 1]}'))
+        if hit:
+            return n, state, digests
+
+    return 0, None, digests
+
+
+def checkpoint(name: str, version: int, digests: List[str], state: Any):
+    if digests:
+        save(name, version, f'{len(digests)}-{digests[-1]}', state)
+
+
+def _connect_tables() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(TABLES_DB), exist_ok=True)
+    connection = sqlite3.connect(TABLES_DB, timeout=30)
+    with connection:
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' name TEXT, version INTEGER, key BLOB, value BLOB, last_used REAL,'
+            ' PRIMARY KEY (name, version, key))'
+        )
+    return connection
+
+
+def _dumps(value: Any) -> bytes:
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class Table:
+    """Values of independent keys, e.g. of pairs, shared by every input and saved as one SQLite row per key.
+
+    The table is loaded when created and save() writes the added rows and the use of the others, so processes that
+    share the table concurrently keep each other's rows. Without a store it only lives in memory.
+    """
+
+    def __init__(self, name: str, version: int):
+        self.name = name
+        self.version = version
+        self.values: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.added: Dict[Hashable, Any] = {}
+        self.used: Set[Hashable] = set()
+
+        if store is not None:
+            connection = _connect_tables()
+            try:
+                rows = connection.execute(
+                    'SELECT key, value FROM entries WHERE name = ? AND version = ? ORDER BY last_used',
+                    (name, version),
+                )
+                for key, value in rows:
+                    self.values[pickle.loads(key)] = pickle.loads(value)
+            finally:
+                connection.close()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        if key not in self.values:
+            return False, None
+
+        self.values.move_to_end(key)
+        self.used.add(key)
+        return True, self.values[key]
+
+    def put(self, key: Hashable, value: Any):
+        self.values[key] = value
+        self.added[key] = value
+        while len(self.values) > MAX_TABLE_ENTRIES:
+            self.values.popitem(last=False)
+
+    def save(self):
+        if store is None or not (self.added or self.used):
+            return
+
+        now = time.time()
+        connection = _connect_tables()
+        try:
+            with connection:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                    [
+                        (self.name, self.version, _dumps(key), _dumps(value), now)
+                        for key, value in self.added.items()
+                    ],
+                )
+                connection.executemany(
+                    'UPDATE entries SET last_used = ? WHERE name = ? AND version = ? AND key = ?',
+                    [(now, self.name, self.version, _dumps(key)) for key in self.used],
+                )
+                connection.execute(
+                    'DELETE FROM entries WHERE rowid IN (SELECT rowid FROM entries WHERE name = ? AND version = ?'
+                    ' ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                    (self.name, self.version, MAX_TABLE_ENTRIES),
+                )
+        finally:
+            connection.close()
+
+        self.added.clear()
+        self.used.clear()
@@ -0,0 +1,130 @@
+"""Advent of Code 2021 - Input loaders
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import List
+from typing import Tuple
+
+import mmap
+import os
+from array import array
+
+from aoc.backends import get_backend
+from aoc.backends import np
+
+# Inputs of at least this many bytes are parsed by NumPy when it is installed, see aoc.backends
+NUMPY_THRESHOLD = 1 << 16
+
+
+def read_bytes(filename: str) -> bytes:
+    """Read the whole file in one call."""
+    with open(filename, 'rb') as f:
+        return f.read()
+
+
+def read_tokens(filename: str) -> List[bytes]:
+    """Read all whitespace separated tokens of a file."""
+    return read_bytes(filename).split()
+
+
+def read_ints(filename: str) -> array:
+    """Read newline or comma separated integers into a compact array of 64 bit integers.
+
+    No intermediate str per line or list of ints is created, which matters for inputs with millions of values. Large
+    inputs are parsed in C by NumPy, see read_ints_numpy().
+    """
+    data = read_bytes(filename)
+    if b',' in data:
+        data = data.replace(b',', b' ')
+
+    if get_backend(len(data), NUMPY_THRESHOLD) == 'numpy':
+        return array('q', _parse_ints_numpy(data).tobytes())
+    return array('q', map(int, data.split()))
+
+
+def _parse_ints_numpy(data: bytes) -> 'np.ndarray':
+    return np.fromstring(data, dtype=np.int64, sep=' ')
+
+
+def read_ints_numpy(filename: str) -> 'np.ndarray':
+    """Read newline or comma separated integers into an int64 array."""
+    if np is None:
+        raise ImportError('read_ints_numpy() requires NumPy')
+
+    return _parse_ints_numpy(read_bytes(filename).replace(b',', b' '))
+
+
+# Translation table from the ASCII digits to their values
+DIGIT_VALUES = bytes.maketrans(b'0123456789', bytes(range(10)))
+
+
+def get_grid_shape(data: bytes) -> Tuple[int, int, int]:
+    """Return the width, height and stride (row length including the line ending) of a text grid.
+
+    Works on anything bytes-like that supports find(), e.g. an mmap, without copying it.
+    """
+    size = len(data)
+    while size and data[size - 1] in b'\r\n':
+        size -= 1
+
+    line_end = data.find(b'\n')
+    if line_end == -1 or line_end >= size:
+        return size, 1, size
+
+    width = line_end - 1 if line_end > 0 and data[line_end - 1] == ord('\r') else line_end
+    stride = line_end + 1
+    height = (size - width) // stride + 1
+    return width, height, stride
+
+
+def read_digit_grid(filename: str) -> Tuple[bytearray, int, int]:
+    """Read a grid of digits into a flat row-major bytearray of the digit values, returns (cells, width, height).
+
+    One byte per cell, the value of the cell (x, y) is cells[y * width + x].
+    """
+    with open(filename, 'rb') as f:
+        data = bytearray(os.fstat(f.fileno()).st_size)
+        f.readinto(data)
+
+    width, height, _ = get_grid_shape(data)
+    cells = data.translate(DIGIT_VALUES, b'\r\n')
+    assert len(cells) == width * height
+
+    return cells, width, height
+
+
+def grid_rows(cells: bytearray, width: int, height: int) -> List[memoryview]:
+    """Zero-copy (and writable) row views of a flat grid, i.e. rows[y][x]."""
+    view = memoryview(cells)
+    return [view[y * width : (y + 1) * width] for y in range(height)]
+
+
+def read_digit_grid_numpy(filename: str) -> 'np.ndarray':
+    """Memory map a grid of digits as a 2-D uint8 array of the digit values.
+
+    The array is a strided view of the file that skips the line endings. The map is copy-on-write, the digits are
+    converted to values in place without modifying the file.
+    """
+    if np is None:
+        raise ImportError('read_digit_grid_numpy() requires NumPy')
+
+    with open(filename, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    width, height, stride = get_grid_shape(buffer)
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    grid = np.lib.stride_tricks.as_strided(data, shape=(height, width), strides=(stride, 1))
+    grid -= ord('0')
+
+    return grid
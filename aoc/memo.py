@@ -0,0 +1,168 @@
+"""Advent of Code 2021 - Bounded memoization
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Optional
+
+import functools
+from collections import OrderedDict
+
+from aoc import counters
+
+# Default number of memoized values, the least recently used ones are evicted above it
+DEFAULT_MAXSIZE = 1 << 16
+
+_MISSING = object()
+
+
+class Memo:
+    """A function whose values are kept in a bounded LRU cache, see memoize().
+
+    The hits, misses and evictions are counted on the object and, while the counters are enabled, as the
+    <name>_hits, <name>_misses and <name>_evictions counters of the phase, see aoc.counters.
+    """
+
+    def __init__(
+        self,
+        function: Callable[..., Any],
+        name: str,
+        maxsize: int = DEFAULT_MAXSIZE,
+        key: Optional[Callable[..., Hashable]] = None,
+    ):
+        functools.update_wrapper(self, function)
+        self.function = function
+        self.name = name
+        self.maxsize = maxsize
+        self.key = key
+        self.values: 'OrderedDict[Hashable, Any]' = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._hits_counter = f'{name}_hits'
+        self._misses_counter = f'{name}_misses'
+        self._evictions_counter = f'{name}_evictions'
+
+    def __call__(self, *args) -> Any:
+        key = args if self.key is None else self.key(*args)
+        value = self.values.get(key, _MISSING)
+        if value is not _MISSING:
+            self.values.move_to_end(key)
+            self.hits += 1
+            if counters.enabled:
+                counters.add(self._hits_counter)
+            return value
+
+        self.misses += 1
+        if counters.enabled:
+            counters.add(self._misses_counter)
+
+        value = self.function(*args)
+        self.values[key] = value
+        if len(self.values) > self.maxsize:
+            self.values.popitem(last=False)
+            self.evictions += 1
+            if counters.enabled:
+                counters.add(self._evictions_counter)
+
+        return value
+
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def clear(self):
+        self.values.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class LastMemo:
+    """A function of one argument that keeps its value for the last argument only, compared by identity.
+
+    For what both parts derive from the parsed input, which the runner and the daemon pass to each part as the same
+    object. The argument is neither hashed nor compared, so it must not be mutated. Hits and misses are counted like
+    those of a Memo.
+    """
+
+    def __init__(self, function: Callable[[Any], Any], name: str):
+        functools.update_wrapper(self, function)
+        self.function = function
+        self.name = name
+        self.argument: Any = _MISSING
+        self.value: Any = None
+
+        self.hits = 0
+        self.misses = 0
+        self._hits_counter = f'{name}_hits'
+        self._misses_counter = f'{name}_misses'
+
+    def __call__(self, argument: Any) -> Any:
+        if argument is self.argument:
+            self.hits += 1
+            if counters.enabled:
+                counters.add(self._hits_counter)
+            return self.value
+
+        self.misses += 1
+        if counters.enabled:
+            counters.add(self._misses_counter)
+
+        value = self.function(argument)
+        self.argument, self.value = argument, value
+        return value
+
+    def clear(self):
+        self.argument = _MISSING
+        self.value = None
+        self.hits = 0
+        self.misses = 0
+
+
+def memoize_last(name: str) -> Callable[[Callable[[Any], Any]], LastMemo]:
+    """Decorate a function of the parsed input so that the parts share its value, see LastMemo, e.g.
+
+        @memoize_last('sensors')
+        def get_aligned_sensors(data: Dict[int, List[Vector]]) -> Dict[int, Sensor]:
+            ...
+    """
+
+    def decorator(function: Callable[[Any], Any]) -> LastMemo:
+        return LastMemo(function, name)
+
+    return decorator
+
+
+def memoize(
+    name: str, maxsize: int = DEFAULT_MAXSIZE, key: Optional[Callable[..., Hashable]] = None
+) -> Callable[[Callable[..., Any]], Memo]:
+    """Decorate a function to memoize its values by its arguments, or by key(*args) when given.
+
+    The key can canonicalize arguments that are equivalent or pack them into a single int, which takes less memory
+    than a tuple of them. Decorate a function defined inside the solver when its values depend on the input, so that
+    every solve starts with an empty cache, e.g.
+
+        @memoize('paths', key=lambda cave, visited: visited << 6 | cave)
+        def count_paths(cave: int, visited: int) -> int:
+            ...
+    """
+
+    def decorator(function: Callable[..., Any]) -> Memo:
+        return Memo(function, name, maxsize, key)
+
+    return decorator
@@ -0,0 +1,125 @@
+"""Advent of Code 2021 - Memory tracing
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import os
+import threading
+import tracemalloc
+from dataclasses import dataclass
+from dataclasses import field
+
+from aoc.days import ROOT_DIR
+
+# Number of allocation sites reported per phase
+TOP_SITES = 5
+
+# How often the traced memory is sampled, in seconds
+SAMPLE_INTERVAL = 0.01
+
+# A new snapshot is only taken once the traced memory grew by this factor since the last one
+SNAPSHOT_GROWTH = 1.1
+
+
+@dataclass
+class AllocationSite:
+    filename: str
+    line: int
+    size: int
+    count: int
+
+    def __str__(self) -> str:
+        return f'{self.filename}:{self.line}  {self.size / 2**20:.2f} MB in {self.count} blocks'
+
+
+@dataclass
+class MemoryUsage:
+    peak: int
+    sites: List[AllocationSite] = field(default_factory=list)
+
+
+class PeakSampler(threading.Thread):
+    """Keep the snapshot taken closest to the peak of the traced memory.
+
+    tracemalloc only reports the size of the peak, intermediates that are freed before the phase ends would not show up
+    in a snapshot taken at the end.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.stopped = threading.Event()
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.snapshot_size = 0
+
+    def sample(self):
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.snapshot_size * SNAPSHOT_GROWTH:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    def run(self):
+        while not self.stopped.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        self.sample()
+
+
+def top_sites(snapshot: tracemalloc.Snapshot, count: int = TOP_SITES) -> List[AllocationSite]:
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+
+    sites = []
+    for statistic in snapshot.statistics('lineno')[:count]:
+        frame = statistic.traceback[0]
+        filename = frame.filename
+        if filename.startswith(ROOT_DIR):
+            filename = os.path.relpath(filename, ROOT_DIR)
+        sites.append(AllocationSite(filename, frame.lineno, statistic.size, statistic.count))
+    return sites
+
+
+def trace_call(f: Callable[..., Any], *args) -> Tuple[Any, MemoryUsage]:
+    """Call f with tracemalloc running, returning its result and the peak traced memory and top allocation sites."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    # Also resets the peak
+    tracemalloc.clear_traces()
+
+    sampler = PeakSampler()
+    sampler.start()
+    try:
+        value = f(*args)
+    finally:
+        sampler.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        if not was_tracing:
+            tracemalloc.stop()
+
+    if sampler.snapshot is None:
+        return value, MemoryUsage(peak)
+    return value, MemoryUsage(peak, top_sites(sampler.snapshot))
@@ -0,0 +1,168 @@
+"""Advent of Code 2021 - Parallel map
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+
+import functools
+import multiprocessing
+import os
+import pickle
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from aoc import counters
+from aoc import profiling
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python 3.7, everything is mapped in the calling process
+    shared_memory = None
+
+# Number of worker processes, the CPU count by default
+WORKERS_ENV = 'AOC_WORKERS'
+
+# Every worker gets about this many chunks so that uneven items still balance out
+CHUNKS_PER_WORKER = 4
+
+T = TypeVar('T')
+
+# The shared data in a worker process, see _attach()
+_data: Any = None
+_shared_memory: Any = None
+
+
+def get_workers() -> int:
+    workers = os.environ.get(WORKERS_ENV)
+    return max(1, int(workers)) if workers else os.cpu_count() or 1
+
+
+def is_instrumented() -> bool:
+    """Whether the counters, tracemalloc or cProfile are recording, none of them sees the work of other processes."""
+    return counters.enabled or tracemalloc.is_tracing() or profiling.active
+
+
+def share_workers(processes: int):
+    """Divide the workers among this many processes, to be called in each of them, e.g. as the initializer of a pool.
+
+    Without it every worker of a pool that runs solvers would start a SharedPool of its own, i.e. about cpu_count²
+    processes.
+    """
+    os.environ[WORKERS_ENV] = str(max(1, get_workers() // processes))
+
+
+def _attach(name: str, size: int, typecode: Optional[str]):
+    """Initialize a worker with the shared data, a view of the array itself or the unpickled object."""
+    global _data, _shared_memory
+    _shared_memory = shared_memory.SharedMemory(name=name)
+
+    if typecode is None:
+        _data = pickle.loads(_shared_memory.buf[:size])
+    else:
+        _data = _shared_memory.buf[:size].cast(typecode)
+
+
+def _map_chunk(function: Callable[[Any, Any], T], combine: Callable[[T, T], T], chunk: List[Any]) -> T:
+    return functools.reduce(combine, [function(item, _data) for item in chunk])
+
+
+class SharedPool:
+    """Worker processes that map functions over items with read-only data in shared memory, see parallel_map().
+
+    An array.array is shared as is and the workers get a memoryview of it, anything else is pickled into the shared
+    memory once and unpickled once per worker. The workers are started by the first map() with more than one item, with
+    a single worker or where it is not possible, e.g. inside a daemonic process, the items are mapped in this process.
+    So are they while any instrumentation is recording, see is_instrumented(), so that it covers all of the work.
+    """
+
+    def __init__(self, data: Any = None, workers: Optional[int] = None):
+        self.data = data
+        self.workers = get_workers() if workers is None else workers
+        if shared_memory is None or multiprocessing.current_process().daemon:
+            self.workers = 1
+
+        self.shared_memory = None
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def _start(self):
+        if isinstance(self.data, array):
+            buffer, typecode = self.data.tobytes(), self.data.typecode
+        else:
+            buffer, typecode = pickle.dumps(self.data, protocol=pickle.HIGHEST_PROTOCOL), None
+
+        self.shared_memory = shared_memory.SharedMemory(create=True, size=max(1, len(buffer)))
+        self.shared_memory.buf[: len(buffer)] = buffer
+        self.executor = ProcessPoolExecutor(
+            self.workers,
+            initializer=_attach,
+            initargs=(self.shared_memory.name, len(buffer), typecode),
+        )
+
+    def map(self, function: Callable[[Any, Any], T], items: Sequence[Any], combine: Callable[[T, T], T]) -> T:
+        """Reduce function(item, data) of every item with combine, function has to be defined at module level.
+
+        combine has to be associative, the results are combined per chunk in the workers and then across the chunks.
+        """
+        items = list(items)
+        if not items:
+            raise ValueError('Nothing to map')
+
+        if self.workers == 1 or len(items) == 1 or is_instrumented():
+            return functools.reduce(combine, [function(item, self.data) for item in items])
+
+        if self.executor is None:
+            self._start()
+
+        chunk_size = -(-len(items) // (self.workers * CHUNKS_PER_WORKER))
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+        futures = [self.executor.submit(_map_chunk, function, combine, chunk) for chunk in chunks]
+        return functools.reduce(combine, [f.result() for f in futures])
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.shared_memory is not None:
+            self.shared_memory.close()
+            self.shared_memory.unlink()
+            self.shared_memory = None
+
+    def __enter__(self) -> 'SharedPool':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def parallel_map(
+    function: Callable[[Any, Any], T],
+    items: Sequence[Any],
+    combine: Callable[[T, T], T],
+    data: Any = None,
+    workers: Optional[int] = None,
+) -> T:
+    """Reduce function(item, data) of every item with combine across worker processes, e.g.
+
+        parallel_map(fuel_for_alignment, range(lowest, highest + 1), min, data=positions)
+
+    The number of workers is taken from $AOC_WORKERS or the CPU count by default, see SharedPool.
+    """
+    with SharedPool(data, workers) as pool:
+        return pool.map(function, items, combine)
@@ -0,0 +1,103 @@
+"""Advent of Code 2021 - Profiling
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+import cProfile
+import os
+import pstats
+from collections import defaultdict
+
+from aoc.days import ROOT_DIR
+
+# Directory to write profiles to when the --profile flag is not given
+PROFILE_ENV = 'AOC_PROFILE'
+
+# Stacks with less time than this, in seconds, are left out of the collapsed stacks
+MINIMUM_TIME = 1e-6
+
+# Set while profile_call() runs
+active = False
+
+Function = Tuple[str, int, str]
+
+
+def label(function: Function) -> str:
+    filename, line, name = function
+    if filename == '~':
+        return name
+
+    if filename.startswith(ROOT_DIR):
+        filename = os.path.relpath(filename, ROOT_DIR)
+    return f'{name} ({filename}:{line})'.replace(';', ',')
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, float]:
+    """Rebuild approximate call stacks from the caller graph of the profile.
+
+    cProfile only records caller/callee pairs, so the time of a function called from several places is split across its
+    callers in proportion to the cumulative time spent on each call edge.
+    """
+    callees: Dict[Function, List[Tuple[Function, float]]] = defaultdict(list)
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees[caller].append((function, cumulative))
+
+    stacks: Dict[str, float] = defaultdict(float)
+
+    def walk(function: Function, path: List[Function], fraction: float):
+        _, _, inline, cumulative, _ = stats.stats[function]
+        path = path + [function]
+        if inline * fraction >= MINIMUM_TIME:
+            stacks[';'.join([label(f) for f in path])] += inline * fraction
+
+        for callee, edge in callees[function]:
+            total = stats.stats[callee][3]
+            if callee in path or total == 0 or edge * fraction < MINIMUM_TIME:
+                continue
+            walk(callee, path, fraction * edge / total)
+
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            walk(function, [], 1.0)
+
+    return stacks
+
+
+def write_collapsed(stats: pstats.Stats, filename: str):
+    """Write the stacks in the collapsed format of flamegraph.pl, speedscope and similar tools, in microseconds."""
+    with open(filename, 'w') as f:
+        for stack, seconds in sorted(collapsed_stacks(stats).items()):
+            microseconds = round(seconds * 1e6)
+            if microseconds > 0:
+                f.write(f'{stack} {microseconds}\n')
+
+
+def profile_call(prefix: str, f: Callable[..., Any], *args) -> Any:
+    """Call f under cProfile, writing the profile to prefix.prof and its collapsed stacks to prefix.folded."""
+    global active
+    profiler = cProfile.Profile()
+    active = True
+    try:
+        return profiler.runcall(f, *args)
+    finally:
+        active = False
+        os.makedirs(os.path.dirname(prefix) or '.', exist_ok=True)
+        profiler.dump_stats(prefix + '.prof')
+        write_collapsed(pstats.Stats(profiler), prefix + '.folded')
@@ -0,0 +1,119 @@
+"""Advent of Code 2021 - Record memory benchmark
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+
+import gc
+import importlib
+import tracemalloc
+from dataclasses import dataclass
+from dataclasses import make_dataclass
+
+from aoc.geometry import Box
+from aoc.geometry import Point
+
+DEFAULT_COUNT = 1_000_000
+
+
+@dataclass
+class Record:
+    name: str
+    cls: Callable[..., Any]
+    fields: List[str]
+    arguments: List[Any]
+
+
+@dataclass
+class RecordMemory:
+    name: str
+    count: int
+    before: float
+    after: float
+    error: Optional[str] = None
+
+
+def _day_record(module: str, name: str) -> Callable[..., Any]:
+    return getattr(importlib.import_module(module), name)
+
+
+def records() -> List[Record]:
+    """The records the solvers create in bulk, with the arguments every instance is built from.
+
+    The arguments are shared between the instances, so only the records themselves are measured.
+    """
+    region = Box(-10, 10, -10, 10, -10, 10)
+    return [
+        Record(
+            'day_05.VentPositionData',
+            lambda: _day_record('day_05.main', 'VentPositionData'),
+            ['start_coord', 'end_coord'],
+            [(0, 9), (5, 9)],
+        ),
+        Record('day_17.Point', lambda: Point, ['x', 'y'], [20, -10]),
+        Record(
+            'day_18._SnailfishValue',
+            lambda: _day_record('day_18.main', '_SnailfishValue'),
+            ['value', 'nest_level'],
+            [7, 3],
+        ),
+        Record('day_22.Region', lambda: Box, list(Box._fields), list(region)),
+        Record('day_22.Step', lambda: _day_record('day_22.main', 'Step'), ['turn_on', 'region'], [True, region]),
+    ]
+
+
+def dict_record(cls: Any, fields: List[str]) -> Any:
+    """A plain dataclass with the same fields, i.e. the record without slots or tuple storage."""
+    return make_dataclass(cls.__name__, fields)
+
+
+def bytes_per_element(cls: Any, arguments: List[Any], count: int) -> float:
+    """Memory traced while building count instances, the list holding them is preallocated."""
+    instances = [None] * count
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        for i in range(count):
+            instances[i] = cls(*arguments)
+        end = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del instances
+    return (end - start) / count
+
+
+def measure(record: Record, count: int = DEFAULT_COUNT) -> RecordMemory:
+    try:
+        cls = record.cls()
+    except ImportError as e:
+        return RecordMemory(record.name, count, 0.0, 0.0, str(e))
+
+    before = bytes_per_element(dict_record(cls, record.fields), record.arguments, count)
+    after = bytes_per_element(cls, record.arguments, count)
+    return RecordMemory(record.name, count, before, after)
+
+
+def format_results(results: List[RecordMemory]) -> str:
+    lines = [f'{"Record":<26}{"Before (B/elem)":>17}{"After (B/elem)":>16}{"Saved":>8}']
+    for r in results:
+        if r.error is not None:
+            lines.append(f'{r.name:<26}  {r.error}')
+            continue
+        saved = 1 - r.after / r.before if r.before else 0.0
+        lines.append(f'{r.name:<26}{r.before:>17.1f}{r.after:>16.1f}{saved:>8.0%}')
+    return '\n'.join(lines)
@@ -0,0 +1,161 @@
+"""Advent of Code 2021 - Answer store
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Optional
+from typing import Set
+
+import ast
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from types import ModuleType
+
+from aoc.backends import selected_backend
+from aoc.cache import CACHE_DIR
+
+RESULTS_DB = os.path.join(CACHE_DIR, 'results.sqlite')
+
+# Default number of stored answers, the least recently used ones are evicted above it
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def _aoc_imports(filename: str) -> Set[str]:
+    """The loaded aoc modules a source file imports, e.g. 'aoc.grid' for both `import aoc.grid` and
+    `from aoc.grid import Grid`."""
+    with open(filename, 'rb') as f:
+        tree = ast.parse(f.read(), filename)
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update([alias.name for alias in node.names])
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            names.update([f'{node.module}.{alias.name}' for alias in node.names])
+
+    return {name for name in names if name.split('.')[0] == 'aoc' and name in sys.modules}
+
+
+def code_digest(module: ModuleType) -> str:
+    """Hash the source of a day's main.py and of every aoc module it uses, directly or through other aoc modules."""
+    filenames = {module.__file__}
+    pending = [module.__file__]
+    while pending:
+        for name in _aoc_imports(pending.pop()):
+            filename = sys.modules[name].__file__
+            if filename not in filenames:
+                filenames.add(filename)
+                pending.append(filename)
+
+    h = hashlib.sha256()
+    for filename in sorted(filenames):
+        with open(filename, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+@dataclass
+class StoredAnswer:
+    answer: Any
+    wall: float
+    cpu: float
+
+
+class ResultStore:
+    """Answers and timings of each part, keyed by day, part, input digest, code digest and backend.
+
+    The backend is the one selected with --backend or $AOC_BACKEND, see aoc.backends.selected_backend(), so that
+    forcing an engine runs it instead of returning the answer another engine stored.
+    """
+
+    def __init__(self, filename: str = RESULTS_DB, max_entries: int = DEFAULT_MAX_ENTRIES):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(filename, timeout=30)
+        with self.connection:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            columns = [row[1] for row in self.connection.execute('PRAGMA table_info(answers)')]
+            if columns and 'backend' not in columns:
+                # Stored before the backend was part of the key
+                self.connection.execute('DROP TABLE answers')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS answers ('
+                ' day INTEGER, part INTEGER, input_digest TEXT, code_digest TEXT, backend TEXT,'
+                ' answer TEXT, wall REAL, cpu REAL, created REAL, last_used REAL,'
+                ' PRIMARY KEY (day, part, input_digest, code_digest, backend))'
+            )
+
+    def get(
+        self, day: int, part: int, input_digest: str, code_digest: str
+    ) -> Optional[StoredAnswer]:
+        key = (day, part, input_digest, code_digest, selected_backend())
+        row = self.connection.execute(
+            'SELECT answer, wall, cpu FROM answers'
+            ' WHERE day = ? AND part = ? AND input_digest = ? AND code_digest = ? AND backend = ?',
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+
+        with self.connection:
+            self.connection.execute(
+                'UPDATE answers SET last_used = ?'
+                ' WHERE day = ? AND part = ? AND input_digest = ? AND code_digest = ? AND backend = ?',
+                (time.time(),) + key,
+            )
+
+        answer, wall, cpu = row
+        return StoredAnswer(json.loads(answer), wall, cpu)
+
+    def put(
+        self,
+        day: int,
+        part: int,
+        input_digest: str,
+        code_digest: str,
+        answer: Any,
+        wall: float,
+        cpu: float,
+    ):
+        now = time.time()
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    day,
+                    part,
+                    input_digest,
+                    code_digest,
+                    selected_backend(),
+                    json.dumps(answer),
+                    wall,
+                    cpu,
+                    now,
+                    now,
+                ),
+            )
+            self.connection.execute(
+                'DELETE FROM answers WHERE rowid IN'
+                ' (SELECT rowid FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,),
+            )
+
+    def close(self):
+        self.connection.close()
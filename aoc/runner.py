@@ -0,0 +1,523 @@
+"""Advent of Code 2021 - Runner
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+
+from aoc import counters
+from aoc import intermediates
+from aoc import parallel
+from aoc.cache import file_digest
+from aoc.cache import parse_cached
+from aoc.cache import parsed_input_store
+from aoc.days import input_path
+from aoc.days import load_day
+from aoc.generators import write_input
+from aoc.memory import MemoryUsage
+from aoc.memory import trace_call
+from aoc.profiling import profile_call
+from aoc.results import ResultStore
+from aoc.results import StoredAnswer
+from aoc.results import code_digest
+
+try:
+    import resource
+except ImportError:  # Not available on Windows, the address space of the workers is not limited there
+    resource = None
+
+# How often the watchdog reads the messages and checks the limits of the workers, in seconds
+WATCHDOG_INTERVAL = 0.1
+
+
+@dataclass
+class PhaseTiming:
+    phase: str
+    wall: float
+    cpu: float
+    # Wall clock time the phase started at, in seconds since the epoch so that it compares across processes
+    start: float = 0.0
+    memory: Optional[MemoryUsage] = None
+    counters: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class DayResult:
+    day: int
+    filename: str
+    answers: List[Any] = field(default_factory=list)
+    expected: Optional[Tuple[Any, Any]] = None
+    timings: List[PhaseTiming] = field(default_factory=list)
+    error: Optional[str] = None
+    parse_cache_hit: bool = False
+    cached_parts: List[int] = field(default_factory=list)
+    # Process that ran the day and when it was submitted to the pool, started and finished (seconds since the epoch)
+    pid: int = 0
+    submitted: Optional[float] = None
+    started: float = 0.0
+    finished: float = 0.0
+    # 'timeout' or 'oom' when the day exceeded its limits, the timings are those of the phases it finished
+    limit: Optional[str] = None
+    # Largest resident memory of the worker the watchdog saw, in bytes
+    peak_rss: Optional[int] = None
+
+    def status(self) -> str:
+        if self.limit is not None:
+            return self.limit
+
+        if self.error is not None:
+            return 'error'
+
+        if self.expected is not None and tuple(self.answers) != tuple(self.expected):
+            return 'mismatch'
+
+        return 'ok'
+
+
+@dataclass
+class Limits:
+    """Limits of the worker process of each day, None means unlimited."""
+
+    # Wall clock seconds for the whole day
+    timeout: Optional[float] = None
+    # Bytes of resident memory, checked by the watchdog where /proc is available
+    rss: Optional[int] = None
+    # Bytes of address space, allocating beyond it raises a MemoryError in the worker
+    address_space: Optional[int] = None
+
+    def check(self):
+        """Raise a ValueError for an address space limit the workers already exceed when they start.
+
+        A worker forked with less address space than it uses can't even report the MemoryError and would hang.
+        """
+        if self.address_space is None or resource is None:
+            return
+
+        current = _address_space(os.getpid())
+        if current is not None and self.address_space <= current:
+            raise ValueError(
+                f'The address space limit of {self.address_space / 2**20:.0f} MB is below the '
+                f'{current / 2**20:.0f} MB a worker starts with'
+            )
+
+
+def timed(timings: List[PhaseTiming], phase: str, f: Callable, *args) -> Any:
+    start = time.time()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    result = f(*args)
+
+    timings.append(
+        PhaseTiming(
+            phase,
+            time.perf_counter() - wall_start,
+            time.process_time() - cpu_start,
+            start,
+        )
+    )
+    return result
+
+
+def run_day(
+    day: int,
+    filename: Optional[str] = None,
+    scale: Optional[int] = None,
+    seed: int = 0,
+    use_cache: bool = True,
+    profile_dir: Optional[str] = None,
+    trace_memory: bool = False,
+    count: bool = False,
+    progress: Optional[Callable[[DayResult], None]] = None,
+) -> DayResult:
+    """Run parse, part 1 and part 2 of a day as separately timed phases.
+
+    If a scale is given the input is generated, see aoc.generators. The answers are only checked against the solver's
+    ANSWERS when the day's own input.txt is used.
+
+    Unless use_cache is false, answers are returned from the result store when neither the input nor the code changed,
+    parsed inputs are loaded from the parsed input cache and the solvers cache their intermediates, see
+    aoc.intermediates.
+
+    With a profile_dir, parse, part 1 and part 2 each run under cProfile and write day_XX_<phase>.prof and
+    day_XX_<phase>.folded to it, see aoc.profiling. With trace_memory, the peak traced memory and top allocation sites
+    of these phases are recorded, see aoc.memory. With count, the hot path counters of the solvers are enabled and
+    recorded per phase, see aoc.counters.
+
+    progress is called with the result so far after every phase, e.g. to report it from a worker that may be killed.
+    """
+    started = time.time()
+    if filename is None:
+        filename = input_path(day) if scale is None else write_input(day, scale, seed)
+
+    result = DayResult(day, filename, pid=os.getpid(), started=started)
+
+    def report():
+        if progress is not None:
+            progress(result)
+
+    def measure(phase: str, f: Callable[..., Any], *args) -> Any:
+        if profile_dir is not None:
+            f, args = profile_call, (os.path.join(profile_dir, f'day_{day:02}_{phase}'), f) + args
+        if count:
+            counters.start()
+        try:
+            if not trace_memory:
+                return timed(result.timings, phase, f, *args)
+
+            value, memory = timed(result.timings, phase, trace_call, f, *args)
+            result.timings[-1].memory = memory
+            return value
+        finally:
+            if count:
+                values = counters.stop()
+                if result.timings and result.timings[-1].phase == phase:
+                    result.timings[-1].counters = values
+            report()
+
+    store = None
+    if use_cache:
+        intermediates.enable()
+    try:
+        report()
+        module = timed(result.timings, 'import', load_day, day)
+        if os.path.abspath(filename) == input_path(day):
+            result.expected = module.ANSWERS
+        report()
+
+        stored: List[Optional[StoredAnswer]] = [None, None]
+        if use_cache:
+            store = ResultStore()
+            input_digest, code = timed(
+                result.timings, 'lookup', lambda: (file_digest(filename), code_digest(module))
+            )
+            stored = [store.get(day, part, input_digest, code) for part in (1, 2)]
+            report()
+
+        data = None
+        if not all(stored):
+            data, result.parse_cache_hit = measure(
+                'parse',
+                parse_cached,
+                module,
+                day,
+                filename,
+                parsed_input_store() if use_cache else None,
+            )
+
+        for part, solve in enumerate([module.solve_part1, module.solve_part2], start=1):
+            if stored[part - 1] is not None:
+                result.answers.append(stored[part - 1].answer)
+                result.cached_parts.append(part)
+                continue
+
+            result.answers.append(measure(f'part{part}', solve, data))
+            if store is not None:
+                timing = result.timings[-1]
+                store.put(
+                    day, part, input_digest, code, result.answers[-1], timing.wall, timing.cpu
+                )
+    except MemoryError:
+        result.error = traceback.format_exc()
+        result.limit = 'oom'
+    except Exception:
+        result.error = traceback.format_exc()
+    finally:
+        if store is not None:
+            store.close()
+        intermediates.disable()
+
+    result.finished = time.time()
+    return result
+
+
+def _memory_status(pid: int, name: str) -> Optional[int]:
+    """A memory size of /proc/<pid>/status in bytes, e.g. VmRSS, None where /proc is not available."""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith(f'{name}:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _resident_memory(pid: int) -> Optional[int]:
+    return _memory_status(pid, 'VmRSS')
+
+
+def _address_space(pid: int) -> Optional[int]:
+    return _memory_status(pid, 'VmSize')
+
+
+def _run_limited_day(connection, address_space: Optional[int], day: int, args: tuple):
+    if address_space is not None and resource is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (address_space, hard))
+
+    result = run_day(day, *args, progress=lambda partial: connection.send((False, partial)))
+    connection.send((True, result))
+    connection.close()
+
+
+class _LimitedWorker:
+    """A day running in a process of its own, which receives its progress and is killed when it exceeds the limits."""
+
+    def __init__(self, limits: Limits, day: int, filename: str, args: tuple):
+        self.limits = limits
+        self.submitted = time.time()
+
+        self.connection, sender = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(
+            target=_run_limited_day,
+            args=(sender, limits.address_space, day, (filename,) + args),
+            daemon=True,
+        )
+        self.process.start()
+        sender.close()
+
+        self.result = DayResult(day, filename, pid=self.process.pid, started=self.submitted)
+        self.done = False
+        self.limit: Optional[str] = None
+        self.message: Optional[str] = None
+        self.peak_rss: Optional[int] = None
+
+    def poll(self) -> bool:
+        """Receive the progress of the worker and check its limits, returns whether it should be finished."""
+        try:
+            while not self.done and self.connection.poll():
+                self.done, self.result = self.connection.recv()
+        except EOFError:
+            return True  # exited without a result
+        if self.done:
+            return True
+
+        rss = _resident_memory(self.process.pid)
+        if rss is not None:
+            self.peak_rss = max(self.peak_rss or 0, rss)
+            if self.limits.rss is not None and rss > self.limits.rss:
+                self.limit = 'oom'
+                self.message = (
+                    f'Killed at {rss / 2**20:.0f} MB resident memory, '
+                    f'the limit is {self.limits.rss / 2**20:.0f} MB'
+                )
+                return True
+
+        elapsed = time.time() - self.submitted
+        if self.limits.timeout is not None and elapsed > self.limits.timeout:
+            self.limit = 'timeout'
+            self.message = f'Killed after {elapsed:.1f} s, the timeout is {self.limits.timeout:g} s'
+            return True
+
+        return False
+
+    def finish(self) -> DayResult:
+        if not self.done:
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+        result = self.result
+        result.submitted = self.submitted
+        result.peak_rss = self.peak_rss
+        if not self.done:
+            if self.limit is None:
+                # Without a result the worker crashed, a SIGKILL most likely came from the kernel's OOM killer
+                exitcode = self.process.exitcode
+                self.limit = 'oom' if exitcode == -getattr(signal, 'SIGKILL', 9) else None
+                self.message = f'Worker exited with code {exitcode} before it finished'
+
+            result.limit = self.limit
+            result.error = self.message
+            result.finished = time.time()
+        return result
+
+
+def run_days_limited(
+    days: List[int], jobs: int, limits: Limits, scale: Optional[int], seed: int, *args
+) -> List[DayResult]:
+    """Like run_days() with each day in a new worker process that is killed when it exceeds the limits.
+
+    The days are run with run_day(day, filename, scale, seed, *args), the other days keep running when one is killed.
+    Scaled inputs are generated before the workers start, so that the input of a killed day is known.
+    """
+    limits.check()
+
+    pending = list(enumerate(days))
+    running: List[Tuple[int, _LimitedWorker]] = []
+    results: Dict[int, DayResult] = {}
+    while pending or running:
+        while pending and len(running) < jobs:
+            i, day = pending.pop(0)
+            filename = input_path(day) if scale is None else write_input(day, scale, seed)
+            running.append((i, _LimitedWorker(limits, day, filename, (scale, seed) + args)))
+
+        multiprocessing.connection.wait([w.connection for _, w in running], WATCHDOG_INTERVAL)
+        for i, worker in list(running):
+            if worker.poll():
+                running.remove((i, worker))
+                results[i] = worker.finish()
+
+    return [results[i] for i in range(len(days))]
+
+
+def run_days(
+    days: List[int],
+    jobs: Optional[int] = None,
+    scale: Optional[int] = None,
+    seed: int = 0,
+    use_cache: bool = True,
+    profile_dir: Optional[str] = None,
+    trace_memory: bool = False,
+    count: bool = False,
+    limits: Optional[Limits] = None,
+) -> List[DayResult]:
+    """Run the days across a process pool, the results are returned in the same order as the days.
+
+    With limits, every day runs in a worker process of its own instead, see run_days_limited().
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(days)))
+
+    if limits is not None:
+        return run_days_limited(
+            days, jobs, limits, scale, seed, use_cache, profile_dir, trace_memory, count
+        )
+
+    if jobs == 1:
+        return [
+            run_day(day, None, scale, seed, use_cache, profile_dir, trace_memory, count)
+            for day in days
+        ]
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=parallel.share_workers, initargs=(jobs,)
+    ) as executor:
+        submitted = []
+        futures = []
+        for day in days:
+            submitted.append(time.time())
+            futures.append(
+                executor.submit(
+                    run_day, day, None, scale, seed, use_cache, profile_dir, trace_memory, count
+                )
+            )
+
+        results = [f.result() for f in futures]
+
+    for result, t in zip(results, submitted):
+        result.submitted = t
+    return results
+
+
+def format_results(results: List[DayResult]) -> str:
+    lines = [f'{"Day":>3}  {"Phase":<6} {"Wall (ms)":>11} {"CPU (ms)":>11}  Status']
+    for result in results:
+        for timing in result.timings:
+            line = (
+                f'{result.day:>3}  {timing.phase:<6} '
+                f'{timing.wall * 1000:>11.2f} {timing.cpu * 1000:>11.2f}'
+            )
+            if timing.phase == 'parse' and result.parse_cache_hit:
+                line += '  cached'
+            lines.append(line)
+
+        for part in result.cached_parts:
+            lines.append(f'{result.day:>3}  {f"part{part}":<6} {"cached":>11}')
+
+        total_wall = sum([t.wall for t in result.timings])
+        total_cpu = sum([t.cpu for t in result.timings])
+        lines.append(
+            f'{result.day:>3}  {"total":<6} '
+            f'{total_wall * 1000:>11.2f} {total_cpu * 1000:>11.2f}  {result.status()}'
+        )
+
+    # Details for everything that went wrong
+    for result in results:
+        if result.status() in ('timeout', 'oom') and result.error is not None:
+            lines.append(f'\nDay {result.day} stopped ({result.status()}): {result.error.rstrip()}')
+        elif result.status() == 'error':
+            lines.append(f'\nDay {result.day} failed:\n{result.error.rstrip()}')
+        elif result.status() == 'mismatch':
+            for part, (answer, expected) in enumerate(
+                zip(result.answers, result.expected), start=1
+            ):
+                if answer != expected:
+                    lines.append(
+                        f'\nDay {result.day} part {part}: got {answer!r}, expected {expected!r}'
+                    )
+
+    return '\n'.join(lines)
+
+
+def format_memory(results: List[DayResult]) -> str:
+    lines = [f'{"Day":>3}  {"Phase":<6} {"Peak (MB)":>11}  Top allocation sites']
+    for result in results:
+        for timing in result.timings:
+            if timing.memory is None:
+                continue
+
+            lines.append(f'{result.day:>3}  {timing.phase:<6} {timing.memory.peak / 2**20:>11.2f}')
+            for site in timing.memory.sites:
+                lines.append(f'{"":>24}{site}')
+
+    return '\n'.join(lines)
+
+
+def format_counters(results: List[DayResult]) -> str:
+    """The counters of each phase, lists by their length and maximum and memoization by its hit rate too."""
+    lines = [f'{"Day":>3}  {"Phase":<6} Counters']
+    for result in results:
+        for timing in result.timings:
+            if not timing.counters:
+                continue
+
+            values = []
+            for name, value in sorted(timing.counters.items()):
+                if isinstance(value, list):
+                    values.append(f'{name}={len(value)} values, max {max(value, default=0)}')
+                else:
+                    values.append(f'{name}={value}')
+
+                if name.endswith('_hits'):
+                    memo = name[: -len('_hits')]
+                    calls = value + timing.counters.get(f'{memo}_misses', 0)
+                    values.append(f'{memo}_hit_rate={value / calls:.1%}')
+
+            lines.append(f'{result.day:>3}  {timing.phase:<6} {values[0]}')
+            for value in values[1:]:
+                lines.append(f'{"":>12}{value}')
+
+    return '\n'.join(lines)
+
+
+def to_json(results: List[DayResult]) -> List[Dict[str, Any]]:
+    return [asdict(result) for result in results]
@@ -0,0 +1,88 @@
+"""Advent of Code 2021 - Trace export
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Any
+from typing import Dict
+from typing import List
+
+import json
+import os
+
+from aoc.runner import DayResult
+
+# Track of the parent process, where the days wait to be scheduled on a worker
+SCHEDULER_PID = 0
+
+
+def _span(
+    name: str, category: str, pid: int, tid: int, start: float, end: float, **args
+) -> Dict[str, Any]:
+    return {
+        'name': name,
+        'cat': category,
+        'ph': 'X',
+        'pid': pid,
+        'tid': tid,
+        'ts': start * 1e6,
+        'dur': max(0.0, end - start) * 1e6,
+        'args': args,
+    }
+
+
+def _process_name(pid: int, name: str) -> Dict[str, Any]:
+    return {'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': name}}
+
+
+def to_trace_events(results: List[DayResult]) -> Dict[str, Any]:
+    """Trace Event Format document of the results, viewable in chrome://tracing and https://ui.perfetto.dev.
+
+    Every worker process is one track with a span per day and nested spans per phase. Days run in a pool also get a
+    span on the scheduler track for the time they were queued before a worker picked them up.
+    """
+    events = [_process_name(SCHEDULER_PID, 'scheduler')]
+    for pid in sorted({result.pid for result in results}):
+        events.append(_process_name(pid, f'worker {pid}'))
+
+    for result in results:
+        name = f'day {result.day}'
+        args = {'input': os.path.relpath(result.filename), 'status': result.status()}
+        if result.submitted is not None:
+            events.append(
+                _span(name, 'queue', SCHEDULER_PID, result.day, result.submitted, result.started)
+            )
+
+        events.append(_span(name, 'day', result.pid, 0, result.started, result.finished, **args))
+        for timing in result.timings:
+            phase_args = {'cpu_ms': timing.cpu * 1000}
+            if timing.phase == 'parse':
+                phase_args['cached'] = result.parse_cache_hit
+            events.append(
+                _span(
+                    timing.phase,
+                    'phase',
+                    result.pid,
+                    0,
+                    timing.start,
+                    timing.start + timing.wall,
+                    **phase_args,
+                )
+            )
+
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def save(results: List[DayResult], filename: str):
+    with open(filename, 'w') as f:
+        json.dump(to_trace_events(results), f)
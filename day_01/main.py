@@ -14,32 +14,32 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from typing import List
+from typing import Sequence
 
+import os
+from array import array
 
-def read_input(filename: str) -> List[int]:
-    with open(filename) as f:
-        lines = f.readlines()
+from aoc.loaders import read_ints
 
-    return [int(v) for v in lines]
 
+def read_input(filename: str) -> array:
+    return read_ints(filename)
 
-def calculate_sonar_differences(data: List[int]) -> List[int]:
-    sonar_differences = []
-    for previous_value, value in zip([None] + data, data):
-        if previous_value is None:
-            continue
 
+def calculate_sonar_differences(data: Sequence[int]) -> List[int]:
+    sonar_differences = []
+    for previous_value, value in zip(data, data[1:]):
         sonar_differences.append(value - previous_value)
 
     return sonar_differences
 
 
-def calculate_increased_measurement_count(data: List[int]) -> int:
+def calculate_increased_measurement_count(data: Sequence[int]) -> int:
     data = calculate_sonar_differences(data)
     return sum([1 for d in data if d > 0])
 
 
-def partition(input_data: List[int]) -> List[List[int]]:
+def partition(input_data: Sequence[int]) -> List[Sequence[int]]:
     result = []
     for i in range(len(input_data) - 2):
         result.append(input_data[i : i + 3])
@@ -47,21 +47,35 @@ def partition(input_data: List[int]) -> List[List[int]]:
     return result
 
 
-def main():
-    # Part 1
-    sonar_data = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> array:
+    return read_input(filename)
 
-    result = calculate_increased_measurement_count(sonar_data)
 
-    print(result)
-    assert result == 1527
+def solve_part1(sonar_data: Sequence[int]) -> int:
+    return calculate_increased_measurement_count(sonar_data)
 
-    # Part 2
+
+def solve_part2(sonar_data: Sequence[int]) -> int:
     partitions = partition(sonar_data)
     partition_sums = [sum(p) for p in partitions]
-    result = calculate_increased_measurement_count(partition_sums)
+    return calculate_increased_measurement_count(partition_sums)
+
+
+ANSWERS = (1527, 1575)
+
+
+def main():
+    sonar_data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    result = solve_part1(sonar_data)
+    print(result)
+    assert result == ANSWERS[0]
+
+    # Part 2
+    result = solve_part2(sonar_data)
     print(result)
-    assert result == 1575
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
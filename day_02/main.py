@@ -16,10 +16,13 @@
 from typing import List
 from typing import Tuple
 
+import os
 from dataclasses import dataclass
 from enum import Enum
 from enum import auto
 
+from aoc.loaders import read_tokens
+
 
 @dataclass
 class Location:
@@ -40,15 +43,10 @@ NavigationData = List[Tuple[Course, int]]
 
 
 def read_input(file: str) -> NavigationData:
-    result = []
-    with open(file) as f:
-        instructions = f.readlines()
-
-    instructions = [i.split() for i in instructions]
-    for course, value in instructions:
-        result.append((Course[course.upper()], int(value)))
+    courses = {c.name.lower().encode(): c for c in Course}
 
-    return result
+    tokens = read_tokens(file)
+    return [(courses[c], int(v)) for c, v in zip(tokens[0::2], tokens[1::2])]
 
 
 def navigate(location: Location, nav_data: NavigationData):
@@ -76,21 +74,37 @@ def navigate_v2(location: Location, nav_data: NavigationData):
             raise ValueError()
 
 
-def main():
-    # Part 1
-    nav_data = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> NavigationData:
+    return read_input(filename)
+
+
+def solve_part1(nav_data: NavigationData) -> int:
     location = Location()
     navigate(location, nav_data)
-    result = location.horizontal * location.depth
-    print(result)
-    assert result == 2187380
+    return location.horizontal * location.depth
 
-    # Part 2
+
+def solve_part2(nav_data: NavigationData) -> int:
     location = Location()
     navigate_v2(location, nav_data)
-    result = location.horizontal * location.depth
+    return location.horizontal * location.depth
+
+
+ANSWERS = (2187380, 2086357770)
+
+
+def main():
+    nav_data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    result = solve_part1(nav_data)
+    print(result)
+    assert result == ANSWERS[0]
+
+    # Part 2
+    result = solve_part2(nav_data)
     print(result)
-    assert result == 2086357770
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
@@ -17,8 +17,15 @@ from typing import Any
 from typing import Iterable
 from typing import List
 
+import os
 from collections import Counter
 
+from aoc.backends import dispatch
+from aoc.backends import np
+
+# Inputs with at least this many bits are solved with NumPy when it is installed, see aoc.backends
+NUMPY_THRESHOLD = 4096
+
 
 def read_input(filename: str) -> List[str]:
     with open(filename) as f:
@@ -40,6 +47,29 @@ def get_counters(data: List[str]) -> List[Counter]:
     return [Counter(v) for v in data]
 
 
+def get_bit_matrix(data: List[str]) -> 'np.ndarray':
+    """Boolean matrix of the bits, one row per number."""
+    characters = np.frombuffer(''.join(data).encode('ascii'), dtype=np.uint8)
+    return characters.reshape(len(data), -1) == ord('1')
+
+
+def get_size(data: List[str], *_) -> int:
+    return len(data) * len(data[0])
+
+
+def common_bits_numpy(data: List[str], type: str) -> str:
+    if type not in ['most', 'least']:
+        raise ValueError()
+
+    ones = get_bit_matrix(data).sum(axis=0)
+    zeros = len(data) - ones
+    assert (ones != zeros).all()
+
+    bits = ones > zeros if type == 'most' else ones < zeros
+    return ''.join(['1' if b else '0' for b in bits])
+
+
+@dispatch(common_bits_numpy, get_size, NUMPY_THRESHOLD)
 def common_bits(data: List[str], type: str) -> str:
     if type not in ['most', 'least']:
         raise ValueError()
@@ -57,6 +87,31 @@ def common_bits(data: List[str], type: str) -> str:
     return ''.join(result)
 
 
+def get_after_bit_crit_numpy(data: List[str], condition: str) -> str:
+    if condition not in ['most', 'least']:
+        raise ValueError()
+
+    bits = get_bit_matrix(data)
+    rows = np.arange(len(data))
+    for index in range(bits.shape[1]):
+        column = bits[rows, index]
+        ones = int(column.sum())
+        zeros = len(rows) - ones
+
+        if condition == 'most':
+            filter_bit = zeros <= ones
+        else:
+            filter_bit = zeros > ones
+
+        rows = rows[column == filter_bit]
+
+        if len(rows) == 1:
+            return data[rows[0]]
+
+    raise Exception()
+
+
+@dispatch(get_after_bit_crit_numpy, get_size, NUMPY_THRESHOLD)
 def get_after_bit_crit(data: List[str], condition: str) -> str:
     if condition not in ['most', 'least']:
         raise ValueError()
@@ -78,38 +133,45 @@ def get_after_bit_crit(data: List[str], condition: str) -> str:
     raise Exception()
 
 
-def main():
-    data = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> List[str]:
+    return read_input(filename)
 
-    # Part 1
+
+def solve_part1(data: List[str]) -> int:
     gamma_bits = common_bits(data, 'most')
     gamma_rate = int(gamma_bits, 2)
 
     epsilon_bits = common_bits(data, 'least')
     epsilon_rate = int(epsilon_bits, 2)
 
-    power_consumption = gamma_rate * epsilon_rate
+    return gamma_rate * epsilon_rate
 
-    print(f'gamma_rate={gamma_rate}')
-    print(f'epsilon_rate={epsilon_rate}')
-    print(f'power_consumption{power_consumption}')
 
-    assert power_consumption == 1307354
-
-    # Part 2
+def solve_part2(data: List[str]) -> int:
     oxygen_generator_bits = get_after_bit_crit(data, 'most')
     oxygen_generator_rating = int(oxygen_generator_bits, 2)
 
     co2_scrubber_bits = get_after_bit_crit(data, 'least')
     co2_scrubber_rating = int(co2_scrubber_bits, 2)
 
-    life_support_rating = oxygen_generator_rating * co2_scrubber_rating
+    return oxygen_generator_rating * co2_scrubber_rating
 
-    print(f'oxygen_generator_rating={oxygen_generator_rating}')
-    print(f'co2_scrubber_rating={co2_scrubber_rating}')
-    print(f'life_support_rating={life_support_rating}')
 
-    assert life_support_rating == 482500
+ANSWERS = (1307354, 482500)
+
+
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    power_consumption = solve_part1(data)
+    print(f'power_consumption={power_consumption}')
+    assert power_consumption == ANSWERS[0]
+
+    # Part 2
+    life_support_rating = solve_part2(data)
+    print(f'life_support_rating={life_support_rating}')
+    assert life_support_rating == ANSWERS[1]
 
 
 if __name__ == '__main__':
@@ -13,20 +13,18 @@
     You should have received a copy of the GNU General Public License
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from typing import AbstractSet
 from typing import Any
 from typing import List
+from typing import Optional
 from typing import Tuple
 
+import os
+
 from dataclasses import dataclass
 from dataclasses import field
 
 
-@dataclass
-class BingoSquare:
-    number: int
-    checked: bool = False
-
-
 def transpose_input_data(data: List[List[Any]]) -> List[List[Any]]:
     result = [[] for _ in data[0]]
     for row in data:
@@ -36,40 +34,30 @@ def transpose_input_data(data: List[List[Any]]) -> List[List[Any]]:
     return result
 
 
-@dataclass
+@dataclass(frozen=True)
 class BingoBoard:
-    rows: List[List[BingoSquare]] = field(default_factory=list)
-    col_count: int = 5
-    row_count: int = 5
+    """The numbers of a board, which numbers are marked is passed in so that the board itself never changes."""
 
-    last_marked_number: int = None
+    rows: Tuple[Tuple[int, ...], ...]
+    columns: Tuple[Tuple[int, ...], ...] = field(init=False, repr=False, compare=False)
 
-    def mark_number(self, number: int):
-        self.last_marked_number = number
-        for row in self.rows:
-            for square in row:
-                if square.number == number:
-                    square.checked = True
+    def __post_init__(self):
+        object.__setattr__(
+            self, 'columns', tuple([tuple(c) for c in transpose_input_data(self.rows)])
+        )
 
-    def score(self) -> int:
+    def score(self, marked_numbers: AbstractSet[int], last_marked_number: int) -> int:
         unmarked_numbers: List[int] = []
         for row in self.rows:
-            for square in row:
-                if not square.checked:
-                    unmarked_numbers.append(square.number)
+            for number in row:
+                if number not in marked_numbers:
+                    unmarked_numbers.append(number)
 
-        return self.last_marked_number * sum(unmarked_numbers)
+        return last_marked_number * sum(unmarked_numbers)
 
-    def has_won(self) -> bool:
-        # Check rows
-        for row in self.rows:
-            if all([n.checked for n in row]):
-                return True
-
-        # Check columns
-        columns = transpose_input_data(self.rows)
-        for col in columns:
-            if all([n.checked for n in col]):
+    def has_won(self, marked_numbers: AbstractSet[int]) -> bool:
+        for line in self.rows + self.columns:
+            if all([n in marked_numbers for n in line]):
                 return True
 
         return False
@@ -83,65 +71,90 @@ def read_input(filename: str) -> Tuple[List[int], List[BingoBoard]]:
         lines = f.readlines()
         drawn_numbers = [int(n) for n in lines[0].strip().split(',')]
 
-        bingo_board = BingoBoard()
+        rows = []
         for line in lines[2:]:
             line = line.strip()
 
             if not line:
-                assert len(bingo_board.rows) == 5
-                bingo_boards.append(bingo_board)
-                bingo_board = BingoBoard()
+                assert len(rows) == 5
+                bingo_boards.append(BingoBoard(tuple(rows)))
+                rows = []
                 continue
 
-            row = [int(n) for n in line.split()]
+            row = tuple([int(n) for n in line.split()])
             assert len(row) == 5
 
-            bingo_board.rows.append([BingoSquare(n) for n in row])
+            rows.append(row)
 
-        assert len(bingo_board.rows) == 5
-        bingo_boards.append(bingo_board)
+        assert len(rows) == 5
+        bingo_boards.append(BingoBoard(tuple(rows)))
 
     return drawn_numbers, bingo_boards
 
 
-def get_first_winner_score(drawn_numbers, bingo_boards) -> int:
+def get_first_winner_score(drawn_numbers, bingo_boards) -> Optional[int]:
+    # Every board has the same marked numbers, the ones drawn so far
+    marked_numbers = set()
     for drawn_number in drawn_numbers:
+        marked_numbers.add(drawn_number)
         for bingo_board in bingo_boards:
-            bingo_board.mark_number(drawn_number)
+            if bingo_board.has_won(marked_numbers):
+                return bingo_board.score(marked_numbers, drawn_number)
 
-            if bingo_board.has_won():
-                return bingo_board.score()
+    return None
 
 
 def get_last_winner_score(drawn_numbers: List[int], bingo_boards: List[BingoBoard]) -> int:
+    marked_numbers = set()
     for drawn_number in drawn_numbers:
-        for bingo_board in bingo_boards:
-            bingo_board.mark_number(drawn_number)
+        marked_numbers.add(drawn_number)
 
         # End condition
-        if len(bingo_boards) == 1 and bingo_boards[0].has_won():
-            return bingo_boards[0].score()
+        if len(bingo_boards) == 1 and bingo_boards[0].has_won(marked_numbers):
+            return bingo_boards[0].score(marked_numbers, drawn_number)
 
         # Remove boards that have won
-        bingo_boards = [b for b in bingo_boards if not b.has_won()]
+        bingo_boards = [b for b in bingo_boards if not b.has_won(marked_numbers)]
 
     raise ValueError()
 
 
+BingoData = Tuple[List[int], List[BingoBoard]]
+
+
+# Bump when the parsed representation changes, parsed inputs are cached by aoc.cache
+PARSER_VERSION = 2
+
+
+def parse(filename: str = 'input.txt') -> BingoData:
+    return read_input(filename)
+
+
+def solve_part1(data: BingoData) -> int:
+    drawn_numbers, bingo_boards = data
+    return get_first_winner_score(drawn_numbers, bingo_boards)
+
+
+def solve_part2(data: BingoData) -> int:
+    drawn_numbers, bingo_boards = data
+    return get_last_winner_score(drawn_numbers, bingo_boards)
+
+
+ANSWERS = (49686, 26878)
+
+
 def main():
-    drawn_numbers, bingo_boards = read_input('input.txt')
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
 
     # Part 1
-    score = get_first_winner_score(drawn_numbers, bingo_boards)
-    assert score == 49686
+    score = solve_part1(data)
     print(score)
+    assert score == ANSWERS[0]
 
     # Part 2
-    drawn_numbers, bingo_boards = read_input('input.txt')  # Reset data
-
-    score = get_last_winner_score(drawn_numbers, bingo_boards)
-    assert score == 26878
+    score = solve_part2(data)
     print(score)
+    assert score == ANSWERS[1]
 
 
 if __name__ == '__main__':
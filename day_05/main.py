@@ -15,11 +15,22 @@
 """
 from typing import List
 from typing import Tuple
+
+import os
 from dataclasses import dataclass
 
+from aoc.backends import dispatch
+from aoc.backends import np
+from aoc.grid import Grid
+
+# Inputs with at least this many lines are solved with NumPy when it is installed, see aoc.backends
+NUMPY_THRESHOLD = 64
+
 
 @dataclass
 class VentPositionData:
+    __slots__ = ('start_coord', 'end_coord')
+
     start_coord: Tuple[int, int]
     end_coord: Tuple[int, int]
 
@@ -56,43 +67,28 @@ class VentPositionData:
 
 
 class VentDiagram:
-    def __init__(self):
-        self.diagram: List[List[int]] = []
-        self.width = 0
-        self.height = 0
-
-    def _extend_diagram(self, coord: Tuple[int, int]):
-        x, y = coord
-        new_width = max(self.width, x + 1)
-        new_height = max(self.height, y + 1)
-
-        # Create new
-        new_diagram = [[0 for _ in range(new_width)] for _ in range(new_height)]
-
-        # Transfer data
-        for y, row in enumerate(self.diagram):
-            for x, count in enumerate(row):
-                new_diagram[y][x] = count
-
-        self.diagram = new_diagram
-        self.width = new_width
-        self.height = new_height
-
-    def plot_coord(self, coord: Tuple[int, int]):
-        x, y = coord
-        if x >= self.width or y >= self.height:
-            self._extend_diagram(coord)
-
-        self.diagram[y][x] += 1
+    def __init__(self, vents: List[VentPositionData]):
+        width = max([max(v.start_coord[0], v.end_coord[0]) for v in vents]) + 1
+        height = max([max(v.start_coord[1], v.end_coord[1]) for v in vents]) + 1
+        self.grid = Grid(width, height, padding=0, typecode='I')
+
+    def plot_line(self, line: VentPositionData):
+        x1, y1 = line.start_coord
+        x2, y2 = line.end_coord
+
+        # Walk the flat cells directly, one step is a combination of a row and a column step
+        step = (y2 > y1) - (y2 < y1)
+        step = step * self.grid.stride + (x2 > x1) - (x2 < x1)
+        length = max(abs(x2 - x1), abs(y2 - y1)) + 1
+
+        cells = self.grid.cells
+        index = self.grid.index(x1, y1)
+        for _ in range(length):
+            cells[index] += 1
+            index += step
 
     def count_least_two_lines(self) -> int:
-        result = 0
-        for row in self.diagram:
-            for count in row:
-                if count >= 2:
-                    result += 1
-
-        return result
+        return sum([1 for count in self.grid.cells if count >= 2])
 
 
 def read_input(filename: str) -> List[VentPositionData]:
@@ -109,33 +105,62 @@ def read_input(filename: str) -> List[VentPositionData]:
     return vents
 
 
-def main():
-    # Part 1
-    data = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> List[VentPositionData]:
+    return read_input(filename)
 
-    d = VentDiagram()
 
-    for line in data:
-        if line.is_diagonal():
-            continue
+def count_overlaps_numpy(lines: List[VentPositionData]) -> int:
+    """Count the cells covered by at least two lines, with all cells of all lines as one array of flat indices."""
+    x1, y1 = np.array([line.start_coord for line in lines], dtype=np.int64).T
+    x2, y2 = np.array([line.end_coord for line in lines], dtype=np.int64).T
+    width = int(max(x1.max(), x2.max())) + 1
+    height = int(max(y1.max(), y2.max())) + 1
 
-        for c in line.get_all_coords():
-            d.plot_coord(c)
+    steps = np.sign(y2 - y1) * width + np.sign(x2 - x1)
+    lengths = np.maximum(np.abs(x2 - x1), np.abs(y2 - y1)) + 1
 
-    result = d.count_least_two_lines()
-    assert result == 6267
-    print(result)
+    # Position of every cell within its line
+    line_starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    positions = np.arange(lengths.sum()) - line_starts
+
+    indices = np.repeat(y1 * width + x1, lengths) + positions * np.repeat(steps, lengths)
+    counts = np.bincount(indices, minlength=width * height)
+    return int((counts >= 2).sum())
 
-    # Part 2
-    d = VentDiagram()
 
-    for line in data:
-        for c in line.get_all_coords():
-            d.plot_coord(c)
+@dispatch(count_overlaps_numpy, len, NUMPY_THRESHOLD)
+def count_overlaps(lines: List[VentPositionData]) -> int:
+    d = VentDiagram(lines)
 
-    result = d.count_least_two_lines()
-    assert result == 20196
+    for line in lines:
+        d.plot_line(line)
+
+    return d.count_least_two_lines()
+
+
+def solve_part1(data: List[VentPositionData]) -> int:
+    return count_overlaps([line for line in data if not line.is_diagonal()])
+
+
+def solve_part2(data: List[VentPositionData]) -> int:
+    return count_overlaps(data)
+
+
+ANSWERS = (6267, 20196)
+
+
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    result = solve_part1(data)
+    print(result)
+    assert result == ANSWERS[0]
+
+    # Part 2
+    result = solve_part2(data)
     print(result)
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
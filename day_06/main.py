@@ -15,15 +15,17 @@
 """
 from typing import Dict
 from typing import List
+from typing import Sequence
 
+import os
+from array import array
 from collections import Counter
 
+from aoc.loaders import read_ints
 
-def read_input(filename: str) -> List[int]:
-    with open(filename) as f:
-        lines = f.readlines()
 
-    return [int(v) for v in lines[0].strip().split(',')]
+def read_input(filename: str) -> array:
+    return read_ints(filename)
 
 
 def perform_cycle(state: List[int] = None):
@@ -42,7 +44,7 @@ def perform_cycle(state: List[int] = None):
         state.append(8)
 
 
-def get_state_dict(state: List[int]) -> Dict[int, int]:
+def get_state_dict(state: Sequence[int]) -> Dict[int, int]:
     return dict(Counter(state))
 
 
@@ -68,26 +70,43 @@ def perform_cycle_dict(state: Dict[int, int]):
     return new_state
 
 
-def main():
-    # Part 1
-    data = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> array:
+    return read_input(filename)
+
+
+def solve_part1(data: Sequence[int]) -> int:
+    state = list(data)  # perform_cycle works in place
 
     for day in range(80):
-        perform_cycle(data)
+        perform_cycle(state)
 
-    lanternfish_count = len(data)
-    print(f'lanternfish_count={lanternfish_count}')
+    return len(state)
 
-    # Part 2
-    data = read_input('input.txt')
+
+def solve_part2(data: Sequence[int]) -> int:
     states = get_state_dict(data)
 
     for day in range(256):
         states = perform_cycle_dict(states)
 
-    lanternfish_count = sum([v for v in states.values()])
+    return sum([v for v in states.values()])
+
+
+ANSWERS = (388419, 1740449478328)
+
+
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    lanternfish_count = solve_part1(data)
+    print(f'lanternfish_count={lanternfish_count}')
+    assert lanternfish_count == ANSWERS[0]
+
+    # Part 2
+    lanternfish_count = solve_part2(data)
     print(f'lanternfish_count={lanternfish_count}')
-    assert lanternfish_count == 1740449478328
+    assert lanternfish_count == ANSWERS[1]
 
 
 if __name__ == '__main__':
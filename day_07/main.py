@@ -13,20 +13,34 @@
     You should have received a copy of the GNU General Public License
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-from typing import List
+from typing import Sequence
 
+import os
 import statistics
+from array import array
 
+from aoc.backends import dispatch
+from aoc.backends import np
+from aoc.loaders import read_ints
+from aoc.parallel import parallel_map
 
-def read_input(filename: str) -> List[int]:
-    with open(filename) as f:
-        lines = f.readlines()
+# Inputs with at least this many positions are solved with NumPy when it is installed, see aoc.backends
+NUMPY_THRESHOLD = 256
 
-    return [int(v) for v in lines[0].strip().split(',')]
 
+def read_input(filename: str) -> array:
+    return read_ints(filename)
 
+
+def calculate_fuel_for_alignment_v1_numpy(
+    horizontal_positions: Sequence[int], alignment_level: int
+) -> int:
+    return int(np.abs(np.asarray(horizontal_positions) - alignment_level).sum())
+
+
+@dispatch(calculate_fuel_for_alignment_v1_numpy, lambda p, _: len(p), NUMPY_THRESHOLD)
 def calculate_fuel_for_alignment_v1(
-    horizontal_positions: List[int], alignment_level: int
+    horizontal_positions: Sequence[int], alignment_level: int
 ) -> int:
     result = 0
     for p in horizontal_positions:
@@ -36,7 +50,7 @@ def calculate_fuel_for_alignment_v1(
 
 
 def calculate_fuel_for_alignment_v2(
-    horizontal_positions: List[int], alignment_level: int
+    horizontal_positions: Sequence[int], alignment_level: int
 ) -> int:
     result = 0
     for p in horizontal_positions:
@@ -45,24 +59,62 @@ def calculate_fuel_for_alignment_v2(
     return result
 
 
+def get_minimum_fuel_v2_numpy(horizontal_positions: Sequence[int]) -> int:
+    positions = np.asarray(horizontal_positions, dtype=np.int64)
+
+    minimum_fuel = None
+    for hor_lvl in range(int(positions.min()), int(positions.max()) + 1):
+        distances = np.abs(positions - hor_lvl)
+        fuel = int((distances * (distances + 1) // 2).sum())
+        if minimum_fuel is None or fuel < minimum_fuel:
+            minimum_fuel = fuel
+
+    return minimum_fuel
+
+
+def _fuel_for_alignment_v2(alignment_level: int, horizontal_positions: Sequence[int]) -> int:
+    return calculate_fuel_for_alignment_v2(horizontal_positions, alignment_level)
+
+
+@dispatch(get_minimum_fuel_v2_numpy, len, NUMPY_THRESHOLD)
+def get_minimum_fuel_v2(horizontal_positions: Sequence[int]) -> int:
+    # Lets brute force this! (a faster would be to use binary search or start in the middle or something, but meh)
+    # The alignment levels are independent, so they are tried across worker processes.
+    return parallel_map(
+        _fuel_for_alignment_v2,
+        range(min(horizontal_positions), max(horizontal_positions) + 1),
+        min,
+        data=horizontal_positions,
+    )
+
+
+def parse(filename: str = 'input.txt') -> array:
+    return read_input(filename)
+
+
+def solve_part1(data: Sequence[int]) -> int:
+    return calculate_fuel_for_alignment_v1(data, int(statistics.median(data)))
+
+
+def solve_part2(data: Sequence[int]) -> int:
+    return get_minimum_fuel_v2(data)
+
+
+ANSWERS = (348996, 98231647)
+
+
 def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
     # Part 1
-    data = read_input('input.txt')
-    fuel_required = calculate_fuel_for_alignment_v1(data, int(statistics.median(data)))
+    fuel_required = solve_part1(data)
     print(f'fuel_required={fuel_required}')
-    assert fuel_required == 348996
+    assert fuel_required == ANSWERS[0]
 
     # Part 2
-
-    # Lets brute force this! (a faster would be to use binary search or start in the middle or something, but meh)
-    actual_fuel_required = calculate_fuel_for_alignment_v2(data, 0)
-    for hor_lvl in range(min(data), max(data) + 1):
-        possible_fuel_requirement = calculate_fuel_for_alignment_v2(data, hor_lvl)
-        if actual_fuel_required > possible_fuel_requirement:
-            actual_fuel_required = possible_fuel_requirement
-
+    actual_fuel_required = solve_part2(data)
     print(f'actual_fuel_required={actual_fuel_required}')
-    assert actual_fuel_required == 98231647
+    assert actual_fuel_required == ANSWERS[1]
 
 
 if __name__ == '__main__':
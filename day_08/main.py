@@ -16,6 +16,8 @@
 from typing import Dict
 from typing import List
 
+import os
+
 
 def read_input(filename: str):
     with open(filename) as f:
@@ -127,20 +129,21 @@ def is_solution(values, solution):
     return True
 
 
-def main():
-    # Part 1
-    data = read_input('input.txt')
+def parse(filename: str = 'input.txt'):
+    return read_input(filename)
 
+
+def solve_part1(data) -> int:
     counter = 0
     for input_values, output_values in data:
         for v in output_values:
             if len(v) in [2, 4, 3, 7]:
                 counter += 1
 
-    print(counter)
-    assert counter == 412
+    return counter
 
-    # Part 2
+
+def solve_part2(data) -> int:
     total_sum = 0
     for input_values, output_values in data:
         solver = SegDisplaySolver()
@@ -159,8 +162,24 @@ def main():
 
         assert solution_count == 1
 
+    return total_sum
+
+
+ANSWERS = (412, 978171)
+
+
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    counter = solve_part1(data)
+    print(counter)
+    assert counter == ANSWERS[0]
+
+    # Part 2
+    total_sum = solve_part2(data)
     print(total_sum)
-    assert total_sum == 978171
+    assert total_sum == ANSWERS[1]
 
 
 if __name__ == '__main__':
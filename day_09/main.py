@@ -14,84 +14,84 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from typing import List
-from typing import Tuple
 
+import os
+from aoc.backends import dispatch
+from aoc.backends import np
+from aoc.grid import Grid
 
-def read_input(filename: str) -> List[List[int]]:
-    with open(filename) as f:
-        lines = f.readlines()
-    result = []
-    for line in lines:
-        result.append([int(v) for v in line.strip()])
+# Heightmaps with at least this many locations are searched with NumPy when it is installed, see aoc.backends
+NUMPY_THRESHOLD = 10000
 
-    return result
-
-
-def get_adjacent_points(data, x, y) -> List[Tuple[int, int]]:
-    adjacent_points = []
+# Heights with a border of 9s, which never are low points or part of a basin
+Heightmap = Grid
 
-    if y != 0:
-        adjacent_points.append((x, y - 1))
 
-    if x != 0:
-        adjacent_points.append((x - 1, y))
+def read_input(filename: str) -> Heightmap:
+    return Grid.from_digits(filename, fill=9)
 
-    if y != len(data) - 1:
-        adjacent_points.append((x, y + 1))
 
-    if x != len(data[0]) - 1:
-        adjacent_points.append((x + 1, y))
+def get_low_points_numpy(data: Heightmap) -> List[int]:
+    heights = data.to_numpy(padded=True)
+    w = heights.shape[1]
+    center = heights[1:-1, 1:-1]
+    is_low_point = (
+        (center < heights[:-2, 1:-1])
+        & (center < heights[2:, 1:-1])
+        & (center < heights[1:-1, :-2])
+        & (center < heights[1:-1, 2:])
+    )
 
-    return adjacent_points
+    # Back to the flat indices of the grid, the centers start at (1, 1) of the padded heights
+    ys, xs = np.nonzero(is_low_point)
+    return ((ys + 1) * w + xs + 1).tolist()
 
 
-def get_adjacent_values(data, x, y) -> List[int]:
-    return [data[y][x] for x, y in get_adjacent_points(data, x, y)]
+@dispatch(get_low_points_numpy, len, NUMPY_THRESHOLD)
+def get_low_points(data: Heightmap) -> List[int]:
+    cells = data.cells
+    offsets = data.offsets4
 
-
-def get_low_points(data: List[List[int]]) -> List[Tuple[int, int]]:
     low_points = []
-    for y, row in enumerate(data):
-        for x, value in enumerate(row):
-            adjacent_values = get_adjacent_values(data, x, y)
-
-            min_value = min(value, *adjacent_values)
-            if min_value == value and value not in adjacent_values:
-                low_points.append((x, y))
+    for i in data.indices():
+        value = cells[i]
+        if all([cells[i + offset] > value for offset in offsets]):
+            low_points.append(i)
     return low_points
 
 
-def get_point_basin(
-    data: List[List[int]], low_point: Tuple[int, int]
-) -> List[Tuple[int, int]]:
-    basin_points = [low_point]
+def get_point_basin(data: Heightmap, low_point: int) -> List[int]:
+    cells = data.cells
+    offsets = data.offsets4
 
-    x, y = low_point
-    low_point_value = data[y][x]
-    adj_points = get_adjacent_points(data, x, y)
-    for adj_x, adj_y in adj_points:
-        if data[adj_y][adj_x] == 9:
+    basin_points = {low_point}
+    stack = [low_point]
+    while stack:
+        i = stack.pop()
+        value = cells[i]
+        for offset in offsets:
+            adjacent = i + offset
             # "Locations of height 9 do not count as being in any basin"
-            continue
+            if value < cells[adjacent] < 9 and adjacent not in basin_points:
+                basin_points.add(adjacent)
+                stack.append(adjacent)
 
-        if data[adj_y][adj_x] > low_point_value:
-            basin_points.extend(get_point_basin(data, (adj_x, adj_y)))
+    return list(basin_points)
 
-    return list(set(basin_points))
 
+def parse(filename: str = 'input.txt') -> Heightmap:
+    return read_input(filename)
 
-def main():
-    # Part 1
-    data = read_input('input.txt')
 
+def solve_part1(data: Heightmap) -> int:
     low_points = get_low_points(data)
-    low_points_values = [data[y][x] for x, y in low_points]
+    low_points_values = [data.cells[i] for i in low_points]
 
-    risk_sum = sum([1 + p for p in low_points_values])
-    print(risk_sum)
-    assert risk_sum == 588
+    return sum([1 + p for p in low_points_values])
 
-    # Part 2
+
+def solve_part2(data: Heightmap) -> int:
+    low_points = get_low_points(data)
     basins = [get_point_basin(data, low_point) for low_point in low_points]
     basins_sizes = [len(basin) for basin in basins]
 
@@ -99,8 +99,24 @@ def main():
     for v in sorted(basins_sizes, reverse=True)[:3]:
         result *= v
 
+    return result
+
+
+ANSWERS = (588, 964712)
+
+
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    risk_sum = solve_part1(data)
+    print(risk_sum)
+    assert risk_sum == ANSWERS[0]
+
+    # Part 2
+    result = solve_part2(data)
     print(result)
-    assert result == 964712
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
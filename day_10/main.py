@@ -15,6 +15,8 @@
 """
 from typing import List
 
+import os
+
 
 def read_input(filename: str) -> List[str]:
     with open(filename) as f:
@@ -88,24 +90,39 @@ def calculate_incomplete_score(data: str) -> int:
     return score
 
 
-def main():
-    # Part 1
-    data = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> List[str]:
+    return read_input(filename)
 
-    result = sum([calculate_syntax_error_score(l) for l in data])
-    print(result)
-    assert result == 464991
 
-    # Part 2
+def solve_part1(data: List[str]) -> int:
+    return sum([calculate_syntax_error_score(l) for l in data])
+
+
+def solve_part2(data: List[str]) -> int:
     incomplete_lines = [l for l in data if calculate_syntax_error_score(l) == 0]
 
     incomplete_scores = sorted(
         [calculate_incomplete_score(l) for l in incomplete_lines]
     )
     index = (len(incomplete_scores) - 1) / 2
-    result = incomplete_scores[int(index)]
+    return incomplete_scores[int(index)]
+
+
+ANSWERS = (464991, 3662008566)
+
+
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    result = solve_part1(data)
+    print(result)
+    assert result == ANSWERS[0]
+
+    # Part 2
+    result = solve_part2(data)
     print(result)
-    assert result == 3662008566
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
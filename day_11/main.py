@@ -13,93 +13,130 @@
     You should have received a copy of the GNU General Public License
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-from typing import List
-from typing import Tuple
+import os
+from aoc import counters
+from aoc.backends import dispatch
+from aoc.backends import np
+from aoc.grid import Grid
 
-from dataclasses import dataclass
+# Grids with at least this many octopuses are stepped with NumPy when it is installed, see aoc.backends
+NUMPY_THRESHOLD = 2500
 
+# Octopus energy levels with a border of BORDER. An octopus has flashed during a step when its energy is above 9.
+EnergyGrid = Grid
 
-@dataclass
-class DumboOctopus:
-    energy: int
-    has_flashed: bool = False
+# Never reached by an octopus, energy levels are reset to 0 every step
+BORDER = 255
 
 
-def read_input(filename: str) -> List[List[DumboOctopus]]:
-    with open(filename) as f:
-        lines = f.readlines()
-    result = []
-    for line in lines:
-        result.append([DumboOctopus(int(v)) for v in line.strip()])
+def read_input(filename: str) -> EnergyGrid:
+    return Grid.from_digits(filename, fill=BORDER)
 
-    return result
 
+def perform_octopus_flash(data: EnergyGrid, index: int):
+    cells = data.cells
+    offsets = data.offsets8
 
-def get_adjacent_coordinates(data, x, y) -> List[Tuple[int, int]]:
-    adjacent_coordinates = []
+    flashing = [index]
+    while flashing:
+        if counters.enabled:
+            counters.add('flashes')
 
-    for y_offset in [-1, 0, 1]:
-        for x_offset in [-1, 0, 1]:
-            adj_x = x + x_offset
-            adj_y = y + y_offset
-            if 0 <= adj_x < len(data[0]) and 0 <= adj_y < len(data):
-                adjacent_coordinates.append((adj_x, adj_y))
+        i = flashing.pop()
+        for offset in offsets:
+            adjacent = i + offset
+            if cells[adjacent] == BORDER:
+                continue
 
-    return adjacent_coordinates
+            cells[adjacent] += 1
+            # Energy increases one at a time so the octopus flashes when it reaches 10
+            if cells[adjacent] == 10:
+                flashing.append(adjacent)
 
 
-def perform_octopus_flash(data: List[List[DumboOctopus]], x: int, y: int):
-    for x, y in get_adjacent_coordinates(data, x, y):
-        oct = data[y][x]
-        oct.energy += 1
-        if not oct.has_flashed and oct.energy > 9:
-            oct.has_flashed = True
-            perform_octopus_flash(data, x, y)
+def perform_cycle_numpy(data: EnergyGrid) -> int:
+    energy = data.to_numpy()
+    energy += 1
 
+    flashed = np.zeros(energy.shape, dtype=bool)
+    flashing = energy > 9
+    while flashing.any():
+        flashed |= flashing
 
-def perform_cycle(data: List[List[DumboOctopus]]) -> int:
-    for y, row in enumerate(data):
-        for x, oct in enumerate(row):
-            oct.energy += 1
-            if not oct.has_flashed and oct.energy > 9:
-                oct.has_flashed = True
-                perform_octopus_flash(data, x, y)
+        # Each flashing octopus increases the energy of its neighbors, i.e. sum the shifted flashing masks
+        padded = np.pad(flashing, 1).astype(np.uint8)
+        height, width = energy.shape
+        for y_offset in (0, 1, 2):
+            for x_offset in (0, 1, 2):
+                if y_offset != 1 or x_offset != 1:
+                    energy += padded[y_offset : y_offset + height, x_offset : x_offset + width]
+
+        flashing = (energy > 9) & ~flashed
+
+    flash_count = int(flashed.sum())
+    if counters.enabled:
+        counters.add('flashes', flash_count)
+
+    energy[flashed] = 0
+    return flash_count
+
+
+@dispatch(perform_cycle_numpy, len, NUMPY_THRESHOLD)
+def perform_cycle(data: EnergyGrid) -> int:
+    cells = data.cells
+
+    for i in data.indices():
+        cells[i] += 1
+        if cells[i] == 10:
+            perform_octopus_flash(data, i)
 
     # Reset values higher than 9 and count flashes
     flash_count = 0
-    for y, row in enumerate(data):
-        for x, oct in enumerate(row):
-            if oct.energy > 9:
-                oct.energy = 0
-                oct.has_flashed = False
-                flash_count += 1
-            else:
-                assert not oct.has_flashed
+    for i in data.indices():
+        if cells[i] > 9:
+            cells[i] = 0
+            flash_count += 1
 
     return flash_count
 
 
-def main():
-    # Part 1
-    data = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> EnergyGrid:
+    return read_input(filename)
 
-    flash_count = sum([perform_cycle(data) for _ in range(100)])
-    print(flash_count)
-    assert flash_count == 1644
 
-    # Part 2
-    data = read_input('input.txt')  # reset data
-    total_oct_count = len(data) * len(data[0])
+def solve_part1(data: EnergyGrid) -> int:
+    data = data.copy()  # perform_cycle mutates the energy levels
+
+    return sum([perform_cycle(data) for _ in range(100)])
+
+
+def solve_part2(data: EnergyGrid) -> int:
+    data = data.copy()
+    total_oct_count = len(data)
 
     step_count = 0
     while True:
         step_count += 1
         flash_count = perform_cycle(data)
         if flash_count == total_oct_count:
-            print(step_count)
-            break
+            return step_count
+
 
-    assert step_count == 229
+ANSWERS = (1644, 229)
+
+
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    flash_count = solve_part1(data)
+    print(flash_count)
+    assert flash_count == ANSWERS[0]
+
+    # Part 2
+    step_count = solve_part2(data)
+    print(step_count)
+    assert step_count == ANSWERS[1]
 
 
 if __name__ == '__main__':
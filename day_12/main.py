@@ -17,9 +17,11 @@ from typing import Dict
 from typing import List
 from typing import Tuple
 
-from collections import Counter
+import os
 from collections import defaultdict
 
+from aoc.memo import memoize
+
 
 def read_input(filename: str) -> List[Tuple[str, str]]:
     with open(filename) as f:
@@ -42,69 +44,71 @@ def map_list_to_dict(data: List[Tuple[str, str]]) -> Dict[str, List[str]]:
     return result
 
 
-def visit_cave(path: List[str], map_map: Dict[str, List[str]]):
-    result = []
-    current_cave = path[-1]
-    if current_cave == 'end':
-        result.append(path)
-        return result
+# Bound of the memoized path counts, see aoc.memo
+MEMO_SIZE = 1 << 16
 
-    for next_cave in map_map[current_cave]:
-        if next_cave.islower() and next_cave in path:
-            continue
 
-        path_prim = path.copy()
-        path_prim.append(next_cave)
-        result.extend(visit_cave(path_prim, map_map))
+def count_paths(map_map: Dict[str, List[str]], allow_twice: bool) -> int:
+    """Count the paths from start to end that visit small caves at most once, or a single one twice if allow_twice.
 
-    return result
+    The number of paths onwards from a cave only depends on the cave, the small caves visited so far and whether one
+    was visited twice already, so it is memoized on those with the visited caves packed into a bit mask.
+    """
+    caves = sorted(set(map_map) | {cave for adjacent in map_map.values() for cave in adjacent})
+    index = {cave: i for i, cave in enumerate(caves)}
+    neighbors = [[index[adjacent] for adjacent in map_map.get(cave, [])] for cave in caves]
+    small = [cave.islower() for cave in caves]
+    end = index['end']
+    bits = len(caves).bit_length()
 
+    @memoize('paths', MEMO_SIZE, key=lambda cave, visited, twice: (visited << 1 | twice) << bits | cave)
+    def count_paths_from(cave: int, visited: int, twice: bool) -> int:
+        if cave == end:
+            return 1
 
-def have_visited_small_cave_twice(path: List[str]) -> bool:
-    for v, c in Counter(path).items():
-        if v.islower() and c == 2:
-            return True
+        count = 0
+        for next_cave in neighbors[cave]:
+            mask = 1 << next_cave
+            if not small[next_cave]:
+                count += count_paths_from(next_cave, visited, twice)
+            elif not visited & mask:
+                count += count_paths_from(next_cave, visited | mask, twice)
+            elif not twice:
+                count += count_paths_from(next_cave, visited, True)
 
-    return False
+        return count
 
+    start = index['start']
+    return count_paths_from(start, 1 << start, not allow_twice)
 
-def visit_cave_v2(path: List[str], map_map: Dict[str, List[str]]):
-    result = []
-    current_cave = path[-1]
-    if current_cave == 'end':
-        result.append(path)
-        return result
-
-    for next_cave in map_map[current_cave]:
-        if (
-            next_cave.islower()
-            and next_cave in path
-            and have_visited_small_cave_twice(path)
-        ):
-            continue
-
-        path_prim = path.copy()
-        path_prim.append(next_cave)
-        result.extend(visit_cave_v2(path_prim, map_map))
 
-    return result
+def parse(filename: str = 'input.txt') -> Dict[str, List[str]]:
+    return map_list_to_dict(read_input(filename))
+
+
+def solve_part1(d: Dict[str, List[str]]) -> int:
+    return count_paths(d, allow_twice=False)
+
+
+def solve_part2(d: Dict[str, List[str]]) -> int:
+    return count_paths(d, allow_twice=True)
+
+
+ANSWERS = (5333, 146553)
 
 
 def main():
-    # Part 1
-    data = read_input('input.txt')
-    d = map_list_to_dict(data)
+    d = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
 
-    paths = visit_cave(['start'], d)
-    result = len(paths)
+    # Part 1
+    result = solve_part1(d)
     print(result)
-    assert result == 5333
+    assert result == ANSWERS[0]
 
     # Part 2
-    paths_v2 = visit_cave_v2(['start'], d)
-    result = len(paths_v2)
+    result = solve_part2(d)
     print(result)
-    assert result == 146553
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
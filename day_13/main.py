@@ -13,9 +13,13 @@
     You should have received a copy of the GNU General Public License
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from typing import Iterable
 from typing import List
 from typing import Tuple
 
+import os
+from aoc.bitset import PointSet
+
 
 def read_input(filename: str) -> Tuple[List[Tuple[int, int]], List[Tuple[str, int]]]:
     with open(filename) as f:
@@ -42,7 +46,7 @@ def read_input(filename: str) -> Tuple[List[Tuple[int, int]], List[Tuple[str, in
     return coordinates, folds
 
 
-def get_dimensions(coordinates: List[Tuple[int, int]]) -> Tuple[int, int]:
+def get_dimensions(coordinates: Iterable[Tuple[int, int]]) -> Tuple[int, int]:
     max_x = 0
     max_y = 0
     for x, y in coordinates:
@@ -52,7 +56,7 @@ def get_dimensions(coordinates: List[Tuple[int, int]]) -> Tuple[int, int]:
     return max_x + 1, max_y + 1
 
 
-def coordinates_to_map_str(coordinates: List[Tuple[int, int]]) -> str:
+def coordinates_to_map_str(coordinates: PointSet) -> str:
     width, height = get_dimensions(coordinates)
 
     lines = []
@@ -67,58 +71,60 @@ def coordinates_to_map_str(coordinates: List[Tuple[int, int]]) -> str:
     return '\n'.join(lines)
 
 
-def perform_fold(
-    coordinates: List[Tuple[int, int]], axis: str, fold_value: int
-) -> List[Tuple[int, int]]:
-    result = set()
-    for x, y in coordinates:
-        value = x if axis == 'x' else y
-        if value == fold_value:
-            continue  # discard
-        elif value < fold_value:
-            result.add((x, y))
-        else:
-            value = fold_value - (value - fold_value)
+def perform_fold(coordinates: PointSet, axis: str, fold_value: int) -> PointSet:
+    return coordinates.fold(0 if axis == 'x' else 1, fold_value)
 
-            if axis == 'x':
-                result.add((value, y))
-            else:
-                result.add((x, value))
 
-    return list(result)
+Instructions = Tuple[List[Tuple[int, int]], List[Tuple[str, int]]]
 
 
-def main():
-    # Part 1
-    coordinates, folds = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> Instructions:
+    return read_input(filename)
 
-    new_list = None
-    for axis, value in folds:
-        new_list = perform_fold(coordinates, axis, value)
-        break
 
-    coordinate_count = len(new_list)
+def solve_part1(data: Instructions) -> int:
+    coordinates, folds = data
 
-    print(coordinate_count)
-    assert coordinate_count == 621
+    axis, value = folds[0]
+    points = perform_fold(PointSet.from_points(coordinates), axis, value)
 
-    # Part 2
-    new_list = coordinates
+    return len(points)
+
+
+def solve_part2(data: Instructions) -> str:
+    coordinates, folds = data
+
+    points = PointSet.from_points(coordinates)
     for axis, value in folds:
-        new_list = perform_fold(new_list, axis, value)
+        points = perform_fold(points, axis, value)
+
+    return coordinates_to_map_str(points)
 
-    result = coordinates_to_map_str(new_list)
-    print(result)
 
+ANSWERS = (
+    621,
     # HKUJGAJZ
-    assert (
-        result == '#..#.#..#.#..#...##..##...##....##.####\n'
-        '#..#.#.#..#..#....#.#..#.#..#....#....#\n'
-        '####.##...#..#....#.#....#..#....#...#.\n'
-        '#..#.#.#..#..#....#.#.##.####....#..#..\n'
-        '#..#.#.#..#..#.#..#.#..#.#..#.#..#.#...\n'
-        '#..#.#..#..##...##...###.#..#..##..####'
-    )
+    '#..#.#..#.#..#...##..##...##....##.####\n'
+    '#..#.#.#..#..#....#.#..#.#..#....#....#\n'
+    '####.##...#..#....#.#....#..#....#...#.\n'
+    '#..#.#.#..#..#....#.#.##.####....#..#..\n'
+    '#..#.#.#..#..#.#..#.#..#.#..#.#..#.#...\n'
+    '#..#.#..#..##...##...###.#..#..##..####',
+)
+
+
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    coordinate_count = solve_part1(data)
+    print(coordinate_count)
+    assert coordinate_count == ANSWERS[0]
+
+    # Part 2
+    result = solve_part2(data)
+    print(result)
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
@@ -16,8 +16,10 @@
 from typing import Dict
 from typing import Tuple
 
+import os
 from collections import Counter
-from collections import defaultdict
+
+from aoc.memo import memoize
 
 
 def read_input(filename: str) -> Tuple[str, Dict[str, str]]:
@@ -34,81 +36,71 @@ def read_input(filename: str) -> Tuple[str, Dict[str, str]]:
     return polymer, result
 
 
-def perform_cycle(data, polymer_table: Dict[str, str]):
-    result = []
-    for index, part in enumerate(data):
-        result.append(part)
-        polymer = data[index : index + 2]
-        if len(polymer) != 2:
-            break
-        result.append(polymer_table[polymer])
-    return ''.join(result)
+# Bound of the memoized element counts, see aoc.memo
+MEMO_SIZE = 1 << 16
 
 
-def data_to_dict(data: str) -> Dict[str, int]:
-    result = defaultdict(int)
-    for index, part in enumerate(data):
-        polymer = data[index : index + 2]
-        if len(polymer) != 2:
-            break
-        result[polymer] += 1
-    return result
+def count_elements(polymer: str, polymer_table: Dict[str, str], steps: int) -> Counter:
+    """Count the elements of the polymer after the steps without building it.
 
+    The elements inserted between the two elements of a pair only depend on the pair and the number of steps, so they
+    are memoized on those.
+    """
 
-def perform_cycle_dict(data: Dict[str, int], polymer_table: Dict[str, str]):
-    r = defaultdict(int)
-    for polymer, count in data.items():
-        a, b = polymer
-        insertion_element = polymer_table[polymer]
+    @memoize('insertions', MEMO_SIZE)
+    def count_insertions(pair: str, steps: int) -> Counter:
+        if steps == 0:
+            return Counter()
 
-        r[a + insertion_element] += count
-        r[insertion_element + b] += count
+        inserted = polymer_table[pair]
+        result = Counter(inserted)
+        result.update(count_insertions(pair[0] + inserted, steps - 1))
+        result.update(count_insertions(inserted + pair[1], steps - 1))
+        return result
 
-    return r
+    counts = Counter(polymer)
+    for a, b in zip(polymer, polymer[1:]):
+        counts.update(count_insertions(a + b, steps))
+    return counts
 
 
-def perform_count(data_dict: Dict[str, int]):
-    r = defaultdict(int)
-    for polymer, count in data_dict.items():
-        a, _ = polymer
-        r[a] += count
-    return r
+def get_most_minus_least_common(data: Tuple[str, Dict[str, str]], steps: int) -> int:
+    polymer, polymer_table = data
 
+    c = count_elements(polymer, polymer_table, steps).most_common()
+    _, most_common_count = c[0]
+    _, least_common_count = c[-1]
 
-def main():
-    # Part 1
-    data, polymer_table = read_input('input.txt')
+    return most_common_count - least_common_count
 
-    new_polymer = data
-    for i in range(10):
-        new_polymer = perform_cycle(new_polymer, polymer_table)
 
-    c = Counter(new_polymer)
-    _, most_common_count = c.most_common()[0]
-    _, least_common_count = c.most_common()[-1]
+def parse(filename: str = 'input.txt') -> Tuple[str, Dict[str, str]]:
+    return read_input(filename)
 
-    result = most_common_count - least_common_count
-    print(result)
-    assert result == 3555
 
-    # Part 2
-    d = data_to_dict(data)
-    r = d
-    for i in range(40):
-        r = perform_cycle_dict(r, polymer_table)
+def solve_part1(data: Tuple[str, Dict[str, str]]) -> int:
+    return get_most_minus_least_common(data, 10)
+
+
+def solve_part2(data: Tuple[str, Dict[str, str]]) -> int:
+    return get_most_minus_least_common(data, 40)
 
-    count = perform_count(r)
 
-    # The last element is not included in the count
-    count[data[-1]] += 1
+ANSWERS = (3555, 4439442043739)
 
-    c = Counter(count)
-    _, most_common_count = c.most_common()[0]
-    _, least_common_count = c.most_common()[-1]
 
-    result = most_common_count - least_common_count
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    result = solve_part1(data)
+    print(result)
+    assert result == ANSWERS[0]
+
+    # Part 2
+    result = solve_part2(data)
     print(result)
-    assert result == 4439442043739
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
@@ -13,107 +13,120 @@
     You should have received a copy of the GNU General Public License
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-from typing import List
-from typing import Tuple
+import hashlib
+import os
+from array import array
 
 from dijkstra import Graph
 from dijkstra import DijkstraSPF
 
+from aoc import intermediates
+from aoc.grid import Grid
 
-def read_input(filename: str) -> List[List[int]]:
-    with open(filename) as f:
-        lines = f.readlines()
+# Risk levels with a border of 0s, the graph nodes are the flat indices of the grid
+RiskMap = Grid
 
-    result = []
-    for line in lines:
-        result.append([int(r) for r in line.strip()])
-
-    return result
 
+def read_input(filename: str) -> RiskMap:
+    return Grid.from_digits(filename)
 
-def get_adjacent_coordinates(data, x, y) -> List[Tuple[int, int]]:
-    r = []
-    for y_offset in [-1, 0, 1]:
-        for x_offset in [-1, 0, 1]:
-            if abs(y_offset) == abs(x_offset):
-                continue
 
-            adj_x = x + x_offset
-            adj_y = y + y_offset
-            if 0 <= adj_x < len(data[0]) and 0 <= adj_y < len(data):
-                r.append((adj_x, adj_y))
-    return r
+def populate_graph(graph: Graph, data: RiskMap):
+    cells = data.cells
+    offsets = data.offsets4
+    for i in data.indices():
+        for offset in offsets:
+            adjacent = i + offset
+            # Risk levels are at least 1, so 0 is the border
+            if cells[adjacent]:
+                graph.add_edge(i, adjacent, cells[adjacent])
 
 
-def populate_graph(graph: Graph, data: List[List[int]]):
-    for y, row in enumerate(data):
-        for x, value in enumerate(row):
-            for x_adj, y_adj in get_adjacent_coordinates(data, x, y):
-                graph.add_edge((x, y), (x_adj, y_adj), data[y_adj][x_adj])
-
+def extend_graph(data: RiskMap, dup_x: int, dup_y: int) -> RiskMap:
+    width = data.width
+    height = data.height
 
-def extend_graph(data: List[List[int]], dup_x: int, dup_y: int) -> List[List[int]]:
-    width = len(data[0])
-    height = len(data)
-
-    result = [
-        [data[y % height][x % width] for x in range(width * dup_x)]
-        for y in range(height * dup_y)
-    ]
-
-    for y, row in enumerate(result):
-        for x, value in enumerate(row):
+    result = Grid(width * dup_x, height * dup_y, padding=data.padding)
+    for y in range(result.height):
+        for x in range(result.width):
             x_offset = x // width
             y_offset = y // height
 
-            weight = (value + x_offset + y_offset - 1) % 9 + 1
+            weight = (data[x % width, y % height] + x_offset + y_offset - 1) % 9 + 1
 
-            result[y][x] = weight
+            result[x, y] = weight
 
     return result
 
 
-def print_path(data, path):
-    for y, row in enumerate(data):
+def print_path(data: RiskMap, path):
+    path = set(path)
+    for y, row in enumerate(data.rows()):
         for x, value in enumerate(row):
-            if (x, y) in path:
-
+            if data.index(x, y) in path:
                 print(f'\033[94m{value}\033[0m', end='')
             else:
                 print(f'{value}', end='')
         print()
 
 
-def main():
-    # Part 1
-    data = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> RiskMap:
+    return read_input(filename)
+
+
+# Bump when the distance field changes, it is cached by aoc.intermediates
+DISTANCES_VERSION = 1
+
+
+def get_shortest_distances(data: RiskMap) -> array:
+    """Lowest total risk from the top left to every position, by flat index with -1 for the padding."""
+    h = hashlib.sha256(f'{data.width}x{data.height}x{data.padding}'.encode())
+    h.update(data.cells.tobytes())
+    hit, distances = intermediates.load('day_15-distances', DISTANCES_VERSION, h.hexdigest())
+    if hit:
+        return distances
 
     g = Graph()
     populate_graph(g, data)
 
-    dijkstra = DijkstraSPF(g, (0, 0))
+    dijkstra = DijkstraSPF(g, data.index(0, 0))
 
-    end_position = (len(data[0]) - 1, len(data) - 1)
-    result = dijkstra.get_distance(end_position)
+    # print_path(data, dijkstra.get_path(data.index(data.width - 1, data.height - 1)))
+    distances = array('q', [-1]) * len(data.cells)
+    for i in data.indices():
+        distances[i] = dijkstra.get_distance(i)
 
-    # print_path(data, dijkstra.get_path(end_position))
-    print(result)
-    assert result == 487
+    intermediates.save('day_15-distances', DISTANCES_VERSION, h.hexdigest(), distances)
+    return distances
 
-    # Part 2
-    data_2 = extend_graph(data, 5, 5)
 
-    g = Graph()
-    populate_graph(g, data_2)
+def get_lowest_total_risk(data: RiskMap) -> int:
+    return get_shortest_distances(data)[data.index(data.width - 1, data.height - 1)]
+
+
+def solve_part1(data: RiskMap) -> int:
+    return get_lowest_total_risk(data)
+
+
+def solve_part2(data: RiskMap) -> int:
+    return get_lowest_total_risk(extend_graph(data, 5, 5))
 
-    dijkstra = DijkstraSPF(g, (0, 0))
 
-    end_position_2 = (len(data_2[0]) - 1, len(data_2) - 1)
-    result = dijkstra.get_distance(end_position_2)
+ANSWERS = (487, 2821)
 
-    # print_path(data_2, dijkstra.get_path(end_position_2))
+
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    result = solve_part1(data)
+    print(result)
+    assert result == ANSWERS[0]
+
+    # Part 2
+    result = solve_part2(data)
     print(result)
-    assert result == 2821
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
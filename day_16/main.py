@@ -16,6 +16,8 @@
 from typing import Optional
 from typing import Iterable
 
+import os
+
 from dataclasses import dataclass
 from io import StringIO
 
@@ -95,6 +97,28 @@ def parse_packet(
         return f(values)
 
 
+# Bump when the parsed representation changes, parsed inputs are cached by aoc.cache
+PARSER_VERSION = 1
+
+
+def parse(filename: str = 'input.txt') -> str:
+    return read_input(filename)
+
+
+def solve_part1(data: str) -> int:
+    packet_statistics = PacketStatistics()
+    parse_packet(StringIO(data), packet_statistics)
+
+    return packet_statistics.packet_version_sum
+
+
+def solve_part2(data: str) -> int:
+    return parse_packet(StringIO(data))
+
+
+ANSWERS = (897, 9485076995911)
+
+
 def main():
     examples = [
         ('C200B40A82', 3),
@@ -111,17 +135,17 @@ def main():
         result = parse_packet(StringIO(parse_hex(data)))
         assert solution == result
 
-    # Part 1 & 2
-    data = read_input('input.txt')
-
-    packet_statistics = PacketStatistics()
-    result = parse_packet(StringIO(data), packet_statistics)
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
 
-    print(packet_statistics.packet_version_sum)
-    assert packet_statistics.packet_version_sum == 897
+    # Part 1
+    result = solve_part1(data)
+    print(result)
+    assert result == ANSWERS[0]
 
+    # Part 2
+    result = solve_part2(data)
     print(result)
-    assert result == 9485076995911
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
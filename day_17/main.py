@@ -13,14 +13,16 @@
     You should have received a copy of the GNU General Public License
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-from dataclasses import dataclass
-import re
+from typing import List
 
+import os
+import re
+from dataclasses import dataclass
+from itertools import compress
 
-@dataclass
-class Point:
-    x: int
-    y: int
+from aoc.geometry import Point
+from aoc.memo import memoize_last
+from aoc.parallel import parallel_map
 
 
 @dataclass
@@ -35,6 +37,25 @@ class ProbeStatistics:
     max_altitude: int = 0
 
 
+@dataclass
+class Probes:
+    """Struct of arrays of the probes in flight, probe i is at (x[i], y[i]) with velocity (vx[i], vy[i])."""
+
+    x: List[int]
+    y: List[int]
+    vx: List[int]
+    vy: List[int]
+    max_altitude: List[int]
+
+    def select(self, selectors: List[bool]) -> 'Probes':
+        return Probes(
+            *[
+                list(compress(values, selectors))
+                for values in (self.x, self.y, self.vx, self.vy, self.max_altitude)
+            ]
+        )
+
+
 def read_input(filename: str) -> Area:
     with open(filename) as f:
         lines = f.readlines()
@@ -51,67 +72,104 @@ def read_input(filename: str) -> Area:
     return Area(Point(x1, y1), Point(x2, y2))
 
 
-def is_in_area(position: Point, area: Area) -> bool:
-    return (
-        area.start.x <= position.x <= area.end.x
-        and area.start.y <= position.y <= area.end.y
+def perform_step(probes: Probes) -> Probes:
+    x = [x + vx for x, vx in zip(probes.x, probes.vx)]
+    y = [y + vy for y, vy in zip(probes.y, probes.vy)]
+    return Probes(
+        x,
+        y,
+        [vx - 1 if vx > 0 else vx + 1 if vx < 0 else 0 for vx in probes.vx],
+        [vy - 1 for vy in probes.vy],
+        [a if a > y else y for a, y in zip(probes.max_altitude, y)],
     )
 
 
-def perform_step(position: Point, velocity: Point):
-    position.x += velocity.x
-    position.y += velocity.y
+# The probes are launched in batches of this many y velocities, each with every x velocity
+VY_BATCH_SIZE = 16
 
-    if velocity.x > 0:
-        velocity.x -= 1
-    elif velocity.x < 0:
-        velocity.x += 1
 
-    velocity.y -= 1
+def combine_statistics(s1: ProbeStatistics, s2: ProbeStatistics) -> ProbeStatistics:
+    return ProbeStatistics(s1.hit_counter + s2.hit_counter, max(s1.max_altitude, s2.max_altitude))
 
 
-def hits_target(velocity: Point, target: Area, statistics: ProbeStatistics) -> bool:
-    position = Point(0, 0)
-    max_altitude = 0
+def launch_probe_batch(vy_range: range, target_area: Area) -> ProbeStatistics:
+    # An x velocity of zero or lower will never reach the target since the x velocity cannot increase past zero
+    # therefore it is set to 1. The maximum velocity was arbitrarily chosen.
+    vx_range = range(1, 300)
 
-    while True:
-        perform_step(position, velocity)
+    count = len(vx_range) * len(vy_range)
+    probes = Probes(
+        [0] * count,
+        [0] * count,
+        list(vx_range) * len(vy_range),
+        [vy for vy in vy_range for _ in vx_range],
+        [0] * count,
+    )
 
-        max_altitude = max(max_altitude, position.y)
+    x1, y1 = target_area.start
+    x2, y2 = target_area.end
 
-        if is_in_area(position, target):
-            statistics.hit_counter += 1
-            statistics.max_altitude = max(statistics.max_altitude, max_altitude)
-            return True
+    # All probes take a step at once, then the ones that hit the target or never can are removed
+    stats = ProbeStatistics()
+    while probes.x:
+        probes = perform_step(probes)
+
+        hits = [x1 <= x <= x2 and y1 <= y <= y2 for x, y in zip(probes.x, probes.y)]
+        stats.hit_counter += sum(hits)
+        stats.max_altitude = max(
+            stats.max_altitude, *compress(probes.max_altitude, hits), 0
+        )
+
+        # If y is negative and if we are past the end y coordinate, or past the end x coordinate (the x velocity is
+        # never negative), we can never reach the target
+        probes = probes.select(
+            [
+                not hit and x <= x2 and (vy > 0 or y >= y1)
+                for hit, x, y, vy in zip(hits, probes.x, probes.y, probes.vy)
+            ]
+        )
+
+    return stats
+
+
+# Both parts read the statistics of the same launch, so it runs once per parsed input
+@memoize_last('launches')
+def launch_probes(target_area: Area) -> ProbeStatistics:
+    # A y velocity lower than the minimum the y start position will shoot past the target area after one step. The
+    # maximum y velocity was arbitrarily chosen.
+    vy_range = range(target_area.start.y, 300)
 
-        # If y is negative and if we are past the end y coordinate we can never reach the target
-        if velocity.y <= 0 and position.y < target.start.y:
-            return False
+    # The batches are independent, so they are launched across worker processes
+    batches = [vy_range[i : i + VY_BATCH_SIZE] for i in range(0, len(vy_range), VY_BATCH_SIZE)]
+    return parallel_map(launch_probe_batch, batches, combine_statistics, data=target_area)
 
 
-def main():
-    # Part 1 & 2
-    target_area = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> Area:
+    return read_input(filename)
 
-    # An x velocity of zero or lower will never reach the target since the x velocity cannot increase past zero
-    # therefore it is set to 1. The maximum velocity was arbitrarily chosen.
-    vx_range = range(1, 300)
 
-    # A y velocity lower than the minimum the y start position will shoot past the target area after one step. The
-    # maximum y velocity was arbitrarily chosen.
-    vy_range = range(target_area.start.y, 300)
+def solve_part1(target_area: Area) -> int:
+    return launch_probes(target_area).max_altitude
 
-    stats = ProbeStatistics()
-    for y in vy_range:
-        for x in vx_range:
-            velocity = Point(x, y)
-            hits_target(velocity, target_area, stats)
+
+def solve_part2(target_area: Area) -> int:
+    return launch_probes(target_area).hit_counter
+
+
+ANSWERS = (6555, 4973)
+
+
+def main():
+    target_area = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1 & 2
+    stats = launch_probes(target_area)
 
     print(stats.max_altitude)
-    assert stats.max_altitude == 6555
+    assert stats.max_altitude == ANSWERS[0]
 
     print(stats.hit_counter)
-    assert stats.hit_counter == 4973
+    assert stats.hit_counter == ANSWERS[1]
 
 
 if __name__ == '__main__':
@@ -16,10 +16,15 @@
 from typing import Optional
 from typing import List
 
+import os
 from dataclasses import dataclass
 from math import ceil
 from math import floor
 
+from aoc import counters
+from aoc import intermediates
+from aoc.parallel import parallel_map
+
 
 def read_input(filename: str) -> List[str]:
     with open(filename) as f:
@@ -30,6 +35,8 @@ def read_input(filename: str) -> List[str]:
 
 @dataclass
 class _SnailfishValue:
+    __slots__ = ('value', 'nest_level')
+
     value: int
     nest_level: int
 
@@ -112,6 +119,8 @@ class SnailfishNumber:
     def __add__(self, other: 'SnailfishNumber') -> 'SnailfishNumber':
         new_nbr = SnailfishNumber()
         new_nbr.flattened = self.flattened + other.flattened
+        if counters.enabled:
+            counters.add('additions')
 
         for v in new_nbr.flattened:
             v.nest_level += 1
@@ -126,11 +135,15 @@ class SnailfishNumber:
 
                 self._explosivo(new_nbr.flattened, index)
                 performed_operations_count += 1
+                if counters.enabled:
+                    counters.add('explosions')
 
             index = self._find_value_to_split(new_nbr.flattened)
             if index is not None:
                 self._split(new_nbr.flattened, index)
                 performed_operations_count += 1
+                if counters.enabled:
+                    counters.add('splits')
 
         return new_nbr
 
@@ -151,25 +164,65 @@ class SnailfishNumber:
         return flat_copy[0].value
 
 
-def main():
-    # Part 1
-    terms = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> List[str]:
+    return read_input(filename)
 
-    s = sum([SnailfishNumber(term) for term in terms[1:]], SnailfishNumber(terms[0]))
 
-    result = s.magnitude()
-    print(result)
-    assert result == 4457
+# Bump when the cached sums or magnitudes change, they are cached by aoc.intermediates
+SUMS_VERSION = 1
 
-    # Part 2
+
+def solve_part1(terms: List[str]) -> int:
+    # The sum of a prefix of the terms is reduced already, resume from that of the longest cached prefix
+    n, s, digests = intermediates.resume('day_18-sum', SUMS_VERSION, terms)
+    if s is None:
+        n, s = 1, SnailfishNumber(terms[0])
+    s = sum([SnailfishNumber(term) for term in terms[n:]], s)
+    if n < len(terms):
+        intermediates.checkpoint('day_18-sum', SUMS_VERSION, digests, s)
+
+    return s.magnitude()
+
+
+def _largest_magnitude_with(i: int, terms: List[str]) -> int:
+    """Largest magnitude of the sums of term i with itself and with each term before it, in both orders."""
     magnitudes = []
-    for t1 in terms:
-        for t2 in terms:
-            magnitudes.append((SnailfishNumber(t1) + SnailfishNumber(t2)).magnitude())
+    for j in range(i + 1):
+        t1, t2 = terms[i], terms[j]
+        magnitudes.append((SnailfishNumber(t1) + SnailfishNumber(t2)).magnitude())
+        if i != j:
+            magnitudes.append((SnailfishNumber(t2) + SnailfishNumber(t1)).magnitude())
+
+    return max(magnitudes)
+
 
-    result = max(magnitudes)
+def solve_part2(terms: List[str]) -> int:
+    # Resume from the largest magnitude of the pairs within the longest cached prefix, only the pairs with a later
+    # term are added up, across worker processes
+    n, largest, digests = intermediates.resume('day_18-pairs', SUMS_VERSION, terms)
+    if n < len(terms):
+        later = parallel_map(_largest_magnitude_with, range(n, len(terms)), max, data=terms)
+        largest = later if largest is None else max(largest, later)
+        intermediates.checkpoint('day_18-pairs', SUMS_VERSION, digests, largest)
+
+    return largest
+
+
+ANSWERS = (4457, 4784)
+
+
+def main():
+    terms = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    result = solve_part1(terms)
+    print(result)
+    assert result == ANSWERS[0]
+
+    # Part 2
+    result = solve_part2(terms)
     print(result)
-    assert result == 4784
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
@@ -18,15 +18,23 @@ from typing import List
 from typing import Optional
 from typing import Tuple
 
+import operator
+import os
 import re
 from collections import Counter
 from collections import defaultdict
 from dataclasses import dataclass
-from math import cos
-from math import sin
-from math import radians
 
-Vector = Tuple[int, int, int]
+from aoc import counters
+from aoc import intermediates
+from aoc.geometry import Vector
+from aoc.geometry import Vectors
+from aoc.geometry import add
+from aoc.geometry import manhattan_distance
+from aoc.geometry import rotate
+from aoc.geometry import rotation_matrix
+from aoc.memo import memoize_last
+from aoc.parallel import SharedPool
 
 
 @dataclass(frozen=True)
@@ -59,49 +67,8 @@ def read_input(filename: str) -> Dict[int, List[Vector]]:
     return scanners
 
 
-def vector_add(v1: Vector, v2: Vector) -> Vector:
-    return v1[0] + v2[0], v1[1] + v2[1], v1[2] + v2[2]
-
-
-def vector_subtract(v1: Vector, v2: Vector) -> Vector:
-    return v1[0] - v2[0], v1[1] - v2[1], v1[2] - v2[2]
-
-
 def vector_rotate(v: Vector, rotation_vector: Vector) -> Vector:
-    x_degrees, y_degrees, z_degrees = rotation_vector
-
-    if x_degrees:
-        x, y, z = v
-        theta = radians(x_degrees)
-        v = (
-            round(x * cos(theta) - y * sin(theta)),
-            round(x * sin(theta) + y * cos(theta)),
-            z,
-        )
-
-    if y_degrees:
-        x, y, z = v
-        theta = radians(y_degrees)
-        v = (
-            round(x * cos(theta) + z * sin(theta)),
-            y,
-            round(-x * sin(theta) + z * cos(theta)),
-        )
-
-    if z_degrees:
-        x, y, z = v
-        theta = radians(z_degrees)
-        v = (
-            x,
-            round(y * cos(theta) - z * sin(theta)),
-            round(y * sin(theta) + z * cos(theta)),
-        )
-
-    return v
-
-
-def vector_manhattan_distance(v1: Vector, v2: Vector):
-    return sum([abs(a - b) for a, b in zip(v1, v2)])
+    return rotate(v, rotation_matrix(rotation_vector))
 
 
 # List of all possible non overlapping rotation vectors
@@ -133,10 +100,10 @@ _possible_vector_rotations = [
 ]
 
 
-def all_vector_rotations(data: List[Vector]):
+def all_vector_rotations(data: Vectors):
     """Generate all possible vector rotation for the list."""
     for rotation_vector in _possible_vector_rotations:
-        yield rotation_vector, [vector_rotate(v, rotation_vector) for v in data]
+        yield rotation_vector, data.rotate(rotation_matrix(rotation_vector))
 
 
 def find_distance_by_common_readings(reference: List[Vector], other: List[Vector]):
@@ -144,12 +111,15 @@ def find_distance_by_common_readings(reference: List[Vector], other: List[Vector
     found_rotation_vector = None
     found_distance_diff = None
 
-    for rotation_vector, rotated_vector_list in all_vector_rotations(other):
-        total = []
-        for v1 in reference:
-            total.extend([vector_subtract(v1, v2) for v2 in rotated_vector_list])
+    reference_vectors = Vectors(reference)
+    for rotation_vector, rotated_vectors in all_vector_rotations(Vectors(other)):
+        differences = Counter(reference_vectors.differences(rotated_vectors))
+        if counters.enabled:
+            counters.add('rotation_attempts')
+            counters.add('counter_entries', len(differences))
+            counters.maximum('largest_counter', len(differences))
 
-        diff, count = Counter(total).most_common(1)[0]
+        diff, count = differences.most_common(1)[0]
         if count >= 12:
             assert not found_rotation_vector
             found_distance_diff = diff
@@ -158,34 +128,72 @@ def find_distance_by_common_readings(reference: List[Vector], other: List[Vector
     return found_rotation_vector, found_distance_diff
 
 
-def calculate_adjacent_sensors(reference, data) -> Dict[int, Tuple[Vector, Vector]]:
+# Bump when the alignments change, they are cached by aoc.intermediates
+ALIGNMENTS_VERSION = 1
+
+
+def _align(
+    pair: Tuple[int, int], readings: Dict[int, List[Vector]]
+) -> List[Tuple[int, Tuple[Optional[Vector], Optional[Vector]]]]:
+    reference, other = pair
+    return [(other, find_distance_by_common_readings(readings[reference], readings[other]))]
+
+
+def calculate_adjacent_sensors(
+    reference: int, data: Dict[int, List[Vector]], alignments: intermediates.Table, pool: SharedPool
+) -> Dict[int, Tuple[Vector, Vector]]:
+    """Align the sensors in data with the reference sensor, the pool shares the readings of all sensors.
+
+    The alignments only depend on the readings of the two sensors, so they are kept in a table shared by inputs. Those
+    that are not in it are independent of each other and found across the worker processes of the pool.
+    """
+    reference_digest = intermediates.digest(pool.data[reference])
+    keys = {n: (reference_digest, intermediates.digest(other)) for n, other in data.items()}
+
+    found = {}
+    for n, key in keys.items():
+        hit, alignment = alignments.get(key)
+        if hit:
+            found[n] = alignment
+
+    missing = [(reference, n) for n in keys if n not in found]
+    if missing:
+        for n, alignment in pool.map(_align, missing, operator.add):
+            found[n] = alignment
+            alignments.put(keys[n], alignment)
+
     result = {}
-    for sensor_number, other in data.items():
-        rotation_vector, distance_diff = find_distance_by_common_readings(
-            reference, other
-        )
+    for sensor_number in data:
+        rotation_vector, distance_diff = found[sensor_number]
         if rotation_vector:
             result[sensor_number] = (rotation_vector, distance_diff)
     return result
 
 
-def calculate_actual_distance_reference(distance: Vector, sensor: Sensor) -> Vector:
-    for d, r in zip(reversed(sensor.distance), reversed(sensor.rotation)):
-        distance = vector_rotate(distance, r)
-        distance = vector_add(distance, d)
-    return distance
-
-
 def calculate_actual_distance(distance: Vector, sensor: Sensor) -> Vector:
     for d, r in zip(reversed(sensor.distance[:-1]), reversed(sensor.rotation[:-1])):
-        distance = vector_rotate(distance, r)
-        distance = vector_add(distance, d)
+        distance = add(vector_rotate(distance, r), d)
     return distance
 
 
 def get_sensors(
-    data: Dict[int, List[Vector]], reference_sensor: Optional[Sensor] = None
+    data: Dict[int, List[Vector]],
+    reference_sensor: Optional[Sensor] = None,
+    alignments: Optional[intermediates.Table] = None,
+    pool: Optional[SharedPool] = None,
 ) -> Dict[int, Sensor]:
+    if alignments is None or pool is None:
+        # The outermost call shares its alignment table and the readings of all sensors with the recursive ones
+        readings = dict(data)
+        if reference_sensor is not None:
+            readings[reference_sensor.number] = reference_sensor.readings
+
+        alignments = intermediates.Table('day_19-alignments', ALIGNMENTS_VERSION)
+        with SharedPool(readings) as pool:
+            result = get_sensors(data, reference_sensor, alignments, pool)
+        alignments.save()
+        return result
+
     result = {}
     if reference_sensor is None:
         data = data.copy()
@@ -196,14 +204,13 @@ def get_sensors(
 
     reference_sensors = []
     for sensor_number, (rotation, distance) in calculate_adjacent_sensors(
-        reference_sensor.readings, data
+        reference_sensor.number, data, alignments, pool
     ).items():
         act_distance = distance
         for d, r in zip(
             reversed(reference_sensor.distance), reversed(reference_sensor.rotation)
         ):
-            act_distance = vector_rotate(act_distance, r)
-            act_distance = vector_add(act_distance, d)
+            act_distance = add(vector_rotate(act_distance, r), d)
 
         sensor = Sensor(
             rotation=reference_sensor.rotation + [rotation],
@@ -215,36 +222,70 @@ def get_sensors(
         reference_sensors.append(sensor)
 
     for ref in reference_sensors:
-        result.update(get_sensors(data, ref))
+        result.update(get_sensors(data, ref, alignments, pool))
 
     return result
 
 
-def main():
-    # Part 1
-    data = read_input('input.txt')
+@memoize_last('sensors')
+def get_aligned_sensors(data: Dict[int, List[Vector]]) -> Dict[int, Sensor]:
+    """Both parts need the aligned sensors, the alignment runs once per parsed input."""
+    return get_sensors(data)
+
+
+# Bump when the parsed representation changes, parsed inputs are cached by aoc.cache
+PARSER_VERSION = 3
+
+
+def parse(filename: str = 'input.txt') -> Dict[int, List[Vector]]:
+    return read_input(filename)
 
+
+def count_beacons(sensors: Dict[int, Sensor]) -> int:
     all_readings = set()
-    sensors = get_sensors(data)
     for n, sensor in sensors.items():
-        for reading in sensor.readings:
-            all_readings.add(calculate_actual_distance_reference(reading, sensor))
+        readings = Vectors(sensor.readings)
+        for d, r in zip(reversed(sensor.distance), reversed(sensor.rotation)):
+            readings = readings.rotate(rotation_matrix(r)).translate(d)
+        all_readings.update(readings)
 
-    result = len(all_readings)
-    print(result)
-    assert result == 457
+    return len(all_readings)
 
-    # Part 2
+
+def largest_sensor_distance(sensors: Dict[int, Sensor]) -> int:
     distances = []
     for s1 in sensors.values():
         for s2 in sensors.values():
             d1 = calculate_actual_distance(s1.distance[-1], s1)
             d2 = calculate_actual_distance(s2.distance[-1], s2)
-            distances.append(vector_manhattan_distance(d1, d2))
+            distances.append(manhattan_distance(d1, d2))
+
+    return max(distances)
+
 
-    result = max(distances)
+def solve_part1(data: Dict[int, List[Vector]]) -> int:
+    return count_beacons(get_aligned_sensors(data))
+
+
+def solve_part2(data: Dict[int, List[Vector]]) -> int:
+    return largest_sensor_distance(get_aligned_sensors(data))
+
+
+ANSWERS = (457, 13243)
+
+
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    result = solve_part1(data)
+    print(result)
+    assert result == ANSWERS[0]
+
+    # Part 2
+    result = solve_part2(data)
     print(result)
-    assert result == 13243
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
@@ -16,94 +16,144 @@
 from typing import Tuple
 from typing import List
 
+import os
+from aoc.backends import dispatch
+from aoc.backends import np
+from aoc.grid import Grid
 
-def read_input(filename: str) -> Tuple[List[int], List[List[int]]]:
+# The lookup table index of a pixel needs the pixels up to two cells outside the input picture
+PADDING = 2
+
+# Pictures with at least this many pixels are enhanced with NumPy when it is installed, see aoc.backends
+NUMPY_THRESHOLD = 2500
+
+
+def read_input(filename: str) -> Tuple[List[int], Grid]:
     with open(filename) as f:
         lines = f.readlines()
 
     lookup_table = [1 if p == '#' else 0 for p in lines[0].strip()]
-    picture = [[1 if p == '#' else 0 for p in line.strip()] for line in lines[2:]]
 
-    return lookup_table, picture
+    rows = [line.strip() for line in lines[2:]]
+    picture = Grid(len(rows[0]), len(rows), padding=PADDING)
+    for y, row in enumerate(rows):
+        for x, p in enumerate(row):
+            picture[x, y] = 1 if p == '#' else 0
 
+    return lookup_table, picture
 
-def get_lookup_table_index(picture: List[List[int]], x: int, y: int, default: int = 0):
-    width = len(picture[0])
-    height = len(picture)
-
-    digits = []
-
-    for y_ in range(y - 1, y + 2):
-        for x_ in range(x - 1, x + 2):
-            if y_ < 0 or y_ >= height or x_ < 0 or x_ >= width:
-                digits.append(str(default))
-            else:
-                digits.append(str(picture[y_][x_]))
 
-    bin_number = ''.join(digits)
-    return int(bin_number, 2)
+def get_lookup_table_index(picture: Grid, index: int) -> int:
+    cells = picture.cells
+    result = 0
+    for offset in picture.offsets8[:4]:
+        result = result << 1 | cells[index + offset]
+    result = result << 1 | cells[index]
+    for offset in picture.offsets8[4:]:
+        result = result << 1 | cells[index + offset]
+    return result
+
+
+def apply_image_enhancement_algorithm_numpy(
+    picture: Grid, lookup_table: List[int], default=0
+) -> Grid:
+    output = Grid(
+        picture.width + 2,
+        picture.height + 2,
+        fill=lookup_table[511 if default else 0],
+        padding=PADDING,
+    )
+
+    # Output pixel (x, y) is centered on (x + 1, y + 1) of the padded input, the 3x3 squares are shifted views of it
+    pixels = picture.to_numpy(padded=True).astype(np.intp)
+    height, width = output.height, output.width
+    index = np.zeros((height, width), dtype=np.intp)
+    for y_offset in (0, 1, 2):
+        for x_offset in (0, 1, 2):
+            index = index << 1 | pixels[y_offset : y_offset + height, x_offset : x_offset + width]
+
+    output.to_numpy()[:] = np.array(lookup_table, dtype=np.uint8)[index]
+    return output
 
 
+@dispatch(apply_image_enhancement_algorithm_numpy, lambda p, *_: len(p), NUMPY_THRESHOLD)
 def apply_image_enhancement_algorithm(
-    picture: List[List[int]], lookup_table: List[int], default=0
-) -> List[List[int]]:
-    x_offset = 1
-    y_offset = 1
-    output = [
-        [-1 for _ in range(len(picture[0]) + 2 * x_offset)]
-        for _ in range(len(picture) + 2 * y_offset)
-    ]
-
-    for new_y, row in enumerate(output):
-        for new_x, _ in enumerate(row):
-            x = new_x - x_offset
-            y = new_y - y_offset
-
-            index = get_lookup_table_index(picture, x, y, default=default)
-            output[new_y][new_x] = lookup_table[index]
+    picture: Grid, lookup_table: List[int], default=0
+) -> Grid:
+    """Enhance the picture, whose border cells hold default, into a picture one pixel larger on each side."""
+    output = Grid(
+        picture.width + 2,
+        picture.height + 2,
+        fill=lookup_table[511 if default else 0],
+        padding=PADDING,
+    )
+    output_cells = output.cells
+
+    for new_y in range(output.height):
+        i = output.index(0, new_y)
+        index = picture.index(-1, new_y - 1)
+        for _ in range(output.width):
+            output_cells[i] = lookup_table[get_lookup_table_index(picture, index)]
+            i += 1
+            index += 1
 
     return output
 
 
-def print_picture(picture: List[List[int]]):
-    for row in picture:
+def print_picture(picture: Grid):
+    for row in picture.rows():
         for value in row:
             print('#' if value else '.', end='')
         print()
     print()
 
 
-def main():
-    lookup_table, picture = read_input('input.txt')
+Image = Tuple[List[int], Grid]
+
 
-    # If the following conditions are met we know that the "out of bounds" values toggle between 0 and 1 according to
-    # the formula: i % 2, where i is the current pass count of the algorithm.
-    assert lookup_table[0] == 1
-    assert lookup_table[511] == 0
+def enhance(data: Image, pass_count: int) -> Grid:
+    lookup_table, picture = data
+
+    # All pixels outside the picture have the same value, which is enhanced like any other 3x3 square of them
+    default = 0
 
     r = picture
-    for i in range(2):
-        r = apply_image_enhancement_algorithm(
-            r,
-            lookup_table,
-            default=i % 2,  # See comment for the lookup_table assertions above
-        )
-
-    result = sum([sum(v) for v in r])
+    for _ in range(pass_count):
+        r = apply_image_enhancement_algorithm(r, lookup_table, default)
+        default = lookup_table[511 if default else 0]
+
+    return r
+
+
+def parse(filename: str = 'input.txt') -> Image:
+    return read_input(filename)
+
+
+def solve_part1(data: Image) -> int:
+    r = enhance(data, 2)
+    return sum(r.values())
+
+
+def solve_part2(data: Image) -> int:
+    r = enhance(data, 50)
+    return sum(r.values())
+
+
+ANSWERS = (5044, 18074)
+
+
+def main():
+    data = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    result = solve_part1(data)
     print(result)
-    assert result == 5044
+    assert result == ANSWERS[0]
 
-    r = picture
-    for i in range(50):
-        r = apply_image_enhancement_algorithm(
-            r,
-            lookup_table,
-            default=i % 2,  # See comment for the lookup_table assertions above
-        )
-
-    result = sum([sum(v) for v in r])
+    # Part 2
+    result = solve_part2(data)
     print(result)
-    assert result == 18074
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
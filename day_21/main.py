@@ -14,18 +14,21 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from typing import List
+from typing import Tuple
 
+import os
 import re
-from collections import defaultdict
+from collections import Counter
 from dataclasses import dataclass
 from itertools import cycle
 
+from aoc.memo import memoize
 
-@dataclass
+
+@dataclass(frozen=True)
 class Player:
     number: int
     position: int
-    score: int = 0
 
 
 def read_input(filename: str) -> List[Player]:
@@ -47,81 +50,83 @@ def all_rolls():
                 yield d1 + d2 + d3
 
 
-def main():
-    players = read_input('input.txt')
+def parse(filename: str = 'input.txt') -> List[Player]:
+    return read_input(filename)
+
+
+def solve_part1(players: List[Player]) -> int:
+    # The players are moved around the board, keep their positions and scores here instead of in the parsed data
+    positions = [p.position for p in players]
+    scores = [0 for _ in players]
 
-    # Part 1
     die_roll_count = 0
     die = cycle(range(1, 11))
 
-    while all([p.score < 1000 for p in players]):
-        for p in players:
+    while all([score < 1000 for score in scores]):
+        for i in range(len(players)):
             move_count = next(die) + next(die) + next(die)
             die_roll_count += 3
 
-            p.position = (p.position + move_count - 1) % 10 + 1
-            p.score += p.position
-            # print(f'Player {p.number} moves {move_count}, to {p.position}, score {p.score}')
+            positions[i] = (positions[i] + move_count - 1) % 10 + 1
+            scores[i] += positions[i]
 
-            if p.score >= 1000:
+            if scores[i] >= 1000:
                 break
 
-    lowest_score = min([p.score for p in players])
-    result = lowest_score * die_roll_count
+    lowest_score = min(scores)
+    return lowest_score * die_roll_count
+
+
+# Bound of the memoized win counts, see aoc.memo
+MEMO_SIZE = 1 << 16
+
+# Number of universes for each sum of the three rolls of the Dirac die
+ROLL_UNIVERSES = sorted(Counter(all_rolls()).items())
+
+
+def _pack_state(position: int, score: int, other_position: int, other_score: int) -> int:
+    # Positions are at most 10 and scores below 21
+    return position << 14 | score << 9 | other_position << 5 | other_score
+
+
+def solve_part2(players: List[Player]) -> int:
+    """The win counts only depend on the positions and scores of the players, so they are memoized on those."""
+
+    @memoize('wins', MEMO_SIZE, key=_pack_state)
+    def count_wins(position: int, score: int, other_position: int, other_score: int) -> Tuple[int, int]:
+        """Count the universes in which the player about to roll wins and in which the other player wins."""
+        wins = 0
+        other_wins = 0
+        for roll, universes in ROLL_UNIVERSES:
+            new_position = (position + roll - 1) % 10 + 1
+            new_score = score + new_position
+            if new_score >= 21:
+                wins += universes
+            else:
+                next_wins, next_other_wins = count_wins(other_position, other_score, new_position, new_score)
+                wins += universes * next_other_wins
+                other_wins += universes * next_wins
+
+        return wins, other_wins
+
+    return max(count_wins(players[0].position, 0, players[1].position, 0))
+
+
+ANSWERS = (506466, 632979211251440)
+
+
+def main():
+    players = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    result = solve_part1(players)
     print(result)
-    assert result == 506466
+    assert result == ANSWERS[0]
 
     # Part 2
-    players = read_input('input.txt')  # reset
-
-    score_position_count_dict = defaultdict(int)
-    score_position_count_dict[
-        (
-            0,  # Player 1 score
-            players[0].position,  # Player 1 position
-            0,  # Player 2 score
-            players[1].position,  # Player 2 position
-        )
-    ] = 1  # Universe count
-    p1_turn = True
-
-    p1_wins = 0
-    p2_wins = 0
-    while score_position_count_dict:
-        new_dict = defaultdict(int)
-        for (
-            p1_score,
-            p1_position,
-            p2_score,
-            p2_position,
-        ), universe_count in score_position_count_dict.items():
-            if p1_turn:
-                for roll in all_rolls():
-                    new_pos = (p1_position + roll - 1) % 10 + 1
-                    new_score = p1_score + new_pos
-                    if new_score >= 21:
-                        p1_wins += universe_count
-                    else:
-                        new_dict[
-                            (new_score, new_pos, p2_score, p2_position)
-                        ] += universe_count
-            else:
-                for roll in all_rolls():
-                    new_pos = (p2_position + roll - 1) % 10 + 1
-                    new_score = p2_score + new_pos
-                    if new_score >= 21:
-                        p2_wins += universe_count
-                    else:
-                        new_dict[
-                            (p1_score, p1_position, new_score, new_pos)
-                        ] += universe_count
-
-        score_position_count_dict = new_dict
-        p1_turn = not p1_turn
-
-    result = max(p1_wins, p2_wins)
+    result = solve_part2(players)
     print(result)
-    assert result == 632979211251440
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
@@ -14,29 +14,27 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from typing import List
-from typing import Optional
+from typing import NamedTuple
+from typing import Tuple
 
+import os
 import re
-from dataclasses import dataclass
 
+from aoc import counters
+from aoc import intermediates
+from aoc.backends import dispatch
+from aoc.backends import np
+from aoc.bitset import PointSet
+from aoc.geometry import Box
+from aoc.geometry import Boxes
+from aoc.geometry import intersection
+from aoc.geometry import intersections_numpy
 
-@dataclass(frozen=True)
-class Region:
-    x1: int
-    x2: int
-    y1: int
-    y2: int
-    z1: int
-    z2: int
 
-    def size(self) -> int:
-        return (
-            (self.x2 - self.x1 + 1) * (self.y2 - self.y1 + 1) * (self.z2 - self.z1 + 1)
-        )
+Region = Box
 
 
-@dataclass(frozen=True)
-class Step:
+class Step(NamedTuple):
     turn_on: bool
     region: Region
 
@@ -57,95 +55,119 @@ def read_input(filename: str) -> List[Step]:
     return r
 
 
-def clamp_region_50_50(region: Region) -> Optional[Region]:
-    """Clamp the region to x=-50..50, y=-50..50, z=-50..50."""
-    if (
-        region.x1 > 50
-        or region.x2 < -50
-        or region.y1 > 50
-        or region.y2 < -50
-        or region.z1 > 50
-        or region.z2 < -50
-    ):
-        return None  # out of range
-
-    return Region(
-        max(region.x1, -50),
-        min(region.x2, 50),
-        max(region.y1, -50),
-        min(region.y2, 50),
-        max(region.z1, -50),
-        min(region.z2, 50),
-    )
-
-
-def get_start_coord(r1_c1: int, r1_c2: int, r2_c1: int) -> int:
-    if r1_c1 <= r2_c1 <= r1_c2:
-        return r2_c1
-    elif r2_c1 < r1_c1:
-        return r1_c1
-    else:
-        assert False, 'Should be checked by condition'
-
-
-def get_end_coord(r1_c1: int, r1_c2: int, r2_c2: int) -> int:
-    if r1_c1 <= r2_c2 <= r1_c2:
-        return r2_c2
-    elif r2_c2 > r1_c2:
-        return r1_c2
-    else:
-        assert False, 'Should be checked by condition'
-
-
-def intersection(r1: Region, r2: Region) -> Optional[Region]:
-    if (
-        r1.x1 > r2.x2
-        or r1.x2 < r2.x1
-        or r1.y1 > r2.y2
-        or r1.y2 < r2.y1
-        or r1.z1 > r2.z2
-        or r1.z2 < r2.z1
-    ):
-        return None  # no intersection
-
-    return Region(
-        get_start_coord(r1.x1, r1.x2, r2.x1),
-        get_end_coord(r1.x1, r1.x2, r2.x2),
-        get_start_coord(r1.y1, r1.y2, r2.y1),
-        get_end_coord(r1.y1, r1.y2, r2.y2),
-        get_start_coord(r1.z1, r1.z2, r2.z1),
-        get_end_coord(r1.z1, r1.z2, r2.z2),
-    )
+# Part 1 only considers the cubes in x=-50..50, y=-50..50, z=-50..50
+INITIALIZATION_AREA = Region(-50, 50, -50, 50, -50, 50)
 
+# Inputs with at least this many steps are solved with NumPy when it is installed, see aoc.backends
+NUMPY_THRESHOLD = 10
 
-def main():
-    steps = read_input('input.txt')
 
-    # Part 1
-    active_cubes = set()
+# Bump when the parsed representation changes, parsed inputs are cached by aoc.cache
+PARSER_VERSION = 3
+
+# Bump when the accumulated terms change, they are cached by aoc.intermediates
+TERMS_VERSION = 1
+
+# More terms than this are not cached, loading them would take more memory than the steps take time
+MAX_CACHED_TERMS = 1000000
+
+
+def parse(filename: str = 'input.txt') -> List[Step]:
+    return read_input(filename)
+
+
+def count_initialization_cubes_numpy(steps: List[Step]) -> int:
+    a = INITIALIZATION_AREA
+    cubes = np.zeros((a.x2 - a.x1 + 1, a.y2 - a.y1 + 1, a.z2 - a.z1 + 1), dtype=bool)
+    for step in steps:
+        r = intersection(step.region, INITIALIZATION_AREA)
+        if r:
+            cubes[
+                r.x1 - a.x1 : r.x2 - a.x1 + 1,
+                r.y1 - a.y1 : r.y2 - a.y1 + 1,
+                r.z1 - a.z1 : r.z2 - a.z1 + 1,
+            ] = step.turn_on
+
+    return int(cubes.sum())
+
+
+@dispatch(count_initialization_cubes_numpy, len, NUMPY_THRESHOLD)
+def count_initialization_cubes(steps: List[Step]) -> int:
+    a = INITIALIZATION_AREA
+    active_cubes = PointSet((a.x1, a.y1, a.z1), (a.x2, a.y2, a.z2))
     for step in steps:
-        clamped_region = clamp_region_50_50(step.region)
-        if not clamped_region:
+        r = intersection(step.region, INITIALIZATION_AREA)
+        if not r:
             continue
 
-        for z in range(clamped_region.z1, clamped_region.z2 + 1):
-            for y in range(clamped_region.y1, clamped_region.y2 + 1):
-                for x in range(clamped_region.x1, clamped_region.x2 + 1):
-                    if step.turn_on:
-                        active_cubes.add((x, y, z))
-                    else:
-                        try:
-                            active_cubes.remove((x, y, z))
-                        except KeyError:
-                            pass
-
-    result = len(active_cubes)
-    print(result)
-    assert result == 580098
+        if step.turn_on:
+            active_cubes.add_box((r.x1, r.y1, r.z1), (r.x2, r.y2, r.z2))
+        else:
+            active_cubes.remove_box((r.x1, r.y1, r.z1), (r.x2, r.y2, r.z2))
 
-    # Part 2
+    return len(active_cubes)
+
+
+def solve_part1(steps: List[Step]) -> int:
+    return count_initialization_cubes(steps)
+
+
+class _TermBuffer:
+    """Terms in the first count columns of a 6 x N array that doubles in size when full."""
+
+    def __init__(self, boxes: Boxes):
+        self.terms = np.empty((6, max(1024, len(boxes))), dtype=np.int64)
+        self.count = len(boxes)
+        if boxes:
+            self.terms[:, : self.count] = np.array(boxes.boxes, dtype=np.int64).T
+
+    def view(self) -> 'np.ndarray':
+        return self.terms[:, : self.count]
+
+    def extend(self, terms: 'np.ndarray'):
+        end = self.count + terms.shape[1]
+        if end > self.terms.shape[1]:
+            grown = np.empty((6, max(end, 2 * self.terms.shape[1])), dtype=np.int64)
+            grown[:, : self.count] = self.view()
+            self.terms = grown
+        self.terms[:, self.count : end] = terms
+        self.count = end
+
+    def to_boxes(self) -> Boxes:
+        return Boxes(list(zip(*self.view().tolist())))
+
+
+def accumulate_terms_numpy(
+    steps: List[Step], positive_terms: Boxes, negative_terms: Boxes
+) -> Tuple[Boxes, Boxes]:
+    """Like accumulate_terms() with the terms in arrays."""
+    positive_terms = _TermBuffer(positive_terms)
+    negative_terms = _TermBuffer(negative_terms)
+    for step in steps:
+        new_negative_terms = intersections_numpy(positive_terms.view(), step.region)
+        new_positive_terms = intersections_numpy(negative_terms.view(), step.region)
+
+        if step.turn_on:
+            positive_terms.extend(np.array(step.region).reshape(6, 1))
+        positive_terms.extend(new_positive_terms)
+        negative_terms.extend(new_negative_terms)
+        if counters.enabled:
+            counters.append('positive_terms', positive_terms.count)
+            counters.append('negative_terms', negative_terms.count)
+
+    return positive_terms.to_boxes(), negative_terms.to_boxes()
+
+
+def _terms_size(steps: List[Step], positive_terms: Boxes, negative_terms: Boxes) -> int:
+    return len(steps) + len(positive_terms)
+
+
+@dispatch(accumulate_terms_numpy, _terms_size, NUMPY_THRESHOLD)
+def accumulate_terms(
+    steps: List[Step], positive_terms: Boxes, negative_terms: Boxes
+) -> Tuple[Boxes, Boxes]:
     """
-    The previous approach will no longer work since we have too many points for our computer to handle. Instead we
+    The part 1 approach will no longer work since we have too many points for our computer to handle. Instead we
     realise that we can use the intersection between the regions. Consider the following example with three overlapping
     regions:
     
@@ -204,36 +226,55 @@ def main():
     
     Note that we only removed |C|.
     
-    These actions are implemented below.
+    These actions are implemented below, continuing from the given terms of the steps before.
     """
 
-    positive_terms = []
-    negative_terms = []
+    positive_terms = Boxes(list(positive_terms.boxes))
+    negative_terms = Boxes(list(negative_terms.boxes))
     for step in steps:
-        new_positive_terms = []
-        new_negative_terms = []
+        new_negative_terms = positive_terms.intersections(step.region)
+        new_positive_terms = negative_terms.intersections(step.region)
 
         if step.turn_on:
             new_positive_terms.append(step.region)
 
-        for positive_term in positive_terms:
-            i = intersection(positive_term, step.region)
-            if i:
-                new_negative_terms.append(i)
-
-        for negative_term in negative_terms:
-            i = intersection(negative_term, step.region)
-            if i:
-                new_positive_terms.append(i)
-
         positive_terms.extend(new_positive_terms)
         negative_terms.extend(new_negative_terms)
+        if counters.enabled:
+            counters.append('positive_terms', len(positive_terms))
+            counters.append('negative_terms', len(negative_terms))
+
+    return positive_terms, negative_terms
 
-    result = sum([p.size() for p in positive_terms]) - sum(
-        [n.size() for n in negative_terms]
-    )
+
+def solve_part2(steps: List[Step]) -> int:
+    # The terms only depend on the steps so far, resume from those of the longest cached prefix
+    n, terms, digests = intermediates.resume('day_22-terms', TERMS_VERSION, steps)
+    if terms is None:
+        terms = Boxes(), Boxes()
+    positive_terms, negative_terms = accumulate_terms(steps[n:], *terms)
+    if n < len(steps) and len(positive_terms) + len(negative_terms) <= MAX_CACHED_TERMS:
+        terms = positive_terms, negative_terms
+        intermediates.checkpoint('day_22-terms', TERMS_VERSION, digests, terms)
+
+    return positive_terms.total_size() - negative_terms.total_size()
+
+
+ANSWERS = (580098, 1134725012490723)
+
+
+def main():
+    steps = parse(os.path.join(os.path.dirname(__file__), 'input.txt'))
+
+    # Part 1
+    result = solve_part1(steps)
+    print(result)
+    assert result == ANSWERS[0]
+
+    # Part 2
+    result = solve_part2(steps)
     print(result)
-    assert result == 1134725012490723
+    assert result == ANSWERS[1]
 
 
 if __name__ == '__main__':
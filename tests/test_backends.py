@@ -0,0 +1,81 @@
+"""Advent of Code 2021 - Backend tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from aoc import backends
+from aoc.backends import BACKEND_ENV
+from aoc.backends import dispatch
+
+
+def _numpy_engine(values):
+    return 'numpy'
+
+
+@dispatch(_numpy_engine, len, threshold=3)
+def engine(values):
+    return 'python'
+
+
+@pytest.fixture
+def numpy_installed(monkeypatch):
+    # The engines are plain functions, any non-None module stands in for NumPy
+    monkeypatch.setattr(backends, 'np', object())
+
+
+def test_dispatch_auto_picks_by_size(monkeypatch, numpy_installed):
+    monkeypatch.delenv(BACKEND_ENV, raising=False)
+    assert engine([1, 2]) == 'python'
+    assert engine([1, 2, 3]) == 'numpy'
+
+    monkeypatch.setenv(BACKEND_ENV, 'auto')
+    assert engine([1, 2, 3]) == 'numpy'
+
+
+def test_dispatch_auto_without_numpy(monkeypatch):
+    monkeypatch.delenv(BACKEND_ENV, raising=False)
+    monkeypatch.setattr(backends, 'np', None)
+    assert engine([1, 2, 3]) == 'python'
+
+
+def test_dispatch_forced_backend(monkeypatch, numpy_installed):
+    monkeypatch.setenv(BACKEND_ENV, 'python')
+    assert engine([1, 2, 3]) == 'python'
+
+    monkeypatch.setenv(BACKEND_ENV, 'numpy')
+    assert engine([1]) == 'numpy'
+
+    with backends.forced_backend('python'):
+        assert engine([1, 2, 3]) == 'python'
+    assert engine([1]) == 'numpy'
+
+
+def test_dispatch_forced_numpy_without_numpy(monkeypatch):
+    monkeypatch.setenv(BACKEND_ENV, 'numpy')
+    monkeypatch.setattr(backends, 'np', None)
+    with pytest.raises(ImportError):
+        engine([1])
+
+
+def test_unknown_backend(monkeypatch):
+    monkeypatch.setenv(BACKEND_ENV, 'fortran')
+    with pytest.raises(ValueError):
+        engine([1])
+
+
+def test_engines_stay_available():
+    assert engine.python([1, 2, 3]) == 'python'
+    assert engine.numpy([1]) == 'numpy'
+    assert engine.__name__ == 'engine'
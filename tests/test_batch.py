@@ -0,0 +1,55 @@
+"""Advent of Code 2021 - Batch mode tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+
+from aoc.batch import find_inputs
+from aoc.batch import solve_inputs
+from aoc.daemon import Solver
+
+
+def _write_inputs(tmp_path, names):
+    for name in names:
+        (tmp_path / name).write_text('199\n200\n208\n210\n200\n207\n240\n269\n260\n263\n')
+    return find_inputs(str(tmp_path))
+
+
+def test_solve_inputs(tmp_path):
+    filenames = _write_inputs(tmp_path, ['a.txt', 'b.txt', 'c.txt'])
+    results = list(solve_inputs(1, filenames, jobs=2, use_cache=False))
+
+    assert sorted([r['input'] for r in results]) == filenames
+    assert {r['status'] for r in results} == {'ok'}
+    assert {(r['answers']['1'], r['answers']['2']) for r in results} == {(7, 5)}
+
+
+def test_worker_death_retries_the_queued_inputs(tmp_path, monkeypatch):
+    solve = Solver.solve
+
+    def crashing_solve(self, day, part=None, filename=None):
+        if os.path.basename(filename) == 'b_crash.txt':
+            os._exit(1)
+        return solve(self, day, part, filename)
+
+    # The workers are forked, so they inherit the patched solver
+    monkeypatch.setattr(Solver, 'solve', crashing_solve)
+
+    filenames = _write_inputs(tmp_path, ['a.txt', 'b_crash.txt', 'c.txt', 'd.txt'])
+    results = {os.path.basename(r['input']): r for r in solve_inputs(1, filenames, jobs=1, use_cache=False)}
+
+    assert sorted(results) == ['a.txt', 'b_crash.txt', 'c.txt', 'd.txt']
+    assert results['b_crash.txt']['error'] == 'Worker died'
+    for name in ['a.txt', 'c.txt', 'd.txt']:
+        assert results[name]['status'] == 'ok'
@@ -0,0 +1,137 @@
+"""Advent of Code 2021 - Point set tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import random
+
+import pytest
+
+from aoc.bitset import PointSet
+
+
+def test_add_discard_and_contains():
+    points = PointSet((0, 0), (9, 9))
+    points.add((3, 4))
+    points.add((3, 4))
+    points.add((9, 0))
+
+    assert (3, 4) in points
+    assert (4, 3) not in points
+    assert (10, 0) not in points
+    assert len(points) == 2
+
+    points.discard((3, 4))
+    points.discard((3, 4))
+    points.discard((100, 100))
+    assert list(points) == [(9, 0)]
+
+    with pytest.raises(ValueError):
+        points.add((10, 0))
+
+
+def test_from_points_is_bounded_by_the_points():
+    points = PointSet.from_points([(-2, 5, 1), (3, -1, 0), (3, -1, 0)])
+    assert (points.lows, points.highs) == ((-2, -1, 0), (3, 5, 1))
+    assert set(points) == {(-2, 5, 1), (3, -1, 0)}
+
+
+def test_empty_set():
+    points = PointSet.from_points([])
+    assert len(points) == 0
+    assert not points
+    assert list(points) == []
+    assert (0, 0) not in points
+    assert len(PointSet.from_points([], dimensions=3).lows) == 3
+
+    assert not points.fold(0, 0)
+    assert not points.fold(1, 5)
+
+
+def test_iteration_order_is_row_by_row():
+    points = PointSet.from_points([(1, 1), (0, 1), (2, 0)])
+    assert list(points) == [(2, 0), (0, 1), (1, 1)]
+
+
+def test_boxes_across_chunks():
+    points = PointSet((-10, 0, 0), (10, 2, 2), chunk_bits=4)
+    points.add_box((-8, 0, 1), (5, 1, 2))
+    expected = {(x, y, z) for x in range(-8, 6) for y in range(2) for z in range(1, 3)}
+    assert set(points) == expected
+
+    # Partly outside of the bounding box, which is ignored
+    points.remove_box((0, -5, 2), (20, 5, 5))
+    expected = {p for p in expected if not (p[0] >= 0 and p[2] == 2)}
+    assert set(points) == expected
+    assert len(points) == len(expected)
+
+
+def test_union():
+    first = PointSet((0, 0), (4, 4))
+    second = PointSet((0, 0), (4, 4))
+    first.add((1, 1))
+    second.add((2, 2))
+
+    assert set(first | second) == {(1, 1), (2, 2)}
+    assert set(first) == {(1, 1)}
+
+    first |= second
+    assert set(first) == {(1, 1), (2, 2)}
+
+    with pytest.raises(ValueError):
+        first | PointSet((0, 0), (5, 5))
+
+
+def test_copy_is_independent():
+    points = PointSet.from_points([(1, 1), (1, 2)])
+    points.discard((1, 1))
+    copy = points.copy()
+    copy.add((1, 1))
+    assert len(points) == 1
+    assert len(copy) == 2
+
+
+def _fold(points, axis, value):
+    result = set()
+    for point in points:
+        if point[axis] == value:
+            continue
+        if point[axis] > value:
+            point = point[:axis] + (2 * value - point[axis],) + point[axis + 1 :]
+        result.add(point)
+    return result
+
+
+def test_fold():
+    points = PointSet.from_points([(0, 0), (6, 0), (3, 1), (4, 2), (1, 4)])
+    assert set(points.fold(0, 3)) == {(0, 0), (2, 2), (1, 4)}
+    assert set(points.fold(1, 2)) == {(0, 0), (6, 0), (3, 1), (1, 0)}
+
+    # Everything on the fold line
+    assert not PointSet.from_points([(3, 1), (3, 2)]).fold(0, 3)
+
+
+@pytest.mark.parametrize('chunk_bits', [None, 1, 3, 64])
+@pytest.mark.parametrize('dimensions', [2, 3])
+def test_fold_matches_sets(chunk_bits, dimensions):
+    generator = random.Random(dimensions * 100 + (chunk_bits or 0))
+    for _ in range(200):
+        points = {
+            tuple([generator.randint(-20, 20) for _ in range(dimensions)])
+            for _ in range(generator.randint(1, 30))
+        }
+        axis = generator.randrange(dimensions)
+        value = generator.randint(-25, 25)
+
+        folded = PointSet.from_points(points, chunk_bits, dimensions).fold(axis, value)
+        assert set(folded) == _fold(points, axis, value)
@@ -0,0 +1,84 @@
+"""Advent of Code 2021 - Cache tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+from types import SimpleNamespace
+
+from aoc.cache import PickleStore
+from aoc.cache import parse_cached
+
+
+def test_pickle_store_round_trip(tmp_path):
+    store = PickleStore(str(tmp_path))
+    assert store.get('missing') == (False, None)
+
+    store.put('key', {'a': [1, 2]})
+    assert store.get('key') == (True, {'a': [1, 2]})
+
+
+def test_pickle_store_evicts_least_recently_used(tmp_path):
+    # Room for one of the entries only
+    store = PickleStore(str(tmp_path), max_bytes=150)
+    store.put('old', b'x' * 100)
+    os.utime(store.path('old'), (0, 0))
+    store.put('new', b'y' * 100)
+
+    assert store.get('old') == (False, None)
+    assert store.get('new') == (True, b'y' * 100)
+
+
+def _module(version, calls):
+    def parse(filename):
+        calls.append(filename)
+        with open(filename) as f:
+            return f.read()
+
+    return SimpleNamespace(PARSER_VERSION=version, parse=parse)
+
+
+def test_parse_cached_is_keyed_by_input_and_parser_version(tmp_path):
+    store = PickleStore(str(tmp_path / 'parsed'))
+    filename = str(tmp_path / 'input.txt')
+    with open(filename, 'w') as f:
+        f.write('1')
+    calls = []
+
+    assert parse_cached(_module(1, calls), 1, filename, store) == ('1', False)
+    assert parse_cached(_module(1, calls), 1, filename, store) == ('1', True)
+    assert len(calls) == 1
+
+    # A new parser version misses
+    assert parse_cached(_module(2, calls), 1, filename, store) == ('1', False)
+
+    # So does a changed input
+    with open(filename, 'w') as f:
+        f.write('2')
+    assert parse_cached(_module(1, calls), 1, filename, store) == ('2', False)
+    assert len(calls) == 3
+
+
+def test_parse_cached_without_version_always_parses(tmp_path):
+    store = PickleStore(str(tmp_path / 'parsed'))
+    filename = str(tmp_path / 'input.txt')
+    with open(filename, 'w') as f:
+        f.write('1')
+    calls = []
+    module = _module(None, calls)
+    del module.PARSER_VERSION
+
+    assert parse_cached(module, 1, filename, store) == ('1', False)
+    assert parse_cached(module, 1, filename, store) == ('1', False)
+    assert len(calls) == 2
+    assert not os.path.exists(store.directory)
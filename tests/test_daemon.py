@@ -0,0 +1,59 @@
+"""Advent of Code 2021 - Daemon tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import io
+import json
+
+import pytest
+
+from aoc.daemon import Solver
+from aoc.daemon import serve_stdio
+
+
+@pytest.fixture(scope='module')
+def solver():
+    return Solver([1, 2], use_cache=False)
+
+
+def test_solve(solver):
+    response = solver.solve(1)
+    assert response['status'] == 'ok'
+    assert response['answers'] == {'1': 1527, '2': 1575}
+    assert [t['phase'] for t in response['timings']] == ['lookup', 'parse', 'part1', 'part2']
+
+
+def test_parsed_input_is_kept(solver, tmp_path):
+    filename = tmp_path / 'input.txt'
+    filename.write_text('199\n200\n208\n210\n200\n207\n240\n269\n260\n263\n')
+
+    assert solver.solve(1, 1, str(filename))['answers'] == {'1': 7}
+    response = solver.solve(1, 2, str(filename))
+    assert response['answers'] == {'2': 5}
+    assert 'parse' not in [t['phase'] for t in response['timings']]
+
+
+def test_errors(solver):
+    assert solver.solve(3)['status'] == 'error'
+    assert solver.solve(1, 1, 'missing.txt')['status'] == 'error'
+    assert json.loads(solver.handle('not json'))['status'] == 'error'
+
+
+def test_serve_stdio(solver):
+    stdin = io.StringIO('{"day": 2, "part": 1}\n\n{"day": 1, "part": 2}\n')
+    stdout = io.StringIO()
+    serve_stdio(solver, stdin, stdout)
+
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [(r['day'], r['status'], list(r['answers'])) for r in responses] == [(2, 'ok', ['1']), (1, 'ok', ['2'])]
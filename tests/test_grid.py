@@ -0,0 +1,58 @@
+"""Advent of Code 2021 - Grid tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from aoc.backends import np
+from aoc.grid import Grid
+
+
+def test_indices():
+    grid = Grid(3, 2, padding=1)
+    indices = list(grid.indices())
+    assert indices == [grid.index(x, y) for y in range(2) for x in range(3)]
+    assert [grid.coordinates(i) for i in indices[:2]] == [(0, 0), (1, 0)]
+
+
+def test_offsets_reach_the_border():
+    grid = Grid(3, 3, fill=7)
+    grid[1, 1] = 1
+    for x in range(3):
+        for y in range(3):
+            if (x, y) != (1, 1):
+                grid[x, y] = 0
+
+    center = grid.index(1, 1)
+    assert [grid.cells[center + offset] for offset in grid.offsets8] == [0] * 8
+
+    corner = grid.index(0, 0)
+    assert sorted([grid.cells[corner + offset] for offset in grid.offsets8]) == [0, 0, 1, 7, 7, 7, 7, 7]
+    assert sorted([grid.cells[corner + offset] for offset in grid.offsets4]) == [0, 0, 7, 7]
+
+
+def test_copy_is_independent():
+    grid = Grid(2, 2)
+    copy = grid.copy()
+    copy[0, 0] = 5
+    assert grid[0, 0] == 0
+    assert list(copy.values()) == [5, 0, 0, 0]
+
+
+@pytest.mark.skipif(np is None, reason='requires NumPy')
+def test_to_numpy_is_a_view():
+    grid = Grid(3, 2, fill=9)
+    grid.to_numpy()[1, 2] = 4
+    assert grid[2, 1] == 4
+    assert grid.to_numpy(padded=True).shape == (4, 5)
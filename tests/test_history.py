@@ -0,0 +1,74 @@
+"""Advent of Code 2021 - Performance history tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from aoc import history
+from aoc.history import HistoryStore
+from aoc.history import Measurement
+from aoc.history import Series
+from aoc.history import find_regressions
+
+
+def _series(walls, phase='part1'):
+    return Series('run', 1, phase, 'day_01/input.txt', walls=walls, commits=[None] * len(walls))
+
+
+def test_find_regressions():
+    slower = _series([1.0, 1.2, 1.0, 1.5], 'slower')
+    noise = _series([1.0, 1.2, 1.0, 1.05], 'noise')
+    faster = _series([1.0, 1.0, 1.0, 0.5], 'faster')
+    single = _series([1.0], 'single')
+
+    assert find_regressions([slower, noise, faster, single], 5, 0.1) == [slower]
+    assert find_regressions([slower, noise], 5, 0.6) == []
+
+
+def test_find_regressions_compares_with_the_last_runs():
+    series = _series([10.0, 10.0, 1.0, 1.0, 1.2])
+    assert series.baseline(2) == 1.0
+    assert find_regressions([series], 2, 0.1) == [series]
+    assert find_regressions([series], 4, 0.1) == []
+
+
+def test_series_are_grouped_by_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, 'git_commit', lambda: ('abc', False))
+    store = HistoryStore(str(tmp_path / 'history.sqlite'))
+    try:
+        for wall in [1.0, 1.1, 1.0]:
+            store.add_run('run', 'run', [Measurement(20, 'part2', 'input.txt', 'digest', wall)])
+        store.add_run(
+            'run', 'run', [Measurement(20, 'part2', 'input.txt', 'digest', 40.0)], 'python+no-cache'
+        )
+        store.add_run('run', 'run', [Measurement(20, 'part2', 'input.txt', 'digest', 9.0, status='error')])
+
+        series = store.series('run')
+        assert {(s.mode, tuple(s.walls)) for s in series} == {
+            ('auto', (1.0, 1.1, 1.0)),
+            ('python+no-cache', (40.0,)),
+        }
+        assert find_regressions(series, 5, 0.1) == []
+        assert store.series('bench') == []
+        assert store.series('run', [1]) == []
+    finally:
+        store.close()
+
+
+def test_run_mode(monkeypatch):
+    monkeypatch.delenv('AOC_BACKEND', raising=False)
+    monkeypatch.delenv('AOC_WORKERS', raising=False)
+    assert history.run_mode() == history.DEFAULT_MODE
+
+    monkeypatch.setenv('AOC_BACKEND', 'numpy')
+    monkeypatch.setenv('AOC_WORKERS', '2')
+    assert history.run_mode(False, True, True, True) == 'numpy+workers=2+no-cache+memory+profile+counters'
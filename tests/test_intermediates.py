@@ -0,0 +1,71 @@
+"""Advent of Code 2021 - Intermediates tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from aoc import intermediates
+from aoc.cache import PickleStore
+
+
+def test_pickle_store_keys(tmp_path):
+    store = PickleStore(str(tmp_path / 'store'))
+    assert store.keys() == []
+
+    store.put('sum-1', 1)
+    store.put('product-1', 1)
+    assert sorted(store.keys()) == ['product-1', 'sum-1']
+    assert store.keys('sum-') == ['sum-1']
+
+
+def test_resume_finds_the_longest_checkpointed_prefix(tmp_path, monkeypatch):
+    monkeypatch.setattr(intermediates, 'store', PickleStore(str(tmp_path)))
+
+    n, state, digests = intermediates.resume('sum', 1, [1, 2])
+    assert (n, state) == (0, None)
+    intermediates.checkpoint('sum', 1, digests, 3)
+
+    n, state, digests = intermediates.resume('sum', 1, [1, 2, 3])
+    assert (n, state) == (2, 3)
+    intermediates.checkpoint('sum', 1, digests, 6)
+
+    assert intermediates.resume('sum', 1, [1, 2, 3, 4])[:2] == (3, 6)
+    assert intermediates.resume('sum', 1, [1, 2])[:2] == (2, 3)
+
+    # A different prefix, name or version does not match
+    assert intermediates.resume('sum', 1, [2, 1, 3])[:2] == (0, None)
+    assert intermediates.resume('product', 1, [1, 2, 3])[:2] == (0, None)
+    assert intermediates.resume('sum', 2, [1, 2, 3])[:2] == (0, None)
+
+
+def test_resume_without_store(monkeypatch):
+    monkeypatch.setattr(intermediates, 'store', None)
+    n, state, digests = intermediates.resume('sum', 1, [1, 2])
+    assert (n, state, len(digests)) == (0, None, 2)
+
+
+def test_tables_keep_the_rows_of_concurrent_writers(tmp_path, monkeypatch):
+    monkeypatch.setattr(intermediates, 'store', PickleStore(str(tmp_path)))
+    monkeypatch.setattr(intermediates, 'TABLES_DB', str(tmp_path / 'tables.sqlite'))
+
+    first = intermediates.Table('pairs', 1)
+    second = intermediates.Table('pairs', 1)
+    first.put(('a', 'b'), 1)
+    second.put(('c', 'd'), 2)
+    first.save()
+    second.save()
+
+    table = intermediates.Table('pairs', 1)
+    assert table.get(('a', 'b')) == (True, 1)
+    assert table.get(('c', 'd')) == (True, 2)
+    assert table.get(('a', 'c')) == (False, None)
+    assert intermediates.Table('pairs', 2).get(('a', 'b')) == (False, None)
@@ -0,0 +1,103 @@
+"""Advent of Code 2021 - Loader tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from aoc import loaders
+from aoc.backends import BACKEND_ENV
+from aoc.grid import Grid
+from aoc.loaders import get_grid_shape
+from aoc.loaders import grid_rows
+from aoc.loaders import read_digit_grid
+from aoc.loaders import read_digit_grid_numpy
+from aoc.loaders import read_ints
+from aoc.loaders import read_ints_numpy
+from aoc.loaders import read_tokens
+
+
+def _write(tmp_path, data: bytes) -> str:
+    filename = tmp_path / 'input.txt'
+    filename.write_bytes(data)
+    return str(filename)
+
+
+def test_read_ints(tmp_path):
+    assert list(read_ints(_write(tmp_path, b'199\n200\n-7\n'))) == [199, 200, -7]
+    assert list(read_ints(_write(tmp_path, b'3,4,3,1,2\n'))) == [3, 4, 3, 1, 2]
+    assert list(read_ints(_write(tmp_path, b''))) == []
+
+
+def test_read_tokens(tmp_path):
+    assert read_tokens(_write(tmp_path, b'forward 5\r\ndown 8\n')) == [b'forward', b'5', b'down', b'8']
+
+
+def test_get_grid_shape():
+    assert get_grid_shape(b'123\n456\n') == (3, 2, 4)
+    assert get_grid_shape(b'123\r\n456\r\n789') == (3, 3, 5)
+    assert get_grid_shape(b'12345') == (5, 1, 5)
+
+
+def test_read_digit_grid(tmp_path):
+    cells, width, height = read_digit_grid(_write(tmp_path, b'219\r\n398\r\n'))
+    assert (bytes(cells), width, height) == (bytes([2, 1, 9, 3, 9, 8]), 3, 2)
+
+    rows = grid_rows(cells, width, height)
+    assert [bytes(row) for row in rows] == [bytes([2, 1, 9]), bytes([3, 9, 8])]
+    rows[1][0] = 7
+    assert cells[3] == 7
+
+
+@pytest.mark.skipif(loaders.np is None, reason='requires NumPy')
+@pytest.mark.parametrize('data', [b'219\n398\n', b'219\r\n398\r\n', b'219\n398'])
+def test_read_digit_grid_numpy(tmp_path, data):
+    filename = _write(tmp_path, data)
+    grid = read_digit_grid_numpy(filename)
+    assert grid.tolist() == [[2, 1, 9], [3, 9, 8]]
+
+    # The map is copy-on-write, the file keeps its digits
+    with open(filename, 'rb') as f:
+        assert f.read() == data
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+def test_grid_from_digits(tmp_path, monkeypatch, backend):
+    if backend == 'numpy' and loaders.np is None:
+        pytest.skip('requires NumPy')
+    monkeypatch.setenv(BACKEND_ENV, backend)
+
+    grid = Grid.from_digits(_write(tmp_path, b'219\n398\n'), fill=5)
+    assert (grid.width, grid.height) == (3, 2)
+    assert [grid[x, y] for y in range(2) for x in range(3)] == [2, 1, 9, 3, 9, 8]
+    assert grid[-1, -1] == grid[3, 2] == 5
+
+
+@pytest.mark.parametrize('backend', ['python', 'numpy'])
+def test_read_ints_matches_int_parsing(tmp_path, monkeypatch, backend):
+    if backend == 'numpy' and loaders.np is None:
+        pytest.skip('requires NumPy')
+    monkeypatch.setenv(BACKEND_ENV, backend)
+
+    values = [(i * 7919) % 100003 - 50000 for i in range(2000)]
+    lines = '\n'.join([str(v) for v in values]) + '\n'
+    filename = _write(tmp_path, lines.encode())
+    assert list(read_ints(filename)) == [int(x) for x in lines.split()]
+
+    filename = _write(tmp_path, ','.join([str(v) for v in values]).encode() + b'\r\n')
+    assert list(read_ints(filename)) == values
+
+
+@pytest.mark.skipif(loaders.np is None, reason='requires NumPy')
+def test_read_ints_numpy(tmp_path):
+    assert read_ints_numpy(_write(tmp_path, b'3,4,3,1,2\n')).tolist() == [3, 4, 3, 1, 2]
@@ -0,0 +1,39 @@
+"""Advent of Code 2021 - Memoization tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from aoc import counters
+from aoc.memo import memoize_last
+
+
+def test_memoize_last_compares_by_identity():
+    calls = []
+
+    @memoize_last('total')
+    def total(values: list) -> int:
+        calls.append(values)
+        return sum(values)
+
+    first = [1, 2]
+    counters.start()
+    try:
+        assert total(first) == total(first) == 3
+        assert total([1, 2]) == 3
+        assert total(first) == 3
+    finally:
+        values = counters.stop()
+
+    assert len(calls) == 3
+    assert (total.hits, total.misses) == (1, 3)
+    assert values == {'total_hits': 1, 'total_misses': 3}
@@ -0,0 +1,57 @@
+"""Advent of Code 2021 - Parallel map tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import tracemalloc
+from array import array
+
+from aoc import counters
+from aoc import profiling
+from aoc.parallel import parallel_map
+
+
+def scaled_pid(item: int, data: array) -> set:
+    counters.add('items')
+    return {(item * data[0], os.getpid())}
+
+
+def test_parallel_map():
+    result = parallel_map(scaled_pid, range(20), set.union, data=array('q', [3]), workers=2)
+    assert sorted([value for value, _ in result]) == [3 * i for i in range(20)]
+
+
+def test_instrumentation_maps_in_process():
+    counters.start()
+    try:
+        result = parallel_map(scaled_pid, range(20), set.union, data=array('q', [3]), workers=2)
+    finally:
+        values = counters.stop()
+    assert {pid for _, pid in result} == {os.getpid()}
+    assert values == {'items': 20}
+
+    tracemalloc.start()
+    try:
+        result = parallel_map(scaled_pid, range(20), set.union, data=array('q', [3]), workers=2)
+    finally:
+        tracemalloc.stop()
+    assert {pid for _, pid in result} == {os.getpid()}
+
+
+def test_profiling_maps_in_process(tmp_path):
+    result = profiling.profile_call(
+        str(tmp_path / 'profile'), parallel_map, scaled_pid, range(20), set.union, array('q', [3]), 2
+    )
+    assert {pid for _, pid in result} == {os.getpid()}
+    assert not profiling.active
@@ -0,0 +1,85 @@
+"""Advent of Code 2021 - Answer store tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import shutil
+import sys
+
+from aoc.backends import BACKEND_ENV
+from aoc.days import load_day
+from aoc.results import ResultStore
+from aoc.results import code_digest
+
+
+def test_result_store_key(tmp_path, monkeypatch):
+    monkeypatch.delenv(BACKEND_ENV, raising=False)
+    store = ResultStore(str(tmp_path / 'results.sqlite'))
+    try:
+        store.put(1, 1, 'input', 'code', [1, 2], 0.5, 0.25)
+
+        stored = store.get(1, 1, 'input', 'code')
+        assert (stored.answer, stored.wall, stored.cpu) == ([1, 2], 0.5, 0.25)
+        assert store.get(1, 2, 'input', 'code') is None
+        assert store.get(2, 1, 'input', 'code') is None
+        assert store.get(1, 1, 'other input', 'code') is None
+        assert store.get(1, 1, 'input', 'other code') is None
+    finally:
+        store.close()
+
+
+def test_result_store_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.delenv(BACKEND_ENV, raising=False)
+    store = ResultStore(str(tmp_path / 'results.sqlite'), max_entries=2)
+    try:
+        store.put(1, 1, 'input', 'code', 1, 0.0, 0.0)
+        store.put(1, 2, 'input', 'code', 2, 0.0, 0.0)
+        store.put(2, 1, 'input', 'code', 3, 0.0, 0.0)
+
+        assert store.get(1, 1, 'input', 'code') is None
+        assert store.get(2, 1, 'input', 'code').answer == 3
+    finally:
+        store.close()
+
+
+def test_code_digest_covers_indirect_aoc_imports(tmp_path, monkeypatch):
+    # Day 9 imports aoc.grid, which imports aoc.loaders
+    module = load_day(9)
+    digest = code_digest(module)
+    assert code_digest(module) == digest
+
+    loaders = sys.modules['aoc.loaders']
+    changed = tmp_path / 'loaders.py'
+    shutil.copy(loaders.__file__, changed)
+    with open(changed, 'a') as f:
+        f.write('\n# changed\n')
+    monkeypatch.setattr(loaders, '__file__', str(changed))
+
+    assert code_digest(module) != digest
+
+
+def test_result_store_is_keyed_by_backend(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / 'results.sqlite'))
+    try:
+        monkeypatch.delenv(BACKEND_ENV, raising=False)
+        store.put(1, 1, 'input', 'code', 1, 0.5, 0.25)
+
+        monkeypatch.setenv(BACKEND_ENV, 'python')
+        assert store.get(1, 1, 'input', 'code') is None
+        store.put(1, 1, 'input', 'code', 2, 0.5, 0.25)
+        assert store.get(1, 1, 'input', 'code').answer == 2
+
+        monkeypatch.setenv(BACKEND_ENV, 'auto')
+        assert store.get(1, 1, 'input', 'code').answer == 1
+    finally:
+        store.close()
@@ -0,0 +1,47 @@
+"""Advent of Code 2021 - Runner tests
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from aoc.runner import DayResult
+from aoc.runner import run_day
+from aoc.runner import run_days
+
+
+def test_run_day():
+    result = run_day(1, use_cache=False)
+    assert result.status() == 'ok'
+    assert result.answers == list(result.expected)
+    assert [t.phase for t in result.timings] == ['import', 'parse', 'part1', 'part2']
+    assert all([t.wall >= 0 and t.cpu >= 0 for t in result.timings])
+
+
+def test_run_day_other_input(tmp_path):
+    filename = tmp_path / 'input.txt'
+    filename.write_text('199\n200\n208\n210\n200\n207\n240\n269\n260\n263\n')
+
+    result = run_day(1, str(filename), use_cache=False)
+    assert result.expected is None
+    assert (result.status(), result.answers) == ('ok', [7, 5])
+
+
+def test_run_days_keeps_the_order():
+    results = run_days([2, 1, 6], jobs=2, use_cache=False)
+    assert [r.day for r in results] == [2, 1, 6]
+    assert [r.status() for r in results] == ['ok'] * 3
+
+
+def test_status():
+    assert DayResult(1, 'input.txt', answers=[1, 3], expected=(1, 2)).status() == 'mismatch'
+    assert DayResult(1, 'input.txt', error='Traceback').status() == 'error'
+    assert DayResult(1, 'input.txt', error='Traceback', limit='timeout').status() == 'timeout'